@@ -6,7 +6,14 @@ and trains predictive models for draft analysis.
 
 Modules:
     - database: SQLite storage with WAL mode for high-performance writes
+    - archive: Dictionary-compressed archive of raw match JSON
     - crawler: Async data harvester with strict version filtering
+    - decoding: Fast, selective JSON decoding of API responses
+    - dedup: Persistent Bloom-filter index of seen matches and players
+    - frontier: Durable priority frontier of players to crawl
+    - http_cache: On-disk TTL/ETag cache for slowly changing endpoints
+    - mock_riot: Local mock Riot API and offline crawler benchmark
+    - retry: Jittered backoff, circuit breakers and retry queues for the crawler
     - model: PyTorch-based MetaAwarePredictor
     - train: Training pipeline with device-agnostic execution
 """
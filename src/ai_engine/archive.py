@@ -0,0 +1,266 @@
+"""
+Compressed Archive of Raw Match Payloads.
+
+Keeps the full match-v5 JSON of stored matches so new features can be
+derived later without re-crawling. Payloads are compressed one by one
+(so any match can be read on its own) with a dictionary trained on the
+first payloads archived: match documents share almost all of their keys
+and structure, which a per-document compressor cannot exploit but a
+shared dictionary can.
+
+- zstd (the zstandard package, if installed) trains a real dictionary.
+- zlib (always available) uses a preset dictionary of up to 32 KB cut from
+  a representative sample.
+
+Payloads live in the match_archive side table, keyed by match_id, next to
+the matches they belong to (the main database or a patch partition). Each
+row records the codec and dictionary it was compressed with, so archives
+written with different settings remain readable; dictionaries are kept in
+the main database.
+"""
+
+import logging
+import sqlite3
+import threading
+import zlib
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+
+# Templated on the schema so every patch partition can have its own archive
+ARCHIVE_TABLE_SQL = """
+    -- Compressed raw match JSON (see archive.py)
+    CREATE TABLE IF NOT EXISTS {schema}.match_archive (
+        match_id TEXT PRIMARY KEY,
+        codec TEXT NOT NULL,       -- 'zstd' or 'zlib'
+        dict_id INTEGER,           -- archive_dicts entry, NULL if none
+        raw_size INTEGER NOT NULL,
+        payload BLOB NOT NULL
+    );
+"""
+
+ARCHIVE_DICTS_SQL = """
+    CREATE TABLE IF NOT EXISTS main.archive_dicts (
+        dict_id INTEGER PRIMARY KEY,
+        codec TEXT NOT NULL,
+        dictionary BLOB NOT NULL,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP
+    );
+"""
+
+CODEC_ZSTD = "zstd"
+CODEC_ZLIB = "zlib"
+
+ZLIB_MAX_DICT = 32 * 1024  # zlib's window: older dictionary bytes are never used
+
+
+def default_codec() -> str:
+    """Best codec available in this environment."""
+    return CODEC_ZSTD if zstandard is not None else CODEC_ZLIB
+
+
+def train_dictionary(samples: List[bytes], size: int, codec: str) -> bytes:
+    """
+    Build a compression dictionary from sample payloads.
+    
+    zstd trains on all samples. zlib has no trainer, so the dictionary is
+    the tail of the median-sized sample: a complete, typical document
+    contains every key and most repeated values.
+    """
+    if codec == CODEC_ZSTD:
+        return zstandard.train_dictionary(size, samples).as_bytes()
+        
+    typical = sorted(samples, key=len)[len(samples) // 2]
+    return typical[-min(size, ZLIB_MAX_DICT):]
+
+
+def dictionary_id(codec: str, dictionary: bytes) -> int:
+    """Stable ID of a dictionary (the same bytes always get the same ID)."""
+    return zlib.crc32(codec.encode() + dictionary) & 0x7FFFFFFF
+
+
+class RawArchive:
+    """
+    Compresses payloads into match_archive and reads them back.
+    
+    Payloads written before a dictionary exists are compressed without one
+    and kept as training samples; once `train_samples` payloads were seen,
+    a dictionary is trained, stored in archive_dicts and used from then on
+    (also by later processes, which load the newest one for their codec).
+    
+    Writes happen inside the caller's transaction, so a match and its raw
+    payload are committed together.
+    """
+    
+    def __init__(
+        self,
+        codec: Optional[str] = None,
+        level: int = 6,
+        dict_size: int = 32 * 1024,
+        train_samples: int = 200
+    ):
+        self.codec = codec or default_codec()
+        if self.codec == CODEC_ZSTD and zstandard is None:
+            raise RuntimeError("zstd archive requested but the zstandard package is not installed")
+        self.level = level
+        self.dict_size = dict_size
+        self.train_samples = train_samples
+        
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._dict_id: Optional[int] = None
+        self._samples: List[bytes] = []
+        self._dicts: Dict[int, bytes] = {}  # dict_id -> dictionary (read cache)
+        self._compressor = None  # zstd compressor bound to the current dictionary
+    
+    @classmethod
+    def from_config(cls, cfg) -> "RawArchive":
+        """Build an archive from a DatabaseConfig."""
+        return cls(
+            codec=cfg.archive_codec,
+            level=cfg.archive_level,
+            dict_size=cfg.archive_dict_size,
+            train_samples=cfg.archive_train_samples
+        )
+        
+    # ==================== WRITING ====================
+    
+    def write(
+        self,
+        conn: sqlite3.Connection,
+        payloads: List[Tuple[str, bytes]],
+        schema: str = "main"
+    ) -> int:
+        """
+        Compress and insert (match_id, raw JSON) pairs into `schema`'s
+        match_archive; already archived matches are ignored.
+        
+        Returns: Number of rows inserted
+        """
+        if not payloads:
+            return 0
+            
+        with self._lock:
+            if not self._loaded:
+                self._load_current(conn)
+                
+            if self._dict_id is None:
+                self._samples.extend(raw for _, raw in payloads)
+                if len(self._samples) >= self.train_samples:
+                    self._train()
+                    
+            dict_id = self._dict_id
+            if dict_id is not None:
+                # Idempotent, so the dictionary commits with the first rows using it
+                conn.execute(
+                    "INSERT OR IGNORE INTO main.archive_dicts (dict_id, codec, dictionary) VALUES (?, ?, ?)",
+                    (dict_id, self.codec, self._dicts[dict_id])
+                )
+                
+            rows = [
+                (match_id, self.codec, dict_id, len(raw), self._compress(raw))
+                for match_id, raw in payloads
+            ]
+            
+        cursor = conn.executemany(
+            f"INSERT OR IGNORE INTO {schema}.match_archive (match_id, codec, dict_id, raw_size, payload) "
+            "VALUES (?, ?, ?, ?, ?)",
+            rows
+        )
+        return max(cursor.rowcount, 0)
+    
+    def _load_current(self, conn: sqlite3.Connection) -> None:
+        row = conn.execute(
+            "SELECT dict_id, dictionary FROM main.archive_dicts WHERE codec = ? "
+            "ORDER BY created_at DESC, rowid DESC LIMIT 1",
+            (self.codec,)
+        ).fetchone()
+        if row is not None:
+            self._use_dictionary(row[0], bytes(row[1]))
+        self._loaded = True
+    
+    def _train(self) -> None:
+        try:
+            dictionary = train_dictionary(self._samples, self.dict_size, self.codec)
+        except Exception as e:
+            # zstd refuses too few/too uniform samples; keep collecting
+            logger.warning(f"Archive dictionary training failed ({e}); retrying later")
+            self.train_samples *= 2
+            return
+            
+        dict_id = dictionary_id(self.codec, dictionary)
+        self._use_dictionary(dict_id, dictionary)
+        self._samples = []
+        logger.info(f"Trained {len(dictionary)} byte {self.codec} archive dictionary {dict_id}")
+    
+    def _use_dictionary(self, dict_id: int, dictionary: bytes) -> None:
+        self._dict_id = dict_id
+        self._dicts[dict_id] = dictionary
+        if self.codec == CODEC_ZSTD:
+            self._compressor = zstandard.ZstdCompressor(
+                level=self.level, dict_data=zstandard.ZstdCompressionDict(dictionary)
+            )
+    
+    def _compress(self, raw: bytes) -> bytes:
+        if self.codec == CODEC_ZSTD:
+            if self._compressor is None:
+                self._compressor = zstandard.ZstdCompressor(level=self.level)
+            return self._compressor.compress(raw)
+            
+        dictionary = self._dicts.get(self._dict_id) if self._dict_id is not None else None
+        compressor = (
+            zlib.compressobj(self.level, zdict=dictionary)
+            if dictionary else zlib.compressobj(self.level)
+        )
+        return compressor.compress(raw) + compressor.flush()
+        
+    # ==================== READING ====================
+    
+    def decompress(
+        self,
+        conn: sqlite3.Connection,
+        codec: str,
+        dict_id: Optional[int],
+        payload: bytes
+    ) -> bytes:
+        """Decompress one match_archive row."""
+        dictionary = self._dictionary(conn, dict_id) if dict_id is not None else None
+        
+        if codec == CODEC_ZSTD:
+            if zstandard is None:
+                raise RuntimeError("zstd-compressed archive rows need the zstandard package")
+            dict_data = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+            return zstandard.ZstdDecompressor(dict_data=dict_data).decompress(payload)
+            
+        if codec == CODEC_ZLIB:
+            decompressor = (
+                zlib.decompressobj(zdict=dictionary) if dictionary else zlib.decompressobj()
+            )
+            return decompressor.decompress(payload) + decompressor.flush()
+            
+        raise ValueError(f"Unknown archive codec: {codec}")
+    
+    def _dictionary(self, conn: sqlite3.Connection, dict_id: int) -> bytes:
+        if dict_id not in self._dicts:
+            row = conn.execute(
+                "SELECT dictionary FROM main.archive_dicts WHERE dict_id = ?", (dict_id,)
+            ).fetchone()
+            if row is None:
+                raise ValueError(f"Archive dictionary {dict_id} is missing")
+            self._dicts[dict_id] = bytes(row[0])
+        return self._dicts[dict_id]
+    
+    def iter_rows(
+        self,
+        conn: sqlite3.Connection,
+        cursor: sqlite3.Cursor
+    ) -> Iterator[Tuple[str, bytes]]:
+        """Decompress (match_id, codec, dict_id, payload) rows as they stream in."""
+        for match_id, codec, dict_id, payload in cursor:
+            yield match_id, self.decompress(conn, codec, dict_id, payload)
@@ -14,19 +14,55 @@ class CrawlerConfig:
     
     # Riot API Settings
     api_key: str = field(default_factory=lambda: os.getenv("RIOT_API_KEY", ""))
+    # Extra keys for the key pool (RIOT_API_KEYS, comma/whitespace separated)
+    api_keys: List[str] = field(
+        default_factory=lambda: os.getenv("RIOT_API_KEYS", "").replace(",", " ").split()
+    )
+    
+    # Endpoints ({host} is the routing value or platform, e.g. "europe", "tr1");
+    # point these at a local mock server for offline benchmarks
+    api_base_url: str = "https://{host}.api.riotgames.com"
+    ddragon_base_url: str = "https://ddragon.leagueoflegends.com"
     
     # Rate Limiting (Development key limits - conservative)
     requests_per_second: int = 15  # Stay under 20/s limit
     requests_per_two_minutes: int = 80  # Stay under 100/2min limit
+    rate_limit_safety: float = 0.9  # Fraction of header-advertised limits to use
+    
+    # Retries and circuit breakers
+    max_retries: int = 3  # Extra attempts per request after 5xx / timeouts / 429s
+    retry_base_delay: float = 1.0  # Seconds before the first in-request retry (doubles, jittered)
+    retry_max_delay: float = 30.0  # Cap on a single in-request backoff
+    retry_queue_attempts: int = 3  # Times a failed match fetch / player listing is rescheduled
+    retry_queue_delay: float = 10.0  # Base backoff of the retry queue
+    breaker_failure_threshold: int = 5  # Consecutive failures before an endpoint is paused
+    breaker_reset_seconds: float = 30.0  # Pause before a probe request is let through
     
     # Crawling Parameters
     max_concurrent_requests: int = 3  # Low concurrency to avoid rate limits
-    batch_size: int = 100  # Matches to commit per batch
+    crawl_workers: int = 8  # Players crawled concurrently per region
+    batch_size: int = 100  # Records per group commit
+    write_max_delay: float = 1.0  # Max seconds a queued write waits for its group
+    write_queue_size: int = 5000  # Pending writes before crawl workers block
     max_matches_per_player: int = 10  # Recent matches to fetch per player
     player_rescan_hours: int = 24  # Don't rescan a player within this window
+    decode_offload_bytes: int = 64 * 1024  # Bodies at least this large are decoded off the event loop
+    patch_start_margin_hours: float = 6.0  # Slack before the earliest current-patch game for startTime
     
     # Queue Management
-    max_queue_size: int = 10000  # Max PUUIDs to hold in memory
+    max_queue_size: int = 10000  # Frontier PUUIDs held in memory (rest spill to crawl_queue)
+    frontier_batch_size: int = 500  # PUUIDs moved per spill/refill of crawl_queue
+    queue_lease_seconds: int = 900  # crawl_queue lease before other processes may take an entry
+    
+    # Persistent seen-index (Bloom filters over stored matches / recent players)
+    seen_index_dir: Path = field(default_factory=lambda: Path("data/seen_index"))
+    seen_index_capacity: int = 2_000_000  # Keys per filter before it is regrown
+    seen_index_error_rate: float = 0.001  # False positives are confirmed in SQLite
+    
+    # On-disk HTTP cache for slowly changing endpoints (versions, league ladders)
+    http_cache_dir: Path = field(default_factory=lambda: Path("data/http_cache"))
+    version_cache_ttl: int = 3600  # Seconds before DDragon versions are revalidated
+    league_cache_ttl: int = 3 * 3600  # Seconds before apex league ladders are refetched
     
     # Regions
     regions: List[str] = field(default_factory=lambda: [
@@ -40,6 +76,11 @@ class CrawlerConfig:
         "kr": "asia", "jp1": "asia",
         "oc1": "sea", "ph2": "sea", "sg2": "sea", "th2": "sea", "tw2": "sea", "vn2": "sea"
     })
+    
+    def get_api_keys(self) -> List[str]:
+        """All configured keys (api_key first), without duplicates or blanks."""
+        keys = [self.api_key] + list(self.api_keys)
+        return list(dict.fromkeys(k.strip() for k in keys if k and k.strip()))
 
 
 @dataclass
@@ -51,6 +92,19 @@ class DatabaseConfig:
     cache_size_kb: int = 64000  # 64MB cache
     mmap_size_bytes: int = 268435456  # 256MB mmap
     
+    # Compressed archive of raw match JSON (match_archive side table)
+    archive_raw: bool = False
+    archive_codec: Optional[str] = None  # "zstd" or "zlib"; best available if None
+    archive_level: int = 6
+    archive_dict_size: int = 32 * 1024
+    archive_train_samples: int = 200  # Payloads seen before the dictionary is trained
+    
+    # One SQLite file per patch, attached on demand; retiring a patch unlinks
+    # its file. SQLite attaches at most 10 databases per connection by
+    # default, so keep old patches retired (main.py --mode clean).
+    partition_by_patch: bool = False
+    partition_dir: Optional[Path] = None  # Defaults to <db name>_patches/ next to the database
+    
 
 @dataclass
 class ModelConfig:
@@ -68,6 +122,7 @@ class ModelConfig:
     weight_decay: float = 1e-4
     epochs: int = 50
     early_stopping_patience: int = 5
+    streaming_workers: int = 2  # DataLoader workers for StreamingDataset
     
     # Data Split
     train_ratio: float = 0.8
@@ -77,6 +132,9 @@ class ModelConfig:
     # Checkpoints
     checkpoint_dir: Path = field(default_factory=lambda: Path("models/checkpoints"))
     best_model_path: Path = field(default_factory=lambda: Path("models/best_model.pt"))
+    
+    # Cached whole-patch tensor snapshots (see train.PatchTensorDataset)
+    snapshot_dir: Path = field(default_factory=lambda: Path("data/snapshots"))
 
 
 @dataclass
@@ -109,6 +167,16 @@ def load_api_key_from_file(filepath: str = ".riot_api_key") -> Optional[str]:
         return None
 
 
+def load_api_keys_from_file(filepath: str = ".riot_api_keys") -> List[str]:
+    """Load a key pool from a local file: one key per line, '#' comments allowed."""
+    try:
+        with open(filepath, "r") as f:
+            lines = [line.split("#", 1)[0].strip() for line in f]
+        return [line for line in lines if line]
+    except FileNotFoundError:
+        return []
+
+
 def initialize_config() -> Config:
     """Initialize configuration with environment/file overrides."""
     global config
@@ -118,6 +186,9 @@ def initialize_config() -> Config:
         file_key = load_api_key_from_file()
         if file_key:
             config.crawler.api_key = file_key
+            
+    # Additional keys for the key pool
+    config.crawler.api_keys = list(config.crawler.api_keys) + load_api_keys_from_file()
     
     # Ensure directories exist
     config.database.db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -5,7 +5,12 @@ Features:
 - Dynamic version detection from DDragon API
 - Strict current-patch filtering (discards old patch data)
 - Recursive PUUID discovery from match participants
-- Intelligent rate limit handling with Retry-After parsing
+- Persistent Bloom-filter seen-index, so restarts skip already stored matches
+- Durable tier-prioritised frontier, so restarts resume without re-seeding
+- On-disk TTL/ETag cache for the version list and apex league ladders
+- Jittered retries, per-endpoint circuit breakers and a retry queue for failed work
+- Fast selective JSON decoding of match payloads, off the event loop when large
+- Multi-window rate limiting calibrated from Riot's rate-limit headers
 - Concurrent request management with semaphores
 """
 
@@ -15,13 +20,19 @@ import logging
 import time
 import re
 from datetime import datetime
-from typing import List, Dict, Set, Optional, Any, Tuple
+from typing import List, Dict, Set, Optional, Any, Tuple, Callable
 from dataclasses import dataclass, field
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 
 from .config import config, CrawlerConfig
-from .database import get_database, MatchRecord, PlayerRecord
+from .database import get_database, MatchDatabase, MatchRecord, PlayerRecord
+from .decoding import decode_match, decode_match_keep_raw, loads
+from .dedup import SeenIndex
+from .frontier import CrawlFrontier, MAX_SCORE, player_priority, priority_score, tier_score
+from .http_cache import ResponseCache
+from .retry import CircuitBreakerPool, RetryQueue, backoff_delay, is_retryable
 
 logger = logging.getLogger(__name__)
 
@@ -34,43 +45,497 @@ class CrawlState(Enum):
     STOPPED = "stopped"
 
 
+def parse_rate_limit_header(value: Optional[str]) -> List[Tuple[int, int]]:
+    """
+    Parse a Riot rate-limit header into (count, seconds) pairs.
+    
+    Examples:
+        "20:1,100:120" -> [(20, 1), (100, 120)]
+    """
+    pairs: List[Tuple[int, int]] = []
+    if not value:
+        return pairs
+        
+    for part in value.split(","):
+        try:
+            count, seconds = part.strip().split(":")
+            pairs.append((int(count), int(seconds)))
+        except ValueError:
+            continue
+    return pairs
+
+
+class RateLimitWindow:
+    """
+    A single rate-limit window: at most `limit` requests per `seconds`.
+    
+    Works like a token bucket whose tokens come back exactly `seconds` after
+    they were spent, so requests may burst up to the full allowance but no
+    window of `seconds` ever sees more than `limit` requests.
+    """
+    
+    def __init__(self, limit: int, seconds: int):
+        self.limit = limit
+        self.seconds = seconds
+        self._spent: deque[float] = deque()
+        
+    def _expire(self, now: float) -> None:
+        while self._spent and self._spent[0] <= now - self.seconds:
+            self._spent.popleft()
+            
+    def used(self, now: float) -> int:
+        """Requests spent in the current window."""
+        self._expire(now)
+        return len(self._spent)
+    
+    def wait_time(self, now: float) -> float:
+        """Seconds until a token is available (0 if one is available now)."""
+        self._expire(now)
+        if len(self._spent) < self.limit:
+            return 0.0
+        return self._spent[len(self._spent) - self.limit] + self.seconds - now
+    
+    def consume(self, now: float) -> None:
+        self._spent.append(now)
+        
+    def sync_count(self, count: int, now: float) -> None:
+        """Catch up with the server-side count (e.g. requests from another process)."""
+        self._expire(now)
+        for _ in range(count - len(self._spent)):
+            self._spent.append(now)
+
+
 class RateLimiter:
     """
-    Simple fixed-delay rate limiter for Riot API.
-    Ensures minimum delay between requests to stay under limits.
+    Multi-window rate limiter for the Riot API.
     
-    Development key: 100 requests / 2 minutes = 1 request per 1.2 seconds
-    We use 1.5 seconds to be safe.
+    Tracks every application window (e.g. 20/1s and 100/120s) plus per-method
+    windows, and lets requests burst up to whatever allowance remains.
+    Limits self-calibrate from the X-App-Rate-Limit / X-Method-Rate-Limit
+    headers (scaled by a safety margin), and the matching -Count headers
+    resync local usage with the server's view.
     """
     
-    def __init__(self, min_delay: float = 1.5):
-        self.min_delay = min_delay
-        self._last_request: float = 0
-        self._lock: Optional[asyncio.Lock] = None
+    def __init__(
+        self, 
+        app_limits: Optional[List[Tuple[int, int]]] = None,
+        safety_margin: float = 0.9
+    ):
+        """
+        Args:
+            app_limits: Initial (count, seconds) application windows, used
+                until the first response headers arrive
+            safety_margin: Fraction of server-advertised limits to use
+        """
+        self.safety_margin = safety_margin
+        self.app_windows: List[RateLimitWindow] = [
+            RateLimitWindow(count, seconds) for count, seconds in (app_limits or [(1, 1)])
+        ]
+        self.method_windows: Dict[str, List[RateLimitWindow]] = {}
+        self._blocked_until: float = 0
+        self._method_blocked_until: Dict[str, float] = {}
         
-    def _get_lock(self) -> asyncio.Lock:
-        """Lazily create lock in the correct event loop."""
-        if self._lock is None:
-            self._lock = asyncio.Lock()
-        return self._lock
+    def _windows(self, method: str) -> List[RateLimitWindow]:
+        return self.app_windows + self.method_windows.get(method, [])
     
-    async def acquire(self) -> None:
-        """Wait for minimum delay since last request."""
-        async with self._get_lock():
-            now = time.time()
-            elapsed = now - self._last_request
+    def wait_time(self, method: str = "default") -> float:
+        """Seconds until a request for `method` could be sent."""
+        now = time.monotonic()
+        wait = max((w.wait_time(now) for w in self._windows(method)), default=0.0)
+        blocked = max(self._blocked_until, self._method_blocked_until.get(method, 0))
+        return max(wait, blocked - now)
+    
+    def try_acquire(self, method: str = "default") -> bool:
+        """Spend one token in each window if all have budget; never waits."""
+        if self.wait_time(method) > 0:
+            return False
+        now = time.monotonic()
+        for window in self._windows(method):
+            window.consume(now)
+        return True
+    
+    def _calibrate(
+        self,
+        windows: List[RateLimitWindow],
+        limits_header: Optional[str],
+        count_header: Optional[str]
+    ) -> List[RateLimitWindow]:
+        """Rebuild windows from advertised limits and resync their counts."""
+        limits = parse_rate_limit_header(limits_header)
+        if limits:
+            existing = {w.seconds: w for w in windows}
+            calibrated: List[RateLimitWindow] = []
+            for count, seconds in limits:
+                window = existing.get(seconds) or RateLimitWindow(count, seconds)
+                window.limit = max(1, int(count * self.safety_margin))
+                calibrated.append(window)
+            windows = calibrated
             
-            if elapsed < self.min_delay:
-                wait_time = self.min_delay - elapsed
-                await asyncio.sleep(wait_time)
+        now = time.monotonic()
+        by_seconds = {w.seconds: w for w in windows}
+        for count, seconds in parse_rate_limit_header(count_header):
+            if seconds in by_seconds:
+                by_seconds[seconds].sync_count(count, now)
+                
+        return windows
+    
+    def update_from_headers(self, headers: Any, method: str = "default") -> None:
+        """Self-calibrate from a response's rate-limit headers."""
+        if not headers:
+            return
             
-            self._last_request = time.time()
+        self.app_windows = self._calibrate(
+            self.app_windows,
+            headers.get("X-App-Rate-Limit"),
+            headers.get("X-App-Rate-Limit-Count")
+        )
+        
+        if headers.get("X-Method-Rate-Limit"):
+            self.method_windows[method] = self._calibrate(
+                self.method_windows.get(method, []),
+                headers.get("X-Method-Rate-Limit"),
+                headers.get("X-Method-Rate-Limit-Count")
+            )
+    
+    def handle_retry_after(self, retry_after: float, method: Optional[str] = None) -> None:
+        """
+        Pause this bucket after a 429 without blocking the caller.
+        
+        Args:
+            retry_after: Seconds from the Retry-After header
+            method: Pause only this method (method-limit 429s); None pauses
+                every request on the bucket (application-limit 429s)
+        """
+        until = time.monotonic() + retry_after + 1  # Add 1 second buffer
+        if method:
+            logger.warning(f"Rate limited on {method}! Pausing it for {retry_after:.0f}s")
+            self._method_blocked_until[method] = max(
+                self._method_blocked_until.get(method, 0), until
+            )
+        else:
+            logger.warning(f"Rate limited! Pausing bucket for {retry_after:.0f}s")
+            self._blocked_until = max(self._blocked_until, until)
+
+
+def api_headers() -> Dict[str, str]:
+    """
+    Riot API headers shared by every request.
     
-    async def handle_retry_after(self, retry_after: int) -> None:
-        """Handle a 429 response by waiting for Retry-After."""
-        logger.warning(f"Rate limited! Waiting {retry_after}s...")
-        await asyncio.sleep(retry_after + 1)  # Add 1 second buffer
-        self._last_request = time.time()
+    X-Riot-Token is not included: it is set per request by the ApiKeyPool.
+    """
+    return {
+        "Accept": "application/json",
+        "Accept-Charset": "application/json;charset=UTF-8"
+    }
+
+
+def create_api_session(
+    headers: Dict[str, str], 
+    connection_limit: int = 50
+) -> aiohttp.ClientSession:
+    """Create an aiohttp session tuned for the Riot API."""
+    timeout = aiohttp.ClientTimeout(total=30)
+    connector = aiohttp.TCPConnector(limit=connection_limit, limit_per_host=20)
+    return aiohttp.ClientSession(
+        headers=headers,
+        timeout=timeout,
+        connector=connector
+    )
+
+
+class RateLimiterPool:
+    """
+    One RateLimiter per Riot host.
+    
+    Riot enforces limits per routing value (americas/europe/asia/sea) and per
+    platform (tr1/euw1/...), so each host gets independent buckets and
+    regions on different clusters never throttle each other.
+    """
+    
+    def __init__(
+        self, 
+        app_limits: List[Tuple[int, int]], 
+        safety_margin: float = 0.9
+    ):
+        self.app_limits = app_limits
+        self.safety_margin = safety_margin
+        self._limiters: Dict[str, RateLimiter] = {}
+        
+    def get(self, host: str) -> RateLimiter:
+        """Get (or lazily create) the limiter for a routing value or platform."""
+        if host not in self._limiters:
+            self._limiters[host] = RateLimiter(
+                app_limits=self.app_limits,
+                safety_margin=self.safety_margin
+            )
+        return self._limiters[host]
+    
+    @classmethod
+    def from_config(cls, crawler_config: CrawlerConfig) -> "RateLimiterPool":
+        """Pool seeded with the configured windows until headers arrive."""
+        return cls(
+            app_limits=[
+                (crawler_config.requests_per_second, 1),
+                (crawler_config.requests_per_two_minutes, 120)
+            ],
+            safety_margin=crawler_config.rate_limit_safety
+        )
+
+
+class NoApiKeysError(RuntimeError):
+    """Raised when every key in the pool has been rejected by the API."""
+
+
+class ApiKeyPool:
+    """
+    A pool of Riot API keys, each with its own per-host RateLimiterPool.
+    
+    Riot's application limits apply per key, so every key gets separate
+    buckets for every routing cluster and platform. Each request goes to the
+    key that can send soonest, and total throughput grows with the number of
+    keys. Keys the API rejects are dropped from the pool.
+    """
+    
+    def __init__(
+        self,
+        keys: List[str],
+        app_limits: List[Tuple[int, int]],
+        safety_margin: float = 0.9
+    ):
+        self.app_limits = app_limits
+        self.safety_margin = safety_margin
+        self._limiters: Dict[str, RateLimiterPool] = {
+            key: RateLimiterPool(app_limits, safety_margin) for key in keys
+        }
+        
+    def __len__(self) -> int:
+        return len(self._limiters)
+    
+    @property
+    def keys(self) -> List[str]:
+        return list(self._limiters)
+    
+    def limiter(self, key: str, host: str) -> RateLimiter:
+        """Rate limiter for one key on one host."""
+        pool = self._limiters.get(key)
+        if pool is None:
+            # Key was removed mid-request; a detached limiter keeps callers simple
+            return RateLimiter(self.app_limits, self.safety_margin)
+        return pool.get(host)
+    
+    async def acquire(
+        self,
+        host: str,
+        method: str = "default",
+        exclude: Optional[str] = None
+    ) -> str:
+        """
+        Wait until some key has budget for `method` on `host` and spend it.
+        
+        Args:
+            host: Routing value or platform
+            method: Riot API method name
+            exclude: Key to avoid (if any other key is left)
+            
+        Returns: The key to send the request with
+        """
+        while True:
+            if not self._limiters:
+                raise NoApiKeysError("No valid Riot API keys left in the pool")
+                
+            # Prefer the key that can send soonest
+            waits = sorted(
+                (pool.get(host).wait_time(method), key)
+                for key, pool in self._limiters.items()
+                if key != exclude or len(self._limiters) == 1
+            )
+            for wait, key in waits:
+                if wait > 0:
+                    break
+                if self._limiters[key].get(host).try_acquire(method):
+                    return key
+                    
+            await asyncio.sleep(max(waits[0][0], 0.01))
+            
+    def remove(self, key: str, reason: str) -> None:
+        """Drop a key the API rejected."""
+        if self._limiters.pop(key, None) is not None:
+            logger.warning(
+                f"Removed API key ...{key[-6:]} from pool ({reason}); "
+                f"{len(self._limiters)} key(s) left"
+            )
+            
+    @classmethod
+    def from_config(cls, crawler_config: CrawlerConfig) -> "ApiKeyPool":
+        """Pool over every configured key, seeded with the configured windows."""
+        return cls(
+            keys=crawler_config.get_api_keys(),
+            app_limits=[
+                (crawler_config.requests_per_second, 1),
+                (crawler_config.requests_per_two_minutes, 120)
+            ],
+            safety_margin=crawler_config.rate_limit_safety
+        )
+
+
+class DatabaseWriter:
+    """
+    Single database writer fed by an asyncio queue, with group commit.
+    
+    Crawl workers enqueue matches and player upserts and carry on with
+    network I/O; one writer task collects them and hands each group to a
+    dedicated thread, which commits matches, player rows and patch counts
+    in a single transaction. A group is committed once it holds max_batch
+    records or max_delay seconds after its first record, whichever comes
+    first. The bounded queue applies backpressure when disk falls behind.
+    """
+    
+    def __init__(
+        self,
+        db: Optional[MatchDatabase] = None,
+        max_batch: int = 100,
+        max_delay: float = 1.0,
+        max_queue: int = 5000
+    ):
+        self.db = db or get_database()
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_queue = max_queue
+        
+        # Matches queued but not yet committed (read by dedup checks)
+        self.pending_match_ids: Set[str] = set()
+        
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        
+    @classmethod
+    def from_config(cls, crawler_config: CrawlerConfig) -> "DatabaseWriter":
+        return cls(
+            max_batch=crawler_config.batch_size,
+            max_delay=crawler_config.write_max_delay,
+            max_queue=crawler_config.write_queue_size
+        )
+    
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+    
+    def start(self) -> None:
+        """Start the writer task (no-op if already running)."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+        self._task = asyncio.create_task(self._run())
+        
+    async def put_matches(
+        self,
+        matches: List[MatchRecord],
+        on_commit: Optional[Callable[[int], None]] = None
+    ) -> None:
+        """
+        Queue matches for the next group commit (waits while the queue is full).
+        
+        Args:
+            matches: Records to insert
+            on_commit: Called once committed with how many of these matches
+                were new (duplicates and failed commits count 0)
+        """
+        if not matches:
+            return
+        self.start()
+        self.pending_match_ids.update(m.match_id for m in matches)
+        await self._queue.put(("matches", matches, on_commit))
+        
+    async def put_player(self, player: PlayerRecord) -> None:
+        """Queue a player upsert for the next group commit."""
+        self.start()
+        await self._queue.put(("player", player, None))
+        
+    async def flush(self) -> None:
+        """Wait until everything queued so far is committed."""
+        if not self.running:
+            return
+        done = asyncio.get_running_loop().create_future()
+        await self._queue.put(("flush", done, None))
+        await done
+        
+    async def call(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a blocking database call on the writer thread.
+        
+        Reads and small writes outside the group commit (frontier spills,
+        lease updates, dedup lookups) go through here so the event loop
+        never blocks on SQLite and all database work stays on one thread.
+        """
+        self.start()
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+    
+    async def close(self) -> None:
+        """Commit outstanding writes and stop the writer."""
+        if not self.running:
+            return
+        await self._queue.put(("stop", None, None))
+        await self._task
+        self._executor.shutdown(wait=True)
+        self._task = None
+        
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        
+        while not stopping:
+            group = [await self._queue.get()]
+            records = 0
+            deadline = loop.time() + self.max_delay
+            
+            # Gather until the group is full, the deadline passes, or a
+            # flush/stop asks for an immediate commit
+            while True:
+                kind = group[-1][0]
+                if kind in ("flush", "stop"):
+                    stopping = kind == "stop"
+                    break
+                records += len(group[-1][1]) if kind == "matches" else 1
+                if records >= self.max_batch:
+                    break
+                    
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    group.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+                    
+            await self._commit(group)
+            
+    async def _commit(self, group: List[Tuple[str, Any, Any]]) -> None:
+        matches = [m for kind, items, _ in group if kind == "matches" for m in items]
+        players = [p for kind, p, _ in group if kind == "player"]
+        
+        inserted: Set[str] = set()
+        if matches or players:
+            try:
+                inserted = await asyncio.get_running_loop().run_in_executor(
+                    self._executor, self.db.commit_group, matches, players
+                )
+                logger.info(f"Committed {len(inserted)} matches and {len(players)} players")
+            except Exception as e:
+                logger.error(f"Writer failed to commit group: {e}")
+            
+        self.pending_match_ids.difference_update(m.match_id for m in matches)
+        
+        for kind, payload, on_commit in group:
+            if kind == "matches" and on_commit is not None:
+                # Credit each batch only with its own new matches; a match
+                # repeated across batches of the group counts once
+                stored = {m.match_id for m in payload} & inserted
+                inserted -= stored
+                on_commit(len(stored))
+            elif kind == "flush" and not payload.done():
+                payload.set_result(None)
 
 
 @dataclass
@@ -85,6 +550,9 @@ class CrawlStats:
     requests_made: int = 0
     errors: int = 0
     rate_limits_hit: int = 0
+    cache_hits: int = 0  # Responses served from the HTTP cache without a request
+    retries: int = 0  # Requests re-sent after a transient failure
+    work_retried: int = 0  # Match fetches / player listings sent to the retry queue
     
     def log_summary(self) -> None:
         """Log crawl statistics."""
@@ -102,6 +570,8 @@ Players Crawled: {self.players_crawled}
 Requests Made: {self.requests_made}
 Errors: {self.errors}
 Rate Limits Hit: {self.rate_limits_hit}
+Cache Hits: {self.cache_hits}
+Retries: {self.retries} requests, {self.work_retried} rescheduled
 Storage Rate: {rate:.2f} matches/sec
 ========================
         """)
@@ -115,74 +585,113 @@ class MatchCrawler:
     to maintain a current-patch-only dataset.
     """
     
-    # DDragon API
-    DDRAGON_VERSIONS_URL = "https://ddragon.leagueoflegends.com/api/versions.json"
+    # DDragon API (relative to CrawlerConfig.ddragon_base_url)
+    DDRAGON_VERSIONS_PATH = "/api/versions.json"
     
-    # Riot API endpoints (templated)
-    MATCH_BY_PUUID_URL = "https://{routing}.api.riotgames.com/lol/match/v5/matches/by-puuid/{puuid}/ids"
-    MATCH_DETAILS_URL = "https://{routing}.api.riotgames.com/lol/match/v5/matches/{match_id}"
-    SUMMONER_BY_PUUID_URL = "https://{region}.api.riotgames.com/lol/summoner/v4/summoners/by-puuid/{puuid}"
-    LEAGUE_ENTRIES_URL = "https://{region}.api.riotgames.com/lol/league/v4/entries/by-summoner/{summoner_id}"
-    CHALLENGER_LEAGUE_URL = "https://{region}.api.riotgames.com/lol/league/v4/challengerleagues/by-queue/{queue}"
-    GRANDMASTER_LEAGUE_URL = "https://{region}.api.riotgames.com/lol/league/v4/grandmasterleagues/by-queue/{queue}"
-    MASTER_LEAGUE_URL = "https://{region}.api.riotgames.com/lol/league/v4/masterleagues/by-queue/{queue}"
+    # Riot API endpoints (templated, relative to CrawlerConfig.api_base_url)
+    MATCH_BY_PUUID_PATH = "/lol/match/v5/matches/by-puuid/{puuid}/ids"
+    MATCH_DETAILS_PATH = "/lol/match/v5/matches/{match_id}"
+    SUMMONER_BY_PUUID_PATH = "/lol/summoner/v4/summoners/by-puuid/{puuid}"
+    SUMMONER_BY_ID_PATH = "/lol/summoner/v4/summoners/{summoner_id}"
+    LEAGUE_ENTRIES_PATH = "/lol/league/v4/entries/by-summoner/{summoner_id}"
+    CHALLENGER_LEAGUE_PATH = "/lol/league/v4/challengerleagues/by-queue/{queue}"
+    GRANDMASTER_LEAGUE_PATH = "/lol/league/v4/grandmasterleagues/by-queue/{queue}"
+    MASTER_LEAGUE_PATH = "/lol/league/v4/masterleagues/by-queue/{queue}"
     
-    def __init__(self, crawler_config: Optional[CrawlerConfig] = None):
+    def __init__(
+        self, 
+        crawler_config: Optional[CrawlerConfig] = None,
+        session: Optional[aiohttp.ClientSession] = None,
+        key_pool: Optional[ApiKeyPool] = None,
+        seen_index: Optional[SeenIndex] = None,
+        writer: Optional[DatabaseWriter] = None,
+        response_cache: Optional[ResponseCache] = None,
+        breakers: Optional[CircuitBreakerPool] = None
+    ):
+        """
+        Args:
+            crawler_config: Crawler settings (global config if None)
+            session: Shared aiohttp session (owned and created lazily if None)
+            key_pool: Shared API key pool with per-key, per-host limiters
+                (private if None)
+            seen_index: Shared persistent seen-index (private if None)
+            writer: Shared database writer (owned if None)
+            response_cache: Shared on-disk HTTP cache (private if None)
+            breakers: Shared per-endpoint circuit breakers (private if None)
+        """
         self.config = crawler_config or config.crawler
         self.db = get_database()
-        # 1.5 second delay = ~40 requests per minute, safe under 100/2min limit
-        self.rate_limiter = RateLimiter(min_delay=1.5)
+        
+        # Per-key, per-host buckets, seeded with the configured windows
+        # until the API advertises each key's real limits
+        self.key_pool = key_pool or ApiKeyPool.from_config(self.config)
+        
+        # Versions and league ladders change slowly; cache them across runs
+        self.response_cache = response_cache or ResponseCache.from_config(self.config)
+        
+        # Failing endpoints are paused; failed work is retried later
+        self.breakers = breakers or CircuitBreakerPool.from_config(self.config)
+        self.match_retries = RetryQueue.from_config(self.config)  # (match_id, region, score)
+        self.player_retries = RetryQueue.from_config(self.config)  # (puuid, priority)
         
         # Current patch info
         self.current_version: Optional[str] = None
         self.current_major_minor: Optional[str] = None
+        # Earliest current-patch gameCreation seen (epoch ms); bounds match listings
+        self.patch_start_ms: Optional[int] = None
         
         # Crawl state
         self.state = CrawlState.IDLE
         self.stats = CrawlStats()
         
-        # In-memory queues
-        self.puuid_queue: deque[Tuple[str, str]] = deque(maxlen=self.config.max_queue_size)
-        self.seen_puuids: Set[str] = set()
-        self.seen_matches: Set[str] = set()
+        # Priority frontier for the region being crawled (created by run();
+        # overflow and leftovers live in the crawl_queue table)
+        self.frontier: Optional[CrawlFrontier] = None
+        
+        # Persistent, bounded dedup of stored matches and recent players
+        # (opened lazily at the start of run())
+        self.seen_index = seen_index or SeenIndex.from_config(self.config)
         
-        # Match buffer for batch insert
-        self.match_buffer: List[MatchRecord] = []
+        # Match IDs currently being fetched by some worker
+        self.inflight_matches: Set[str] = set()
+        
+        # All writes go through a group-committing writer thread so the
+        # event loop never blocks on SQLite
+        self.writer = writer or DatabaseWriter.from_config(self.config)
+        self._owns_writer = writer is None
+        self._uncommitted = 0  # Matches handed to the writer, not yet committed
         
         # Concurrency control
         self.semaphore: Optional[asyncio.Semaphore] = None
         
-        # Session
-        self._session: Optional[aiohttp.ClientSession] = None
+        # Session (shared sessions are closed by their owner)
+        self._session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None
         
     @property
     def headers(self) -> Dict[str, str]:
-        """Get API request headers."""
-        return {
-            "X-Riot-Token": self.config.api_key,
-            "Accept": "application/json",
-            "Accept-Charset": "application/json;charset=UTF-8"
-        }
+        """Get API request headers (the key is added per request)."""
+        return api_headers()
     
     def get_routing(self, region: str) -> str:
         """Get routing region for match-v5 API."""
         return self.config.routing_regions.get(region, "europe")
     
+    def api_url(self, path: str, host: str, **params: Any) -> str:
+        """Full URL of a Riot API path on a routing value or platform host."""
+        return self.config.api_base_url.format(host=host) + path.format(**params)
+    
     async def _get_session(self) -> aiohttp.ClientSession:
         """Get or create aiohttp session."""
         if self._session is None or self._session.closed:
-            timeout = aiohttp.ClientTimeout(total=30)
-            connector = aiohttp.TCPConnector(limit=50, limit_per_host=20)
-            self._session = aiohttp.ClientSession(
-                headers=self.headers,
-                timeout=timeout,
-                connector=connector
-            )
+            self._session = create_api_session(self.headers)
         return self._session
     
     async def close(self) -> None:
         """Close resources."""
-        if self._session and not self._session.closed:
+        if self._owns_writer:
+            await self.writer.close()
+        if self._owns_session and self._session and not self._session.closed:
             await self._session.close()
         self.state = CrawlState.STOPPED
     
@@ -193,28 +702,71 @@ class MatchCrawler:
         Fetch the latest LoL version from DDragon.
         Critical for filtering matches by current patch.
         """
-        session = await self._get_session()
+        url = self.config.ddragon_base_url + self.DDRAGON_VERSIONS_PATH
+        ttl = self.config.version_cache_ttl
+        cached = self.response_cache.get(url)
+        versions = None
         
-        try:
-            async with session.get(self.DDRAGON_VERSIONS_URL) as resp:
-                if resp.status == 200:
-                    versions = await resp.json()
-                    if versions and len(versions) > 0:
-                        latest = versions[0]  # e.g., "14.24.1"
-                        self.current_version = latest
-                        # Extract major.minor for comparison
-                        parts = latest.split(".")
-                        self.current_major_minor = f"{parts[0]}.{parts[1]}"
-                        logger.info(f"Current patch: {latest} (filtering for {self.current_major_minor})")
-                        return latest
-        except Exception as e:
-            logger.error(f"Failed to fetch version: {e}")
+        if cached is not None and cached.fresh:
+            self.stats.cache_hits += 1
+            versions = cached.body
+        else:
+            session = await self._get_session()
+            try:
+                validators = cached.validators() if cached is not None else None
+                async with session.get(url, headers=validators) as resp:
+                    if resp.status == 304 and cached is not None:
+                        self.response_cache.refresh(cached, None, resp.headers, ttl)
+                        versions = cached.body
+                    elif resp.status == 200:
+                        versions = await resp.json()
+                        self.response_cache.store(url, None, versions, resp.headers, ttl)
+            except Exception as e:
+                logger.error(f"Failed to fetch version: {e}")
+                
+            # A stale list still beats the hardcoded fallback
+            if versions is None and cached is not None:
+                versions = cached.body
+                
+        if versions and len(versions) > 0:
+            latest = versions[0]  # e.g., "14.24.1"
+            self.current_version = latest
+            # Extract major.minor for comparison
+            parts = latest.split(".")
+            self.current_major_minor = f"{parts[0]}.{parts[1]}"
+            logger.info(f"Current patch: {latest} (filtering for {self.current_major_minor})")
+        else:
+            # Fallback
+            self.current_version = "14.24.1"
+            self.current_major_minor = "14.24"
             
-        # Fallback
-        self.current_version = "14.24.1"
-        self.current_major_minor = "14.24"
+        self.patch_start_ms = await self.writer.call(
+            self.db.get_patch_start, self.current_major_minor
+        )
+        if self.patch_start_ms:
+            started = datetime.fromtimestamp(self.patch_start_ms / 1000).isoformat(timespec="minutes")
+            logger.info(f"Patch {self.current_major_minor} games seen since {started}")
         return self.current_version
     
+    def observe_patch_game(self, game_creation: int) -> None:
+        """Lower the known patch start to a current-patch game's creation time."""
+        if game_creation > 0 and (self.patch_start_ms is None or game_creation < self.patch_start_ms):
+            self.patch_start_ms = game_creation
+    
+    def match_start_time(self) -> Optional[int]:
+        """
+        startTime (epoch seconds) for match listings, so old-patch games are
+        never listed.
+        
+        The earliest game we have seen only bounds the patch start from
+        above, and regions get a patch hours apart, so the margin is
+        subtracted. None until a current-patch game has been seen.
+        """
+        if not self.patch_start_ms:
+            return None
+        margin = int(self.config.patch_start_margin_hours * 3600)
+        return max(0, self.patch_start_ms // 1000 - margin)
+    
     def is_current_patch(self, game_version: str) -> bool:
         """
         Check if a match's game version matches current patch.
@@ -238,51 +790,180 @@ class MatchCrawler:
     async def _make_request(
         self, 
         url: str, 
-        params: Optional[Dict] = None
+        params: Optional[Dict] = None,
+        method: str = "default",
+        host: str = "default",
+        cache_ttl: Optional[float] = None,
+        decode: Optional[Callable[[bytes], Any]] = None
     ) -> Tuple[Optional[Any], int]:
         """
-        Make a rate-limited API request.
+        Make a rate-limited API request on whichever key has budget.
+        
+        Transient failures (5xx, timeouts, 429s) are retried up to
+        CrawlerConfig.max_retries times. Backoff sleeps happen outside the
+        request semaphore, and a 429 only pauses the bucket that was
+        exhausted. Requests to an endpoint whose circuit breaker is open
+        fail fast with status 0.
+        
+        Args:
+            url: Request URL
+            params: Query parameters
+            method: Riot API method name, used for per-method rate limits
+            host: Routing value or platform whose buckets the request uses
+            cache_ttl: Serve from / store in the response cache for this
+                many seconds (uncached if None)
+            decode: Body decoder (defaults to decoding.loads); bodies of
+                CrawlerConfig.decode_offload_bytes or more are decoded in a
+                worker thread
         
         Returns: (json_data, status_code)
         """
-        await self.rate_limiter.acquire()
-        
+        cached = self.response_cache.get(url, params) if cache_ttl else None
+        if cached is not None and cached.fresh:
+            # No request at all, so no rate limit budget spent
+            self.stats.cache_hits += 1
+            return cached.body, 200
+            
+        request_headers = cached.validators() if cached is not None else {}
         session = await self._get_session()
-        self.stats.requests_made += 1
+        breaker = self.breakers.get(host, method)
+        suspect: Optional[str] = None  # Key that got a 403 on this request
+        attempt = 0
         
-        try:
-            async with self.semaphore:
-                async with session.get(url, params=params) as resp:
-                    status = resp.status
-                    
-                    if status == 200:
-                        return await resp.json(), status
-                        
-                    elif status == 429:
-                        # Rate limited
-                        self.stats.rate_limits_hit += 1
-                        retry_after = int(resp.headers.get("Retry-After", 60))
-                        await self.rate_limiter.handle_retry_after(retry_after)
-                        return None, status
-                        
-                    elif status == 404:
-                        # Not found - not an error for our purposes
-                        return None, status
-                        
-                    else:
-                        logger.warning(f"Request failed: {url} -> {status}")
-                        self.stats.errors += 1
-                        return None, status
-                        
-        except asyncio.TimeoutError:
-            logger.warning(f"Request timeout: {url}")
-            self.stats.errors += 1
-            return None, 0
+        while True:
+            if not breaker.allow():
+                # Endpoint keeps failing: don't queue more requests on it
+                return None, 0
+            probing = breaker.state == breaker.HALF_OPEN
+            status = 0
+            retry_delay = 0.0  # Pause before the next attempt
             
-        except Exception as e:
-            logger.error(f"Request error: {url} -> {e}")
-            self.stats.errors += 1
-            return None, 0
+            try:
+                key = await self.key_pool.acquire(host, method, exclude=suspect)
+                rate_limiter = self.key_pool.limiter(key, host)
+                self.stats.requests_made += 1
+                
+                async with self.semaphore:
+                    async with session.get(
+                        url, params=params, headers={**request_headers, "X-Riot-Token": key}
+                    ) as resp:
+                        status = resp.status
+                        rate_limiter.update_from_headers(resp.headers, method)
+                        
+                        if status == 401:
+                            # Invalid or expired key: drop it and retry on another
+                            self.key_pool.remove(key, "401 Unauthorized")
+                            continue
+                            
+                        if status == 403:
+                            # Forbidden can mean a revoked key or a forbidden
+                            # endpoint; only a second key can tell them apart
+                            if suspect is None and len(self.key_pool) > 1:
+                                suspect = key
+                                continue
+                            logger.warning(f"Request forbidden: {url} -> 403")
+                            self.stats.errors += 1
+                            return None, status
+                            
+                        if suspect is not None:
+                            # Another key was accepted, so the 403 was the key's fault
+                            self.key_pool.remove(suspect, "403 Forbidden")
+                            suspect = None
+                            
+                        if status == 429:
+                            self.stats.rate_limits_hit += 1
+                            limit_type = resp.headers.get("X-Rate-Limit-Type", "service")
+                            retry_after = resp.headers.get("Retry-After")
+                            
+                            if limit_type == "service" or retry_after is None:
+                                # The service behind the endpoint is overloaded
+                                breaker.record_failure()
+                                retry_delay = backoff_delay(
+                                    attempt, self.config.retry_base_delay, self.config.retry_max_delay
+                                )
+                            else:
+                                # Our own bucket is empty: pause just this key's
+                                # host (or method) bucket; the next attempt waits
+                                # in acquire() or goes out on another key
+                                rate_limiter.handle_retry_after(
+                                    float(retry_after),
+                                    method if limit_type == "method" else None
+                                )
+                                
+                        elif status >= 500:
+                            breaker.record_failure()
+                            retry_delay = backoff_delay(
+                                attempt, self.config.retry_base_delay, self.config.retry_max_delay
+                            )
+                            
+                        else:
+                            breaker.record_success()
+                            
+                            if status == 304 and cached is not None:
+                                # Unchanged since cached: restart its TTL
+                                self.response_cache.refresh(cached, params, resp.headers, cache_ttl)
+                                return cached.body, 200
+                                
+                            if status == 200:
+                                try:
+                                    data = await self._decode(await resp.read(), decode)
+                                except ValueError as e:
+                                    # Refetching would return the same payload
+                                    logger.warning(f"Undecodable response: {url} -> {e}")
+                                    self.stats.errors += 1
+                                    return None, status
+                                    
+                                if cache_ttl:
+                                    self.response_cache.store(url, params, data, resp.headers, cache_ttl)
+                                return data, status
+                                
+                            elif status == 404:
+                                # Not found - not an error for our purposes
+                                return None, status
+                                
+                            else:
+                                logger.warning(f"Request failed: {url} -> {status}")
+                                self.stats.errors += 1
+                                return None, status
+                                
+            except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+                breaker.record_failure()
+                retry_delay = backoff_delay(
+                    attempt, self.config.retry_base_delay, self.config.retry_max_delay
+                )
+                logger.debug(f"Request to {url} failed ({e!r}), attempt {attempt + 1}")
+                
+            except NoApiKeysError:
+                raise
+                
+            except Exception as e:
+                logger.error(f"Request error: {url} -> {e}")
+                self.stats.errors += 1
+                return None, 0
+                
+            finally:
+                # Key errors, our own rate limits and unexpected errors say
+                # nothing about the endpoint: let the next request probe
+                if probing:
+                    breaker.release_probe()
+                
+            attempt += 1
+            if attempt > self.config.max_retries:
+                logger.warning(f"Giving up on {url} after {attempt} attempts (last status {status})")
+                self.stats.errors += 1
+                return None, status
+                
+            # Back off outside the semaphore so other requests keep flowing
+            self.stats.retries += 1
+            if retry_delay > 0:
+                await asyncio.sleep(retry_delay)
+    
+    async def _decode(self, raw: bytes, decode: Optional[Callable[[bytes], Any]] = None) -> Any:
+        """Decode a response body, in a worker thread if it is large."""
+        decode = decode or loads
+        if len(raw) < self.config.decode_offload_bytes:
+            return decode(raw)
+        return await asyncio.get_running_loop().run_in_executor(None, decode, raw)
     
     # ==================== DATA FETCHING ====================
     
@@ -292,10 +973,14 @@ class MatchCrawler:
         region: str,
         count: int = 20,
         queue: int = 420  # Ranked Solo/Duo
-    ) -> List[str]:
-        """Fetch recent match IDs for a player."""
+    ) -> Optional[List[str]]:
+        """
+        Fetch recent match IDs for a player.
+        
+        Returns: Match IDs, or None if the request failed transiently
+        """
         routing = self.get_routing(region)
-        url = self.MATCH_BY_PUUID_URL.format(routing=routing, puuid=puuid)
+        url = self.api_url(self.MATCH_BY_PUUID_PATH, routing, puuid=puuid)
         
         params = {
             "queue": queue,
@@ -303,30 +988,59 @@ class MatchCrawler:
             "start": 0,
             "count": count
         }
+        start_time = self.match_start_time()
+        if start_time is not None:
+            params["startTime"] = start_time
         
-        data, status = await self._make_request(url, params)
+        data, status = await self._make_request(
+            url, params, method="match-v5.ids", host=routing
+        )
         
         if data and isinstance(data, list):
-            # Filter out already seen matches
-            new_matches = [m for m in data if m not in self.seen_matches]
-            return new_matches
+            return data
             
-        return []
+        return None if is_retryable(status) else []
     
-    async def fetch_match_details(self, match_id: str, region: str) -> Optional[MatchRecord]:
+    async def fetch_match_details(
+        self, 
+        match_id: str, 
+        region: str,
+        discovered_score: int = 0
+    ) -> Optional[MatchRecord]:
         """
         Fetch match details and convert to MatchRecord.
         
         Applies strict version filtering - returns None for old patches.
+        With DatabaseConfig.archive_raw the raw body is kept on the record
+        for the compressed archive.
+        Participants not seen before are pushed onto the frontier with
+        `discovered_score` as their skill estimate. Transient failures put
+        the match on the retry queue.
         """
         routing = self.get_routing(region)
-        url = self.MATCH_DETAILS_URL.format(routing=routing, match_id=match_id)
+        url = self.api_url(self.MATCH_DETAILS_PATH, routing, match_id=match_id)
         
-        data, status = await self._make_request(url)
+        keep_raw = self.db.config.archive_raw
+        data, status = await self._make_request(
+            url, method="match-v5.match", host=routing,
+            decode=decode_match_keep_raw if keep_raw else decode_match
+        )
+        raw_payload = None
+        if data and keep_raw:
+            data, raw_payload = data
         
         if not data:
+            if is_retryable(status):
+                self._retry_later(
+                    self.match_retries, match_id, (match_id, region, discovered_score),
+                    self.breakers.get(routing, "match-v5.match").retry_after()
+                )
+            else:
+                self.match_retries.forget(match_id)
             return None
             
+        self.match_retries.forget(match_id)
+
         self.stats.matches_fetched += 1
         
         # Parse and validate
@@ -343,6 +1057,8 @@ class MatchCrawler:
                 return None
             # ====================================
             
+            self.observe_patch_game(info.get("gameCreation", 0))
+            
             # Only process Summoner's Rift ranked games
             queue_id = info.get("queueId", 0)
             if queue_id not in [420, 440]:  # Ranked Solo/Flex
@@ -376,16 +1092,17 @@ class MatchCrawler:
                     red_items.append(items)
             
             # Discover new players
-            new_puuids = [
-                (p, region) for p in metadata.get("participants", [])
-                if p not in self.seen_puuids
-            ]
-            if new_puuids:
-                for puuid, reg in new_puuids:
-                    if len(self.puuid_queue) < self.config.max_queue_size:
-                        self.puuid_queue.append((puuid, reg))
-                        self.seen_puuids.add(puuid)
-                        self.stats.players_discovered += 1
+            if self.frontier is not None:
+                priority = player_priority(discovered_score)
+                discovered = [
+                    (puuid, priority) for puuid in metadata.get("participants", [])
+                    if not self.seen_index.has_player(puuid)
+                ]
+                for puuid, _ in discovered:
+                    self.seen_index.add_player(puuid)
+                if discovered:
+                    await self.writer.call(self.frontier.push_many, discovered)
+                    self.stats.players_discovered += len(discovered)
             
             return MatchRecord(
                 match_id=match_id,
@@ -399,7 +1116,8 @@ class MatchCrawler:
                 red_team_champions=red_team,
                 blue_team_items=blue_items,
                 red_team_items=red_items,
-                timestamp=info.get("gameCreation", 0)
+                timestamp=info.get("gameCreation", 0),
+                raw_payload=raw_payload
             )
             
         except Exception as e:
@@ -407,115 +1125,252 @@ class MatchCrawler:
             self.stats.errors += 1
             return None
     
-    async def fetch_high_elo_players(self, region: str) -> List[str]:
+    async def fetch_high_elo_players(self, region: str) -> List[Tuple[str, str, str]]:
         """
-        Fetch high ELO player PUUIDs to seed the crawler.
-        Gets Challenger/GM/Master players.
+        Fetch high ELO players to seed the crawler.
+        Gets Challenger/GM/Master players and records their tier/rank.
+        
+        Returns: List of (puuid, tier, rank)
         """
-        puuids: List[str] = []
+        players: List[Tuple[str, str, str]] = []
+        unresolved: List[Tuple[str, str, str]] = []  # (summoner_id, tier, rank)
         
-        league_urls = [
-            (self.CHALLENGER_LEAGUE_URL, "RANKED_SOLO_5x5"),
-            (self.GRANDMASTER_LEAGUE_URL, "RANKED_SOLO_5x5"),
-            (self.MASTER_LEAGUE_URL, "RANKED_SOLO_5x5")
+        league_paths = [
+            (self.CHALLENGER_LEAGUE_PATH, "RANKED_SOLO_5x5"),
+            (self.GRANDMASTER_LEAGUE_PATH, "RANKED_SOLO_5x5"),
+            (self.MASTER_LEAGUE_PATH, "RANKED_SOLO_5x5")
         ]
         
-        for url_template, queue in league_urls:
-            url = url_template.format(region=region, queue=queue)
-            data, status = await self._make_request(url)
+        for path, queue in league_paths:
+            # Rate limit friendly
+            if len(players) + len(unresolved) >= 100:
+                break
+                
+            url = self.api_url(path, region, queue=queue)
+            data, status = await self._make_request(
+                url,
+                method="league-v4.league",
+                host=region,
+                cache_ttl=self.config.league_cache_ttl
+            )
             
             if data and "entries" in data:
-                entries = data["entries"]
+                tier = data.get("tier", "")
                 
-                # Riot API now returns PUUID directly in league entries
-                for entry in entries[:50]:  # Limit per tier
-                    puuid = entry.get("puuid")
-                    if puuid:
-                        puuids.append(puuid)
-                    else:
-                        # Fallback: Old API format with summonerId
-                        summoner_id = entry.get("summonerId")
-                        if summoner_id:
-                            summoner_url = f"https://{region}.api.riotgames.com/lol/summoner/v4/summoners/{summoner_id}"
-                            summoner_data, _ = await self._make_request(summoner_url)
-                            if summoner_data and "puuid" in summoner_data:
-                                puuids.append(summoner_data["puuid"])
-                            
-                    # Rate limit friendly
-                    if len(puuids) >= 100:
-                        break
+                for entry in data["entries"][:50]:  # Limit per tier
+                    rank = entry.get("rank", "I")
+                    # Riot API now returns PUUID directly in league entries
+                    if entry.get("puuid"):
+                        players.append((entry["puuid"], tier, rank))
+                    # Fallback: Old API format with summonerId
+                    elif entry.get("summonerId"):
+                        unresolved.append((entry["summonerId"], tier, rank))
                         
-        logger.info(f"Fetched {len(puuids)} high ELO players from {region}")
-        return puuids
+        if unresolved:
+            players.extend(await self.resolve_summoner_ids(region, unresolved))
+            
+        await self.writer.call(self.db.record_player_ranks, [
+            (puuid, region, tier, rank) for puuid, tier, rank in players
+        ])
+        
+        logger.info(f"Fetched {len(players)} high ELO players from {region}")
+        return players
+    
+    async def resolve_summoner_ids(
+        self,
+        region: str,
+        entries: List[Tuple[str, str, str]]
+    ) -> List[Tuple[str, str, str]]:
+        """
+        Map (summoner_id, tier, rank) league entries to (puuid, tier, rank).
+        
+        Known IDs come from the summoner_ids table; the rest are looked up
+        concurrently (paced by the key pool) and saved for the next run.
+        Entries that cannot be resolved are dropped.
+        """
+        summoner_ids = list(dict.fromkeys(sid for sid, _, _ in entries))
+        mapping = await self.writer.call(self.db.get_summoner_puuids, region, summoner_ids)
+        missing = [sid for sid in summoner_ids if sid not in mapping]
+        
+        if missing:
+            async def lookup(summoner_id: str) -> Optional[str]:
+                url = self.api_url(self.SUMMONER_BY_ID_PATH, region, summoner_id=summoner_id)
+                data, _ = await self._make_request(
+                    url, method="summoner-v4.summoner", host=region
+                )
+                return data.get("puuid") if data else None
+                
+            puuids = await asyncio.gather(*(lookup(sid) for sid in missing))
+            resolved = {sid: puuid for sid, puuid in zip(missing, puuids) if puuid}
+            await self.writer.call(self.db.save_summoner_puuids, region, resolved)
+            mapping.update(resolved)
+            logger.info(
+                f"Resolved {len(resolved)}/{len(missing)} summoner IDs in {region} "
+                f"({len(summoner_ids) - len(missing)} already known)"
+            )
+            
+        return [
+            (mapping[sid], tier, rank)
+            for sid, tier, rank in entries
+            if sid in mapping
+        ]
     
     # ==================== CRAWL LOGIC ====================
     
-    async def crawl_player(self, puuid: str, region: str) -> int:
+    async def filter_unseen_matches(self, match_ids: List[str]) -> List[str]:
+        """
+        Drop matches that are already stored (or queued for storing).
+        
+        The Bloom filter settles most IDs without touching SQLite; its hits
+        may be false positives, so they are confirmed exactly with one bulk
+        query for the whole list.
+        """
+        candidates = [
+            m for m in dict.fromkeys(match_ids)
+            if m not in self.writer.pending_match_ids
+        ]
+        maybe_stored = {m for m in candidates if self.seen_index.might_have_match(m)}
+        if not maybe_stored:
+            return candidates
+            
+        missing = set(await self.writer.call(self.db.filter_missing_matches, list(maybe_stored)))
+        return [m for m in candidates if m not in maybe_stored or m in missing]
+        
+    async def crawl_player(self, puuid: str, region: str, priority: int = 0) -> int:
         """
         Crawl a single player's recent matches.
         
+        Args:
+            puuid: Player to crawl
+            region: Player's platform
+            priority: Frontier priority the player was popped with; players
+                discovered in their games inherit its skill score minus one
+                division
+        
         Returns: Number of new matches stored
         """
-        self.stats.players_crawled += 1
-        
         # Get match IDs
         match_ids = await self.fetch_match_ids(
             puuid, region, 
             count=self.config.max_matches_per_player
         )
         
-        if not match_ids:
+        if match_ids is None:
+            # Listing failed transiently: crawl the player again later
+            self._retry_later(
+                self.player_retries, puuid, (puuid, priority),
+                self.breakers.get(self.get_routing(region), "match-v5.ids").retry_after()
+            )
             return 0
             
-        # Fetch match details SEQUENTIALLY to avoid rate limits
-        valid_matches: List[MatchRecord] = []
-        for match_id in match_ids:
-            if match_id in self.seen_matches:
-                continue
-            
-            match = await self.fetch_match_details(match_id, region)
-            if match is not None:
-                valid_matches.append(match)
-            
-            # Small delay between requests
-            await asyncio.sleep(0.1)
+        self.player_retries.forget(puuid)
+        self.stats.players_crawled += 1
         
-        for match in valid_matches:
-            self.seen_matches.add(match.match_id)
-            self.match_buffer.append(match)
-            
-        # Batch insert when buffer is full
-        if len(self.match_buffer) >= self.config.batch_size:
-            await self._flush_buffer()
+        if not match_ids:
+            return 0
             
-        # Update player record
-        player = PlayerRecord(
+        discovered_score = max(0, priority_score(priority) - 1)
+        
+        # Skip matches already in the database with one bulk check
+        unseen = await self.filter_unseen_matches(match_ids)
+        valid_matches = await self._fetch_and_store([
+            (match_id, region, discovered_score) for match_id in unseen
+        ])
+        
+        # Hand the player record to the writer; this only waits when the
+        # write queue is full
+        await self.writer.put_player(PlayerRecord(
             puuid=puuid,
             region=region,
             last_crawled=datetime.now(),
             matches_found=len(valid_matches)
-        )
-        self.db.upsert_player(player)
+        ))
         
         return len(valid_matches)
     
-    async def _flush_buffer(self) -> None:
-        """Flush match buffer to database."""
-        if not self.match_buffer:
+    async def _fetch_and_store(self, items: List[Tuple[str, str, int]]) -> List[MatchRecord]:
+        """
+        Fetch (match_id, region, discovered_score) details concurrently and
+        queue the valid matches for group commit.
+        
+        Returns: The valid matches
+        """
+        # Claim the matches no other worker is fetching or will retry
+        items = [
+            item for item in items
+            if item[0] not in self.inflight_matches and item[0] not in self.match_retries
+        ]
+        claimed = [match_id for match_id, _, _ in items]
+        self.inflight_matches.update(claimed)
+        
+        # Fetch match details concurrently; pacing is left to the rate limiter
+        try:
+            results = await asyncio.gather(
+                *(self.fetch_match_details(*item) for item in items)
+            )
+        finally:
+            self.inflight_matches.difference_update(claimed)
+            
+        valid_matches = [m for m in results if m is not None]
+        
+        for match in valid_matches:
+            self.seen_index.add_match(match.match_id)
+            
+        await self._store_matches(valid_matches)
+        return valid_matches
+    
+    def _retry_later(
+        self,
+        queue: RetryQueue,
+        key: str,
+        payload: Tuple,
+        min_delay: float = 0.0
+    ) -> None:
+        """Reschedule failed work, or give up on it once out of attempts."""
+        if queue.schedule(key, payload, min_delay):
+            self.stats.work_retried += 1
+        else:
+            logger.warning(f"Giving up on {key} after {queue.max_attempts} retries")
+            self.stats.errors += 1
+    
+    async def _process_retries(self) -> None:
+        """Hand due player retries back to the frontier and re-fetch due matches."""
+        due_players = self.player_retries.pop_due()
+        if due_players:
+            await self.writer.call(self.frontier.push_many, due_players)
+            
+        due = self.match_retries.pop_due()
+        if due:
+            # Another player's listing may have stored some of them meanwhile
+            unseen = set(await self.filter_unseen_matches([match_id for match_id, _, _ in due]))
+            await self._fetch_and_store([item for item in due if item[0] in unseen])
+    
+    async def _store_matches(self, matches: List[MatchRecord]) -> None:
+        """Queue matches for group commit, counting them once committed."""
+        if not matches:
             return
             
-        stored = self.db.insert_matches_batch(self.match_buffer)
-        self.stats.matches_stored += stored
-        self.match_buffer.clear()
+        stats = self.stats
+        self._uncommitted += len(matches)
         
-        logger.info(f"Flushed {stored} matches to database (Total: {self.stats.matches_stored})")
+        def on_commit(stored: int) -> None:
+            self._uncommitted -= len(matches)
+            stats.matches_stored += stored
+            
+        await self.writer.put_matches(matches, on_commit)
+    
+    async def _flush_buffer(self) -> None:
+        """Wait for all queued writes to be committed."""
+        await self.writer.flush()
+        logger.info(f"Flushed writes to database (Total: {self.stats.matches_stored})")
     
     async def run(
         self, 
         region: str,
         seed_puuids: Optional[List[str]] = None,
         max_matches: Optional[int] = None,
-        max_players: Optional[int] = None
+        max_players: Optional[int] = None,
+        close_when_done: bool = True
     ) -> CrawlStats:
         """
         Run the crawler for a specific region.
@@ -525,85 +1380,228 @@ class MatchCrawler:
             seed_puuids: Optional starting PUUIDs (fetches high ELO if empty)
             max_matches: Stop after storing this many matches
             max_players: Stop after crawling this many players
+            close_when_done: Close the session afterwards (False when the
+                caller runs further batches)
             
         Returns: Crawl statistics
         """
         self.state = CrawlState.RUNNING
         self.stats = CrawlStats()
-        self.semaphore = asyncio.Semaphore(self.config.max_concurrent_requests)
+        # Concurrency budget scales with the keys available
+        self.semaphore = asyncio.Semaphore(
+            self.config.max_concurrent_requests * max(1, len(self.key_pool))
+        )
         
         logger.info(f"Starting crawler for region: {region}")
         
+        self.frontier = CrawlFrontier(
+            region,
+            self.db,
+            hot_size=self.config.max_queue_size,
+            batch_size=self.config.frontier_batch_size,
+            lease_seconds=self.config.queue_lease_seconds
+        )
+        
         try:
             # 1. Fetch current version
             await self.fetch_current_version()
             
-            # 2. Seed the queue
+            # Load the persistent seen-index and fold in matches stored since
+            await self.writer.call(self.seen_index.open)
+            
+            # 2. Seed the queue (or resume the persisted frontier)
+            queued = await self.writer.call(self.frontier.open)
             if seed_puuids:
-                for puuid in seed_puuids:
-                    if puuid not in self.seen_puuids:
-                        self.puuid_queue.append((puuid, region))
-                        self.seen_puuids.add(puuid)
+                seeds = [
+                    (puuid, player_priority(MAX_SCORE)) for puuid in dict.fromkeys(seed_puuids)
+                    if not self.seen_index.has_player(puuid)
+                ]
+                for puuid, _ in seeds:
+                    self.seen_index.add_player(puuid)
+                await self.writer.call(self.frontier.push_many, seeds)
+            elif queued:
+                logger.info(f"Resuming with {queued} queued players")
             else:
                 # Fetch high ELO players as seeds
                 high_elo = await self.fetch_high_elo_players(region)
-                for puuid in high_elo:
-                    if puuid not in self.seen_puuids:
-                        self.puuid_queue.append((puuid, region))
-                        self.seen_puuids.add(puuid)
+                seeds = []
+                for puuid, tier, rank in high_elo:
+                    if not self.seen_index.has_player(puuid):
+                        seeds.append((puuid, player_priority(tier_score(tier, rank))))
+                        self.seen_index.add_player(puuid)
+                await self.writer.call(self.frontier.push_many, seeds)
                         
-            logger.info(f"Queue seeded with {len(self.puuid_queue)} players")
+            logger.info(f"Queue seeded with {len(self.frontier)} players")
             
-            # 3. Crawl loop
-            while self.puuid_queue and self.state == CrawlState.RUNNING:
-                # Check limits
-                if max_matches and self.stats.matches_stored >= max_matches:
-                    logger.info(f"Reached max matches limit: {max_matches}")
-                    break
-                    
-                if max_players and self.stats.players_crawled >= max_players:
-                    logger.info(f"Reached max players limit: {max_players}")
-                    break
-                
-                # Get next player
-                puuid, reg = self.puuid_queue.popleft()
+            # 3. Crawl loop: a feeder hands players to N worker coroutines
+            await self._crawl_queue(max_matches, max_players)
+            
+            # 4. Final flush
+            await self._flush_buffer()
+            
+        finally:
+            # Players waiting for a retry are kept with the unvisited ones
+            await self.writer.call(self.frontier.push_many, self.player_retries.drain())
+            abandoned = self.match_retries.drain()
+            if abandoned:
+                logger.info(f"Abandoned {len(abandoned)} match fetches awaiting retry")
                 
-                # Check if recently crawled
-                if not self.db.should_crawl_player(puuid, self.config.player_rescan_hours):
-                    continue
+            # Keep unvisited players for the next run
+            await self.writer.call(self.frontier.persist)
+            await self.writer.call(self.seen_index.save)
+            if close_when_done:
+                await self.close()
+            self.stats.log_summary()
+            
+        return self.stats
+    
+    async def _crawl_queue(
+        self,
+        max_matches: Optional[int] = None,
+        max_players: Optional[int] = None
+    ) -> None:
+        """
+        Drain the frontier with a pool of concurrent worker coroutines.
+        
+        The feeder pops players from the frontier into a bounded work queue;
+        CrawlerConfig.crawl_workers workers crawl them in parallel, so match-ID
+        listings and detail fetches for many players overlap. Request pacing
+        is left to the rate limiter and the request semaphore. A retrier
+        task re-runs failed match fetches and listings once their backoff
+        has elapsed.
+        """
+        num_workers = max(1, self.config.crawl_workers)
+        work: asyncio.Queue = asyncio.Queue(maxsize=num_workers * 2)
+        chunk_size = num_workers * 4  # Players checked for eligibility at once
+        pending = 0  # Players handed to workers and not yet finished
+        dispatched = 0
+        
+        def match_limit_reached() -> bool:
+            stored = self.stats.matches_stored + self._uncommitted
+            return bool(max_matches) and stored >= max_matches
+            
+        async def worker() -> None:
+            nonlocal pending
+            while True:
+                item = await work.get()
+                if item is None:
+                    return
                     
-                # Crawl
+                puuid, priority = item
                 try:
-                    await self.crawl_player(puuid, reg)
+                    # Players queued before the limit was hit go back to the frontier
+                    if match_limit_reached():
+                        await self.writer.call(self.frontier.push, puuid, priority)
+                    else:
+                        await self.crawl_player(puuid, self.frontier.region, priority)
+                        await self.writer.call(self.frontier.complete, puuid)
+                except NoApiKeysError as e:
+                    logger.error(f"Stopping crawl: {e}")
+                    self.stop()
                 except Exception as e:
                     logger.error(f"Failed to crawl {puuid}: {e}")
                     self.stats.errors += 1
+                finally:
+                    pending -= 1
                     
                 # Progress log
                 if self.stats.players_crawled % 10 == 0:
                     logger.info(
                         f"Progress: {self.stats.players_crawled} players, "
                         f"{self.stats.matches_stored} matches, "
-                        f"Queue: {len(self.puuid_queue)}"
+                        f"Queue: {len(self.frontier)}"
                     )
-            
-            # 4. Final flush
-            await self._flush_buffer()
-            
+                    
+        stopping = asyncio.Event()
+        
+        async def retrier() -> None:
+            while not stopping.is_set():
+                await self._process_retries()
+                delays = [
+                    d for d in (self.match_retries.next_delay(), self.player_retries.next_delay())
+                    if d is not None
+                ]
+                try:
+                    await asyncio.wait_for(stopping.wait(), timeout=min([1.0, *delays]))
+                except asyncio.TimeoutError:
+                    pass
+                    
+        workers = [asyncio.create_task(worker()) for _ in range(num_workers)]
+        retry_task = asyncio.create_task(retrier())
+        finished = False
+        
+        try:
+            while self.state == CrawlState.RUNNING:
+                # Check limits
+                if match_limit_reached():
+                    logger.info(f"Reached max matches limit: {max_matches}")
+                    break
+                    
+                if max_players and dispatched >= max_players:
+                    logger.info(f"Reached max players limit: {max_players}")
+                    break
+                    
+                # Take a chunk of players, capped by the remaining player budget
+                take = chunk_size
+                if max_players:
+                    take = min(take, max_players - dispatched)
+                chunk = await self.writer.call(self.frontier.pop_batch, take)
+                
+                if not chunk:
+                    if pending == 0 and not self.match_retries and not self.player_retries:
+                        break  # Nothing queued and no worker can discover more
+                    await asyncio.sleep(0.05)
+                    continue
+                    
+                # Skip recently crawled players with one lookup for the chunk
+                crawlable = set(await self.writer.call(
+                    self.db.filter_crawlable,
+                    [puuid for puuid, _ in chunk], self.config.player_rescan_hours
+                ))
+                skipped = [puuid for puuid, _ in chunk if puuid not in crawlable]
+                if skipped:
+                    await self.writer.call(self.frontier.complete_many, skipped)
+                
+                for puuid, priority in chunk:
+                    if puuid not in crawlable:
+                        continue
+                    pending += 1
+                    dispatched += 1
+                    await work.put((puuid, priority))
+                    
+            finished = True
+                
         finally:
-            await self.close()
-            self.stats.log_summary()
+            # Let workers finish their current player, then shut them down
+            for _ in workers:
+                await work.put(None)
+            await asyncio.gather(*workers, return_exceptions=True)
             
-        return self.stats
+            # Matches of players already crawled still get their retries
+            while finished and self.state == CrawlState.RUNNING and self.match_retries:
+                await asyncio.sleep(min(1.0, self.match_retries.next_delay() or 0.05))
+                
+            stopping.set()
+            await asyncio.gather(retry_task, return_exceptions=True)
+            
+    def stop(self) -> None:
+        """Ask a running crawl to stop after the current player."""
+        self.state = CrawlState.STOPPED
     
     async def run_continuous(
         self, 
         regions: List[str],
-        batch_size: int = 100
+        batch_size: int = 100,
+        cooldown: float = 5.0
     ) -> None:
         """
         Run continuous crawling across multiple regions.
         Rotates between regions to balance data collection.
+        
+        Args:
+            regions: Regions to rotate through
+            batch_size: Players crawled per region before rotating
+            cooldown: Seconds to pause between batches
         """
         self.state = CrawlState.RUNNING
         region_idx = 0
@@ -617,14 +1615,16 @@ class MatchCrawler:
                 # Run batch for this region
                 await self.run(
                     region=region,
-                    max_players=batch_size
+                    max_players=batch_size,
+                    close_when_done=False
                 )
                 
                 # Rotate
                 region_idx += 1
                 
                 # Cool down between regions
-                await asyncio.sleep(5)
+                if cooldown > 0:
+                    await asyncio.sleep(cooldown)
                 
         except KeyboardInterrupt:
             logger.info("Crawler stopped by user")
@@ -634,6 +1634,91 @@ class MatchCrawler:
             await self.close()
 
 
+class MultiRegionCrawler:
+    """
+    Crawls several regions concurrently.
+    
+    Every region gets its own MatchCrawler (queue, stats), while all of them
+    share one aiohttp session, one ApiKeyPool (per-key, per-host limits), the
+    circuit breakers, the seen-index and a single database writer. Because
+    limits are enforced per routing cluster and per platform, total
+    throughput scales with the number of clusters instead of rotating
+    through regions one at a time.
+    """
+    
+    def __init__(
+        self,
+        regions: Optional[List[str]] = None,
+        crawler_config: Optional[CrawlerConfig] = None
+    ):
+        self.config = crawler_config or config.crawler
+        self.regions = regions or list(self.config.regions)
+        self.key_pool = ApiKeyPool.from_config(self.config)
+        self.seen_index = SeenIndex.from_config(self.config)
+        self.writer = DatabaseWriter.from_config(self.config)
+        self.response_cache = ResponseCache.from_config(self.config)
+        self.breakers = CircuitBreakerPool.from_config(self.config)
+        self.crawlers: Dict[str, MatchCrawler] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+        
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Create the session shared by all region crawlers."""
+        if self._session is None or self._session.closed:
+            self._session = create_api_session(
+                api_headers(),
+                connection_limit=50 * len(self.regions)
+            )
+        return self._session
+    
+    async def run(self, batch_size: int = 100) -> None:
+        """
+        Crawl all regions concurrently until stopped.
+        
+        Args:
+            batch_size: Players crawled per region between re-seeds
+        """
+        session = await self._get_session()
+        self.crawlers = {
+            region: MatchCrawler(
+                self.config,
+                session=session,
+                key_pool=self.key_pool,
+                seen_index=self.seen_index,
+                writer=self.writer,
+                response_cache=self.response_cache,
+                breakers=self.breakers
+            )
+            for region in self.regions
+        }
+        
+        clusters = sorted({self.crawlers[r].get_routing(r) for r in self.regions})
+        logger.info(
+            f"Starting parallel crawl: {len(self.regions)} regions "
+            f"across clusters {clusters}"
+        )
+        
+        try:
+            await asyncio.gather(*(
+                crawler.run_continuous([region], batch_size=batch_size, cooldown=0)
+                for region, crawler in self.crawlers.items()
+            ))
+        finally:
+            await self.close()
+            
+    def stop(self) -> None:
+        """Stop every region crawler after its current player."""
+        for crawler in self.crawlers.values():
+            crawler.stop()
+            
+    async def close(self) -> None:
+        """Close all region crawlers, the shared writer and the session."""
+        for crawler in self.crawlers.values():
+            await crawler.close()
+        await self.writer.close()
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+
 async def main_crawl(
     region: str = "tr1",
     api_key: Optional[str] = None,
@@ -655,9 +1740,9 @@ async def main_crawl(
     if api_key:
         config.crawler.api_key = api_key
         
-    if not config.crawler.api_key:
+    if not config.crawler.get_api_keys():
         raise ValueError(
-            "Riot API key required. Set RIOT_API_KEY env var or pass api_key parameter."
+            "Riot API key required. Set RIOT_API_KEY / RIOT_API_KEYS env vars or pass api_key parameter."
         )
     
     crawler = MatchCrawler()
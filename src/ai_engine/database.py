@@ -6,23 +6,186 @@ Features:
 - Batch inserts for reduced disk I/O
 - Proper indexing for fast queries
 - Connection pooling for thread safety
+- Fixed-width packed integer BLOBs for team compositions
+- Optional compressed archive of raw match payloads
+- Optional per-patch partition files, retired by detach + unlink
 """
 
 import sqlite3
 import json
 import logging
-from datetime import datetime, timedelta
+import re
+import time
+import numpy as np
+from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Dict, Any, Tuple, Iterator
+from typing import List, Optional, Dict, Any, Set, Tuple, Iterator
 from contextlib import contextmanager
 from dataclasses import dataclass
 import threading
 
+from .archive import ARCHIVE_DICTS_SQL, ARCHIVE_TABLE_SQL, RawArchive
 from .config import config, DatabaseConfig
+from .utils import get_major_minor
 
 logger = logging.getLogger(__name__)
 
 
+# ==================== PACKED COMPOSITIONS ====================
+
+# Bumped whenever the on-disk layout changes (stored in PRAGMA user_version)
+SCHEMA_VERSION = 1
+
+TEAM_SIZE = 5
+ITEMS_PER_PLAYER = 6
+
+# Champion and item IDs are stored as little-endian uint16:
+#   champions: 5 x uint16      = 10 bytes
+#   items:     5 x 6 x uint16  = 60 bytes
+PACKED_DTYPE = np.dtype("<u2")
+PACKED_MAX_ID = np.iinfo(PACKED_DTYPE).max
+
+
+def _to_fixed_width(values: Any, shape: Tuple[int, ...]) -> np.ndarray:
+    """Pad/truncate a (nested) list of IDs into a fixed-shape uint16 array."""
+    out = np.zeros(shape, dtype=PACKED_DTYPE)
+    arr = np.asarray(values, dtype=np.int64).reshape(-1, *shape[1:])
+    rows = min(arr.shape[0], shape[0])
+    # Out-of-range IDs are stored as 0 (empty) rather than silently wrapping
+    arr = np.where((arr >= 0) & (arr <= PACKED_MAX_ID), arr, 0)
+    out[:rows] = arr[:rows]
+    return out
+
+
+def pack_champions(champions: List[int]) -> bytes:
+    """Pack a team's champion IDs into a 10-byte BLOB."""
+    return _to_fixed_width(champions, (TEAM_SIZE,)).tobytes()
+
+
+def pack_items(items: Optional[List[List[int]]]) -> Optional[bytes]:
+    """Pack a team's item builds (5 players x 6 slots) into a 60-byte BLOB."""
+    if not items:
+        return None
+    return _to_fixed_width(items, (TEAM_SIZE, ITEMS_PER_PLAYER)).tobytes()
+
+
+def unpack_champions(value: Any) -> np.ndarray:
+    """
+    Decode a champion column into a (5,) uint16 array.
+    
+    Packed BLOBs are decoded zero-copy via numpy.frombuffer (read-only view).
+    Legacy JSON text (pre-migration rows) is still understood.
+    """
+    if isinstance(value, (bytes, memoryview)):
+        return np.frombuffer(value, dtype=PACKED_DTYPE)
+    return _to_fixed_width(json.loads(value), (TEAM_SIZE,))
+
+
+def unpack_items(value: Any) -> np.ndarray:
+    """Decode an item column into a (5, 6) uint16 array (zeros if missing)."""
+    if value is None:
+        return np.zeros((TEAM_SIZE, ITEMS_PER_PLAYER), dtype=PACKED_DTYPE)
+    if isinstance(value, (bytes, memoryview)):
+        return np.frombuffer(value, dtype=PACKED_DTYPE).reshape(TEAM_SIZE, ITEMS_PER_PLAYER)
+    return _to_fixed_width(json.loads(value), (TEAM_SIZE, ITEMS_PER_PLAYER))
+
+
+# Partition schemas are attached as p<ordinal>; match positions (see
+# MatchDatabase.get_high_water_mark) carry the ordinal above this bit
+PARTITION_SCHEMA = re.compile(r"^p\d+$")
+PARTITION_SHIFT = 40
+
+# Matches table DDL, templated so the packed-storage migration can build
+# the new table alongside the legacy one before swapping them
+MATCHES_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        match_id TEXT PRIMARY KEY,
+        game_version TEXT NOT NULL,
+        patch TEXT,                         -- major.minor of game_version
+        region TEXT NOT NULL,
+        game_duration INTEGER NOT NULL,
+        game_mode TEXT NOT NULL,
+        queue_id INTEGER NOT NULL,
+        blue_team_win INTEGER NOT NULL,
+        blue_team_champions BLOB NOT NULL,  -- 5 x uint16
+        red_team_champions BLOB NOT NULL,   -- 5 x uint16
+        blue_team_items BLOB,               -- 5 x 6 x uint16
+        red_team_items BLOB,                -- 5 x 6 x uint16
+        game_timestamp INTEGER NOT NULL,
+        json_data TEXT,                     -- Full match JSON (optional)
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP
+    );
+"""
+
+
+# Explicit column list for statements spanning tables: tables migrated from
+# older versions have the patch column at the end
+MATCH_COLUMNS = (
+    "match_id, game_version, patch, region, game_duration, game_mode, queue_id, "
+    "blue_team_win, blue_team_champions, red_team_champions, blue_team_items, "
+    "red_team_items, game_timestamp, json_data, created_at"
+)
+
+# Formatted with the (schema-qualified) matches table to insert into
+INSERT_MATCH_SQL = """
+    INSERT OR IGNORE INTO {table} 
+    (match_id, game_version, patch, region, game_duration, game_mode, queue_id,
+     blue_team_win, blue_team_champions, red_team_champions,
+     blue_team_items, red_team_items, game_timestamp, json_data)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+UPSERT_PLAYER_SQL = """
+    INSERT INTO players (puuid, region, last_crawled, last_crawled_at, matches_found, tier, rank)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(puuid) DO UPDATE SET
+        last_crawled = ?,
+        last_crawled_at = ?,
+        matches_found = matches_found + ?,
+        tier = COALESCE(?, tier),
+        rank = COALESCE(?, rank),
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+# Ladder tier/rank for a player; new rows get the epoch as their last crawl
+# so they count as never crawled
+RECORD_RANK_SQL = """
+    INSERT INTO players (puuid, region, last_crawled, last_crawled_at, tier, rank)
+    VALUES (?, ?, '1970-01-01T00:00:00', 0, ?, ?)
+    ON CONFLICT(puuid) DO UPDATE SET
+        tier = excluded.tier,
+        rank = excluded.rank,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+
+def unpack_champions_column(values: List[Any]) -> np.ndarray:
+    """
+    Decode a whole champion column into an (N, 5) uint16 array.
+    
+    When every value is packed, the BLOBs are concatenated and decoded with a
+    single numpy.frombuffer call instead of one decode per row.
+    """
+    if not values:
+        return np.zeros((0, TEAM_SIZE), dtype=PACKED_DTYPE)
+    if all(isinstance(v, bytes) for v in values):
+        return np.frombuffer(b"".join(values), dtype=PACKED_DTYPE).reshape(-1, TEAM_SIZE)
+    return np.stack([unpack_champions(v) for v in values])
+
+
+def unpack_items_column(values: List[Any]) -> np.ndarray:
+    """Decode a whole item column into an (N, 5, 6) uint16 array (zeros if missing)."""
+    if not values:
+        return np.zeros((0, TEAM_SIZE, ITEMS_PER_PLAYER), dtype=PACKED_DTYPE)
+    empty = bytes(PACKED_DTYPE.itemsize * TEAM_SIZE * ITEMS_PER_PLAYER)
+    values = [empty if v is None else v for v in values]
+    if all(isinstance(v, bytes) for v in values):
+        return np.frombuffer(b"".join(values), dtype=PACKED_DTYPE).reshape(
+            -1, TEAM_SIZE, ITEMS_PER_PLAYER
+        )
+    return np.stack([unpack_items(v) for v in values])
+
+
 @dataclass
 class MatchRecord:
     """Represents a stored match record."""
@@ -39,6 +202,7 @@ class MatchRecord:
     red_team_items: List[List[int]]
     timestamp: int
     json_data: Optional[str] = None  # Full JSON for detailed analysis
+    raw_payload: Optional[bytes] = None  # Raw API body, kept in the compressed archive
 
 
 @dataclass
@@ -66,6 +230,16 @@ class MatchDatabase:
     def __init__(self, db_config: Optional[DatabaseConfig] = None):
         self.config = db_config or config.database
         self.db_path = Path(self.config.db_path)
+        self.archive = RawArchive.from_config(self.config)
+        
+        # Per-patch partitions: patch -> (ordinal, file path), from match_partitions
+        self.partition_dir = (
+            Path(self.config.partition_dir) if self.config.partition_dir
+            else self.db_path.parent / f"{self.db_path.stem}_patches"
+        )
+        self._partitions: Dict[str, Tuple[int, str]] = {}
+        self._partition_lock = threading.Lock()
+        
         self._ensure_directory()
         self._init_schema()
         
@@ -118,30 +292,17 @@ class MatchDatabase:
     def _init_schema(self) -> None:
         """Initialize database schema with proper indexes."""
         with self.get_connection() as conn:
+            # Main matches table
+            conn.execute(MATCHES_TABLE_SQL.format(table="matches"))
+            conn.executescript(ARCHIVE_TABLE_SQL.format(schema="main") + ARCHIVE_DICTS_SQL)
+            
             conn.executescript("""
-                -- Main matches table
-                CREATE TABLE IF NOT EXISTS matches (
-                    match_id TEXT PRIMARY KEY,
-                    game_version TEXT NOT NULL,
-                    region TEXT NOT NULL,
-                    game_duration INTEGER NOT NULL,
-                    game_mode TEXT NOT NULL,
-                    queue_id INTEGER NOT NULL,
-                    blue_team_win INTEGER NOT NULL,
-                    blue_team_champions TEXT NOT NULL,  -- JSON array
-                    red_team_champions TEXT NOT NULL,   -- JSON array
-                    blue_team_items TEXT,               -- JSON 2D array
-                    red_team_items TEXT,                -- JSON 2D array
-                    game_timestamp INTEGER NOT NULL,
-                    json_data TEXT,                     -- Full match JSON (optional)
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
-                );
-                
                 -- Players tracking table
                 CREATE TABLE IF NOT EXISTS players (
                     puuid TEXT PRIMARY KEY,
                     region TEXT NOT NULL,
                     last_crawled TEXT NOT NULL,
+                    last_crawled_at INTEGER,  -- Unix epoch seconds
                     matches_found INTEGER DEFAULT 0,
                     tier TEXT,
                     rank TEXT,
@@ -154,22 +315,41 @@ class MatchDatabase:
                     puuid TEXT PRIMARY KEY,
                     region TEXT NOT NULL,
                     priority INTEGER DEFAULT 0,
-                    added_at TEXT DEFAULT CURRENT_TIMESTAMP
+                    added_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    lease_owner TEXT,          -- Crawler process holding the entry
+                    lease_expires INTEGER      -- Unix epoch; NULL = not leased
+                );
+                
+                -- League summonerId -> PUUID, so seeding skips summoner-v4 lookups
+                CREATE TABLE IF NOT EXISTS summoner_ids (
+                    region TEXT NOT NULL,
+                    summoner_id TEXT NOT NULL,
+                    puuid TEXT NOT NULL,
+                    resolved_at INTEGER,  -- Unix epoch seconds
+                    PRIMARY KEY (region, summoner_id)
+                ) WITHOUT ROWID;
+                
+                -- Per-patch partition files (DatabaseConfig.partition_by_patch)
+                CREATE TABLE IF NOT EXISTS match_partitions (
+                    patch TEXT PRIMARY KEY,
+                    ordinal INTEGER NOT NULL UNIQUE,  -- Attached as schema p<ordinal>; never reused
+                    path TEXT NOT NULL,
+                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    retired_at INTEGER  -- Unix epoch seconds; retired rows keep their ordinal
                 );
                 
                 -- Version tracking for data freshness
                 CREATE TABLE IF NOT EXISTS patch_versions (
                     version TEXT PRIMARY KEY,
                     first_seen TEXT DEFAULT CURRENT_TIMESTAMP,
-                    match_count INTEGER DEFAULT 0
+                    match_count INTEGER DEFAULT 0,
+                    first_game_at INTEGER  -- Earliest gameCreation stored (epoch ms)
                 );
                 
                 -- Indexes for fast queries
-                CREATE INDEX IF NOT EXISTS idx_matches_version ON matches(game_version);
                 CREATE INDEX IF NOT EXISTS idx_matches_region ON matches(region);
                 CREATE INDEX IF NOT EXISTS idx_matches_queue ON matches(queue_id);
                 CREATE INDEX IF NOT EXISTS idx_matches_timestamp ON matches(game_timestamp);
-                CREATE INDEX IF NOT EXISTS idx_matches_version_queue ON matches(game_version, queue_id);
                 
                 CREATE INDEX IF NOT EXISTS idx_players_region ON players(region);
                 CREATE INDEX IF NOT EXISTS idx_players_crawled ON players(last_crawled);
@@ -177,36 +357,208 @@ class MatchDatabase:
                 
                 CREATE INDEX IF NOT EXISTS idx_queue_priority ON crawl_queue(priority DESC, added_at);
                 CREATE INDEX IF NOT EXISTS idx_queue_region ON crawl_queue(region);
+                CREATE INDEX IF NOT EXISTS idx_queue_region_priority ON crawl_queue(region, priority DESC);
             """)
+            
+            self._migrate_columns(conn)
+            self._check_schema_version(conn)
+            
+            if self.config.partition_by_patch and conn.execute(
+                "SELECT 1 FROM main.matches LIMIT 1"
+            ).fetchone():
+                logger.warning(
+                    "Partitioning is enabled but the main database still holds matches; "
+                    "run `main.py --mode migrate` to move them into patch partitions"
+                )
             logger.info(f"Database initialized at {self.db_path}")
     
+    def _add_column(self, conn: sqlite3.Connection, table: str, column: str, ddl: str) -> bool:
+        """Add a column to an existing table if missing. Returns True if added."""
+        columns = {r[1] for r in conn.execute(f"PRAGMA table_info({table});")}
+        if column in columns:
+            return False
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {ddl};")
+        logger.info(f"Added column {table}.{column}")
+        return True
+    
+    def _migrate_columns(self, conn: sqlite3.Connection) -> None:
+        """Bring tables created by older versions up to the current columns."""
+        if self._add_column(conn, "players", "last_crawled_at", "INTEGER"):
+            # ISO text is local time; 'utc' converts it to a true epoch
+            conn.execute("""
+                UPDATE players
+                SET last_crawled_at = CAST(strftime('%s', last_crawled, 'utc') AS INTEGER)
+                WHERE last_crawled_at IS NULL
+            """)
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_players_crawled_at ON players(last_crawled_at);"
+        )
+        
+        self._add_column(conn, "crawl_queue", "lease_owner", "TEXT")
+        self._add_column(conn, "crawl_queue", "lease_expires", "INTEGER")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_queue_lease ON crawl_queue(lease_owner);"
+        )
+        
+        # Patch-scoped reads use equality on patch instead of LIKE on game_version
+        if self._add_column(conn, "matches", "patch", "TEXT"):
+            conn.create_function("major_minor", 1, get_major_minor, deterministic=True)
+            conn.execute("UPDATE matches SET patch = major_minor(game_version);")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_matches_patch ON matches(patch, queue_id, game_timestamp);"
+        )
+        conn.execute("DROP INDEX IF EXISTS idx_matches_version_queue;")
+        
+        self._add_column(conn, "match_partitions", "retired_at", "INTEGER")
+        
+        if self._add_column(conn, "patch_versions", "first_game_at", "INTEGER"):
+            conn.execute("""
+                UPDATE patch_versions SET first_game_at = (
+                    SELECT MIN(game_timestamp) FROM matches
+                    WHERE game_version = patch_versions.version AND game_timestamp > 0
+                )
+            """)
+            
+        # Superseded by idx_matches_patch (kept until the backfill above has run)
+        conn.execute("DROP INDEX IF EXISTS idx_matches_version;")
+    
+    def _check_schema_version(self, conn: sqlite3.Connection) -> None:
+        """
+        Stamp fresh databases with the current schema version and warn when
+        legacy JSON-encoded rows are still present.
+        """
+        version = conn.execute("PRAGMA user_version;").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+            
+        legacy = conn.execute(
+            "SELECT 1 FROM matches WHERE typeof(blue_team_champions) = 'text' LIMIT 1"
+        ).fetchone()
+        
+        if legacy is None:
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION};")
+        else:
+            logger.warning(
+                "Database contains JSON-encoded compositions; "
+                "run `main.py --mode migrate` to convert them to packed storage"
+            )
+    
+    def migrate_packed_storage(self, chunk_size: int = 5000) -> int:
+        """
+        Rewrite the matches table with packed integer BLOB compositions.
+        
+        Builds a new table with BLOB columns, converts rows in chunks, swaps
+        the tables in a single transaction and VACUUMs to reclaim the space
+        used by the JSON text.
+        
+        Returns: Number of matches migrated.
+        """
+        with self.get_connection() as conn:
+            version = conn.execute("PRAGMA user_version;").fetchone()[0]
+            if version >= SCHEMA_VERSION:
+                logger.info("Database already uses packed storage")
+                return 0
+                
+            migrated = 0
+            try:
+                conn.execute("BEGIN TRANSACTION;")
+                conn.execute("DROP TABLE IF EXISTS matches_packed;")
+                conn.execute(MATCHES_TABLE_SQL.format(table="matches_packed"))
+                
+                cursor = conn.execute("""
+                    SELECT match_id, game_version, patch, region, game_duration, game_mode,
+                           queue_id, blue_team_win, blue_team_champions, red_team_champions,
+                           blue_team_items, red_team_items, game_timestamp, json_data,
+                           created_at
+                    FROM matches
+                """)
+                
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                        
+                    data = [
+                        (
+                            r[0], r[1], r[2], r[3], r[4], r[5], r[6], r[7],
+                            unpack_champions(r[8]).tobytes(),
+                            unpack_champions(r[9]).tobytes(),
+                            unpack_items(r[10]).tobytes() if r[10] else None,
+                            unpack_items(r[11]).tobytes() if r[11] else None,
+                            r[12], r[13], r[14]
+                        )
+                        for r in rows
+                    ]
+                    conn.executemany("""
+                        INSERT INTO matches_packed
+                        (match_id, game_version, patch, region, game_duration, game_mode, queue_id,
+                         blue_team_win, blue_team_champions, red_team_champions,
+                         blue_team_items, red_team_items, game_timestamp, json_data,
+                         created_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """, data)
+                    migrated += len(rows)
+                    logger.info(f"Migrated {migrated} matches...")
+                    
+                conn.execute("DROP TABLE matches;")
+                conn.execute("ALTER TABLE matches_packed RENAME TO matches;")
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION};")
+                conn.execute("COMMIT;")
+                
+            except sqlite3.Error as e:
+                logger.error(f"Packed storage migration failed: {e}")
+                conn.execute("ROLLBACK;")
+                raise
+                
+        # Recreate indexes dropped with the old table, then reclaim space
+        self._init_schema()
+        with self.get_connection() as conn:
+            conn.execute("VACUUM;")
+            
+        logger.info(f"Migrated {migrated} matches to packed storage")
+        return migrated
+    
     # ==================== MATCH OPERATIONS ====================
     
+    @staticmethod
+    def _match_params(match: MatchRecord) -> Tuple:
+        """Row parameters for INSERT_MATCH_SQL."""
+        return (
+            match.match_id,
+            match.game_version,
+            get_major_minor(match.game_version),
+            match.region,
+            match.game_duration,
+            match.game_mode,
+            match.queue_id,
+            1 if match.blue_team_win else 0,
+            pack_champions(match.blue_team_champions),
+            pack_champions(match.red_team_champions),
+            pack_items(match.blue_team_items),
+            pack_items(match.red_team_items),
+            match.timestamp,
+            match.json_data
+        )
+    
+    @staticmethod
+    def _player_params(player: PlayerRecord) -> Tuple:
+        """Row parameters for UPSERT_PLAYER_SQL."""
+        last_crawled = player.last_crawled.isoformat()
+        last_crawled_at = int(player.last_crawled.timestamp())
+        return (
+            player.puuid, player.region, last_crawled, last_crawled_at,
+            player.matches_found, player.tier, player.rank,
+            last_crawled, last_crawled_at, player.matches_found, player.tier, player.rank
+        )
+    
     def insert_match(self, match: MatchRecord) -> bool:
         """Insert a single match record."""
         try:
             with self.get_connection() as conn:
-                conn.execute("""
-                    INSERT OR IGNORE INTO matches 
-                    (match_id, game_version, region, game_duration, game_mode, queue_id,
-                     blue_team_win, blue_team_champions, red_team_champions,
-                     blue_team_items, red_team_items, game_timestamp, json_data)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    match.match_id,
-                    match.game_version,
-                    match.region,
-                    match.game_duration,
-                    match.game_mode,
-                    match.queue_id,
-                    1 if match.blue_team_win else 0,
-                    json.dumps(match.blue_team_champions),
-                    json.dumps(match.red_team_champions),
-                    json.dumps(match.blue_team_items) if match.blue_team_items else None,
-                    json.dumps(match.red_team_items) if match.red_team_items else None,
-                    match.timestamp,
-                    match.json_data
-                ))
+                schema = self._patch_schema(conn, get_major_minor(match.game_version), create=True)
+                conn.execute(
+                    INSERT_MATCH_SQL.format(table=f"{schema}.matches"), self._match_params(match)
+                )
                 return True
         except sqlite3.Error as e:
             logger.error(f"Failed to insert match {match.match_id}: {e}")
@@ -219,66 +571,150 @@ class MatchDatabase:
         
         Returns: Number of matches successfully inserted.
         """
-        if not matches:
-            return 0
-            
-        data = [
-            (
-                m.match_id, m.game_version, m.region, m.game_duration,
-                m.game_mode, m.queue_id, 1 if m.blue_team_win else 0,
-                json.dumps(m.blue_team_champions), json.dumps(m.red_team_champions),
-                json.dumps(m.blue_team_items) if m.blue_team_items else None,
-                json.dumps(m.red_team_items) if m.red_team_items else None,
-                m.timestamp, m.json_data
-            )
-            for m in matches
-        ]
+        inserted = len(self.commit_group(matches))
+        if inserted:
+            logger.info(f"Batch inserted {inserted} matches")
+        return inserted
+    
+    def commit_group(
+        self,
+        matches: List[MatchRecord],
+        players: Optional[List[PlayerRecord]] = None
+    ) -> Set[str]:
+        """
+        Write a group of matches, player upserts and the matching patch-count
+        updates in one transaction (one fsync for the whole group).
+        
+        Patch counts only include matches that were actually new; matches
+        already stored (or repeated within the group) are skipped.
         
+        Returns: IDs of the new matches inserted (empty if the transaction failed).
+        """
+        players = players or []
+        if not matches and not players:
+            return set()
+            
+        # First occurrence of each match ID, per version
+        by_version: Dict[str, Dict[str, Tuple]] = {}
+        first_game: Dict[str, Optional[int]] = {}
+        for m in matches:
+            by_version.setdefault(m.game_version, {}).setdefault(m.match_id, self._match_params(m))
+            if m.timestamp > 0:
+                earliest = first_game.get(m.game_version)
+                first_game[m.game_version] = m.timestamp if earliest is None else min(earliest, m.timestamp)
+            
+        inserted: Set[str] = set()
         try:
             with self.get_connection() as conn:
+                # Partitions are created and attached before the transaction
+                schemas = {
+                    version: self._patch_schema(conn, get_major_minor(version), create=True)
+                    for version in by_version
+                }
                 conn.execute("BEGIN TRANSACTION;")
-                conn.executemany("""
-                    INSERT OR IGNORE INTO matches 
-                    (match_id, game_version, region, game_duration, game_mode, queue_id,
-                     blue_team_win, blue_team_champions, red_team_champions,
-                     blue_team_items, red_team_items, game_timestamp, json_data)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, data)
-                conn.execute("COMMIT;")
                 
-                # Update patch version counts
-                self._update_patch_counts(conn, matches)
-                
-                logger.info(f"Batch inserted {len(matches)} matches")
-                return len(matches)
+                for version, rows in by_version.items():
+                    table = f"{schemas[version]}.matches"
+                    existing = self._stored_match_ids(conn, table, list(rows))
+                    new_ids = [match_id for match_id in rows if match_id not in existing]
+                    conn.executemany(
+                        INSERT_MATCH_SQL.format(table=table), [rows[match_id] for match_id in new_ids]
+                    )
+                    inserted.update(new_ids)
+                    new = len(new_ids)
+                    
+                    # Update patch version counts and the earliest game seen
+                    if new:
+                        conn.execute("""
+                            INSERT INTO patch_versions (version, match_count, first_game_at) 
+                            VALUES (?, ?, ?)
+                            ON CONFLICT(version) DO UPDATE SET
+                                match_count = match_count + excluded.match_count,
+                                first_game_at = MIN(
+                                    COALESCE(first_game_at, excluded.first_game_at),
+                                    COALESCE(excluded.first_game_at, first_game_at)
+                                )
+                        """, (version, new, first_game.get(version)))
+                        
+                if players:
+                    conn.executemany(
+                        UPSERT_PLAYER_SQL, [self._player_params(p) for p in players]
+                    )
+                    
+                if self.config.archive_raw:
+                    # Payloads are archived next to their matches
+                    payloads: Dict[str, List[Tuple[str, bytes]]] = {}
+                    for m in matches:
+                        if m.raw_payload:
+                            payloads.setdefault(schemas[m.game_version], []).append(
+                                (m.match_id, m.raw_payload)
+                            )
+                    for schema, rows in payloads.items():
+                        self.archive.write(conn, rows, schema)
+                    
+                conn.execute("COMMIT;")
+                return inserted
                 
         except sqlite3.Error as e:
-            logger.error(f"Batch insert failed: {e}")
+            logger.error(f"Group commit failed: {e}")
             with self.get_connection() as conn:
-                conn.execute("ROLLBACK;")
-            return 0
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK;")
+            return set()
     
-    def _update_patch_counts(self, conn: sqlite3.Connection, matches: List[MatchRecord]) -> None:
-        """Update patch version match counts."""
-        version_counts: Dict[str, int] = {}
-        for m in matches:
-            version_counts[m.game_version] = version_counts.get(m.game_version, 0) + 1
-            
-        for version, count in version_counts.items():
-            conn.execute("""
-                INSERT INTO patch_versions (version, match_count) 
-                VALUES (?, ?)
-                ON CONFLICT(version) DO UPDATE SET match_count = match_count + ?
-            """, (version, count, count))
+    @staticmethod
+    def _stored_match_ids(
+        conn: sqlite3.Connection,
+        table: str,
+        match_ids: List[str],
+        chunk_size: int = 500
+    ) -> Set[str]:
+        """Which of `match_ids` are already in `table` (one IN query per chunk)."""
+        existing: Set[str] = set()
+        for start in range(0, len(match_ids), chunk_size):
+            chunk = match_ids[start:start + chunk_size]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT match_id FROM {table} WHERE match_id IN ({placeholders})", chunk
+            ).fetchall()
+            existing.update(r[0] for r in rows)
+        return existing
     
     def match_exists(self, match_id: str) -> bool:
         """Check if a match already exists."""
         with self.get_connection() as conn:
             result = conn.execute(
-                "SELECT 1 FROM matches WHERE match_id = ?", (match_id,)
+                f"SELECT 1 FROM {self._matches_view(conn)} WHERE match_id = ?", (match_id,)
             ).fetchone()
             return result is not None
     
+    def filter_missing_matches(self, match_ids: List[str], chunk_size: int = 500) -> List[str]:
+        """
+        Return the match IDs that are not stored yet, preserving input order.
+        
+        Checks the whole list with one `IN (...)` query per chunk instead of
+        one match_exists round-trip per ID. Chunks stay well under SQLite's
+        host-parameter limit.
+        """
+        if not match_ids:
+            return []
+            
+        unique = list(dict.fromkeys(match_ids))
+        existing = set()
+        
+        with self.get_connection() as conn:
+            source = self._matches_view(conn)
+            for start in range(0, len(unique), chunk_size):
+                chunk = unique[start:start + chunk_size]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT match_id FROM {source} WHERE match_id IN ({placeholders})",
+                    chunk
+                ).fetchall()
+                existing.update(r[0] for r in rows)
+                
+        return [m for m in unique if m not in existing]
+    
     def get_matches_by_version(
         self, 
         version: str, 
@@ -289,18 +725,18 @@ class MatchDatabase:
         Stream matches for a specific game version.
         Yields MatchRecord objects for memory efficiency.
         """
-        query = """
-            SELECT * FROM matches 
-            WHERE game_version LIKE ? AND queue_id = ?
-            ORDER BY game_timestamp DESC
-        """
-        params: List[Any] = [f"{version}%", queue_id]
-        
-        if limit:
-            query += " LIMIT ?"
-            params.append(limit)
-            
         with self.get_connection() as conn:
+            query = f"""
+                SELECT * FROM {self.matches_table(conn, version)} 
+                WHERE patch = ? AND queue_id = ?
+                ORDER BY game_timestamp DESC
+            """
+            params: List[Any] = [get_major_minor(version), queue_id]
+            
+            if limit:
+                query += " LIMIT ?"
+                params.append(limit)
+                
             cursor = conn.execute(query, params)
             for row in cursor:
                 yield MatchRecord(
@@ -311,52 +747,446 @@ class MatchDatabase:
                     game_mode=row['game_mode'],
                     queue_id=row['queue_id'],
                     blue_team_win=bool(row['blue_team_win']),
-                    blue_team_champions=json.loads(row['blue_team_champions']),
-                    red_team_champions=json.loads(row['red_team_champions']),
-                    blue_team_items=json.loads(row['blue_team_items']) if row['blue_team_items'] else [],
-                    red_team_items=json.loads(row['red_team_items']) if row['red_team_items'] else [],
+                    blue_team_champions=unpack_champions(row['blue_team_champions']).tolist(),
+                    red_team_champions=unpack_champions(row['red_team_champions']).tolist(),
+                    blue_team_items=unpack_items(row['blue_team_items']).tolist() if row['blue_team_items'] else [],
+                    red_team_items=unpack_items(row['red_team_items']).tolist() if row['red_team_items'] else [],
                     timestamp=row['game_timestamp'],
                     json_data=row['json_data']
                 )
     
+    # ==================== RAW ARCHIVE ====================
+    
+    def get_raw_match(self, match_id: str) -> Optional[bytes]:
+        """Archived raw JSON of a match (None if it was not archived)."""
+        with self.get_connection() as conn:
+            for _, schema in self._match_schemas(conn):
+                row = conn.execute(
+                    f"SELECT codec, dict_id, payload FROM {schema}.match_archive WHERE match_id = ?",
+                    (match_id,)
+                ).fetchone()
+                if row is not None:
+                    return self.archive.decompress(
+                        conn, row['codec'], row['dict_id'], row['payload']
+                    )
+            return None
+    
+    def iter_raw_matches(
+        self,
+        version: Optional[str] = None,
+        queue_id: Optional[int] = None
+    ) -> Iterator[Tuple[str, bytes]]:
+        """
+        Stream archived raw match JSON, decompressing one row at a time.
+        
+        Args:
+            version: Only matches of this patch (e.g. "14.24")
+            queue_id: Only matches of this queue
+        
+        Yields: (match_id, raw JSON bytes) in archive order, partition by partition
+        """
+        query = """
+            SELECT a.match_id, a.codec, a.dict_id, a.payload
+            FROM {schema}.match_archive a JOIN {schema}.matches m ON m.match_id = a.match_id
+        """
+        conditions: List[str] = []
+        params: List[Any] = []
+        if version:
+            conditions.append("m.patch = ?")
+            params.append(get_major_minor(version))
+        if queue_id is not None:
+            conditions.append("m.queue_id = ?")
+            params.append(queue_id)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY a.rowid"
+        
+        with self.get_connection() as conn:
+            if version:
+                schemas = [self._patch_schema(conn, get_major_minor(version))]
+            else:
+                schemas = [schema for _, schema in self._match_schemas(conn)]
+            for schema in schemas:
+                cursor = conn.execute(query.format(schema=schema), params)
+                yield from self.archive.iter_rows(conn, cursor)
+    
+    def get_high_water_mark(self) -> int:
+        """
+        Position of the newest stored match: its rowid, with the partition
+        ordinal in the bits above PARTITION_SHIFT when partitioned.
+        
+        Grows with every insert, so it can key caches derived from the table.
+        """
+        mark = 0
+        with self.get_connection() as conn:
+            for ordinal, schema in self._match_schemas(conn):
+                top = conn.execute(f"SELECT MAX(rowid) FROM {schema}.matches").fetchone()[0]
+                if top:
+                    mark = max(mark, (ordinal << PARTITION_SHIFT) | top)
+        return mark
+    
+    def get_match_row_bound(self) -> int:
+        """
+        Upper bound on the number of stored matches: the sum of every
+        matches table's MAX(rowid), which unlike COUNT(*) is one index seek
+        per table. Use this, not get_high_water_mark (whose partition bits
+        make it a position, not a size), to size structures by row count.
+        """
+        bound = 0
+        with self.get_connection() as conn:
+            for _, schema in self._match_schemas(conn):
+                bound += conn.execute(f"SELECT MAX(rowid) FROM {schema}.matches").fetchone()[0] or 0
+        return bound
+    
+    def iter_match_ids(
+        self,
+        after_rowid: int = 0,
+        up_to_rowid: Optional[int] = None,
+        chunk_size: int = 50000
+    ) -> Iterator[List[str]]:
+        """
+        Stream stored match IDs in position order (see get_high_water_mark),
+        one chunk at a time.
+        
+        Args:
+            after_rowid: Only rows inserted after this position
+            up_to_rowid: Stop at this position (inclusive); None for no bound
+            chunk_size: Match IDs per yielded list
+        """
+        with self.get_connection() as conn:
+            schemas = self._match_schemas(conn)
+            
+        span = 1 << PARTITION_SHIFT
+        for ordinal, schema in schemas:
+            base = ordinal << PARTITION_SHIFT
+            if up_to_rowid is not None and up_to_rowid < base:
+                break
+            if after_rowid >= base + span:
+                continue
+                
+            last = max(after_rowid - base, 0)
+            upper = min(up_to_rowid - base, span - 1) if up_to_rowid is not None else -1
+            
+            while True:
+                with self.get_connection() as conn:
+                    rows = conn.execute(f"""
+                        SELECT rowid, match_id FROM {schema}.matches
+                        WHERE rowid > ? AND (? < 0 OR rowid <= ?)
+                        ORDER BY rowid
+                        LIMIT ?
+                    """, (last, upper, upper, chunk_size)).fetchall()
+                    
+                if not rows:
+                    break
+                    
+                last = rows[-1][0]
+                yield [r[1] for r in rows]
+    
     def get_match_count(self, version: Optional[str] = None, queue_id: int = 420) -> int:
         """Get total match count, optionally filtered by version."""
         with self.get_connection() as conn:
             if version:
                 result = conn.execute(
-                    "SELECT COUNT(*) FROM matches WHERE game_version LIKE ? AND queue_id = ?",
-                    (f"{version}%", queue_id)
+                    f"SELECT COUNT(*) FROM {self.matches_table(conn, version)} "
+                    "WHERE patch = ? AND queue_id = ?",
+                    (get_major_minor(version), queue_id)
                 ).fetchone()
             else:
                 result = conn.execute(
-                    "SELECT COUNT(*) FROM matches WHERE queue_id = ?",
+                    f"SELECT COUNT(*) FROM {self._matches_view(conn)} WHERE queue_id = ?",
                     (queue_id,)
                 ).fetchone()
             return result[0] if result else 0
     
+    def get_patch_start(self, major_minor: str) -> Optional[int]:
+        """
+        Earliest stored game of a patch (e.g. "14.24"), across all its builds.
+        
+        Returns: gameCreation in epoch milliseconds, or None if no game is stored
+        """
+        with self.get_connection() as conn:
+            row = conn.execute(
+                "SELECT MIN(first_game_at) FROM patch_versions WHERE version LIKE ?",
+                (f"{major_minor}.%",)
+            ).fetchone()
+            return row[0] if row else None
+    
     def delete_old_patches(self, current_version: str) -> int:
         """
         Delete matches from older patches to keep database focused.
+        
+        Partitions of older patches are retired (detached and unlinked);
+        matches still in the main database are deleted and the file is
+        VACUUMed.
+        
         Returns number of deleted matches.
         """
-        major_minor = ".".join(current_version.split(".")[:2])
+        major_minor = get_major_minor(current_version)
+        retired = sum(
+            self.retire_partition(patch)
+            for patch in self.list_partitions() if patch != major_minor
+        )
         
         with self.get_connection() as conn:
             # Count before delete
             old_count = conn.execute(
-                "SELECT COUNT(*) FROM matches WHERE game_version NOT LIKE ?",
-                (f"{major_minor}%",)
+                "SELECT COUNT(*) FROM main.matches WHERE patch IS NOT ?",
+                (major_minor,)
             ).fetchone()[0]
             
             if old_count > 0:
                 conn.execute(
-                    "DELETE FROM matches WHERE game_version NOT LIKE ?",
-                    (f"{major_minor}%",)
+                    "DELETE FROM main.matches WHERE patch IS NOT ?",
+                    (major_minor,)
+                )
+                conn.execute(
+                    "DELETE FROM main.match_archive "
+                    "WHERE match_id NOT IN (SELECT match_id FROM main.matches)"
                 )
                 conn.execute("VACUUM;")  # Reclaim space
                 logger.info(f"Deleted {old_count} matches from old patches")
                 
-            return old_count
+            return old_count + retired
+    
+    # ==================== PATCH PARTITIONS ====================
+    # With DatabaseConfig.partition_by_patch, matches and their raw archive
+    # live in one SQLite file per patch, attached to each connection on
+    # demand as schema p<ordinal>. The main file keeps players, the crawl
+    # queue, patch metadata and the match_partitions registry. Patch-scoped
+    # queries open only their partition; the TEMP view all_matches unifies
+    # every partition for the rest.
+    
+    def list_partitions(self) -> List[str]:
+        """Patches that have a partition file, oldest first."""
+        if not self.config.partition_by_patch:
+            return []
+        with self.get_connection() as conn:
+            partitions = self._load_partitions(conn)
+        return sorted(partitions, key=lambda patch: partitions[patch][0])
+    
+    def matches_table(self, conn: sqlite3.Connection, version: str) -> str:
+        """
+        Schema-qualified matches table holding a patch on this connection
+        (attaching its partition if needed).
+        """
+        return f"{self._patch_schema(conn, get_major_minor(version))}.matches"
+    
+    def retire_partition(self, patch: str) -> int:
+        """
+        Drop a patch by detaching its partition and deleting the file.
+        
+        Nothing is deleted row by row and the main database is not
+        VACUUMed, so this takes the same time whatever the patch's size.
+        Connections of other threads detach it the next time they sync.
+        The registry row is kept as a tombstone so its ordinal (and schema
+        name) is never handed to another partition while a connection
+        elsewhere may still have the deleted file attached under it.
+        
+        Returns: Number of matches dropped (from patch_versions counts)
+        """
+        with self._partition_lock, self.get_connection() as conn:
+            entry = self._load_partitions(conn).get(patch)
+            if entry is None:
+                return 0
+            ordinal, path = entry
+            
+            dropped = conn.execute(
+                "SELECT COALESCE(SUM(match_count), 0) FROM patch_versions WHERE version LIKE ?",
+                (f"{patch}.%",)
+            ).fetchone()[0]
+            
+            if f"p{ordinal}" in self._attached(conn):
+                conn.execute(f"DETACH DATABASE p{ordinal};")
+            conn.execute(
+                "UPDATE main.match_partitions SET retired_at = ? WHERE patch = ?;",
+                (int(time.time()), patch)
+            )
+            self._partitions.pop(patch, None)
+            
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{path}{suffix}").unlink(missing_ok=True)
+            
+        logger.info(f"Retired patch {patch} partition ({dropped} matches)")
+        return dropped
+    
+    def migrate_to_partitions(self) -> int:
+        """
+        Move matches (and archived payloads) from the main database into
+        their patch partitions, one transaction per patch, then VACUUM the
+        main file once.
+        
+        Returns: Number of matches moved.
+        """
+        if not self.config.partition_by_patch:
+            logger.info("Partitioning is disabled (DatabaseConfig.partition_by_patch)")
+            return 0
+            
+        moved = 0
+        with self.get_connection() as conn:
+            patches = [
+                r[0] for r in conn.execute(
+                    "SELECT DISTINCT patch FROM main.matches WHERE patch IS NOT NULL"
+                )
+            ]
+            
+            for patch in patches:
+                schema = self._patch_schema(conn, patch, create=True)
+                try:
+                    conn.execute("BEGIN TRANSACTION;")
+                    count = conn.execute(f"""
+                        INSERT OR IGNORE INTO {schema}.matches ({MATCH_COLUMNS})
+                        SELECT {MATCH_COLUMNS} FROM main.matches WHERE patch = ?
+                    """, (patch,)).rowcount
+                    conn.execute(f"""
+                        INSERT OR IGNORE INTO {schema}.match_archive
+                            (match_id, codec, dict_id, raw_size, payload)
+                        SELECT a.match_id, a.codec, a.dict_id, a.raw_size, a.payload
+                        FROM main.match_archive a JOIN main.matches m ON m.match_id = a.match_id
+                        WHERE m.patch = ?
+                    """, (patch,))
+                    conn.execute("""
+                        DELETE FROM main.match_archive
+                        WHERE match_id IN (SELECT match_id FROM main.matches WHERE patch = ?)
+                    """, (patch,))
+                    conn.execute("DELETE FROM main.matches WHERE patch = ?;", (patch,))
+                    conn.execute("COMMIT;")
+                    
+                except sqlite3.Error as e:
+                    logger.error(f"Moving patch {patch} to its partition failed: {e}")
+                    if conn.in_transaction:
+                        conn.execute("ROLLBACK;")
+                    raise
+                    
+                moved += count
+                logger.info(f"Moved {count} matches of patch {patch} to {schema}")
+                
+            if moved:
+                conn.execute("VACUUM;")
+                
+        return moved
+    
+    @staticmethod
+    def _attached(conn: sqlite3.Connection) -> Dict[str, str]:
+        """Schema name -> file of every database attached to a connection."""
+        return {row[1]: row[2] for row in conn.execute("PRAGMA database_list;")}
+    
+    def _load_partitions(self, conn: sqlite3.Connection) -> Dict[str, Tuple[int, str]]:
+        """Reload the live registry (other processes may have added or retired partitions)."""
+        rows = conn.execute(
+            "SELECT patch, ordinal, path FROM main.match_partitions WHERE retired_at IS NULL"
+        ).fetchall()
+        self._partitions = {r[0]: (r[1], r[2]) for r in rows}
+        return self._partitions
+    
+    def _patch_schema(self, conn: sqlite3.Connection, patch: str, create: bool = False) -> str:
+        """
+        Schema holding a patch's matches on this connection: its partition
+        (attached, and created if `create`) or 'main'.
+        """
+        if not self.config.partition_by_patch:
+            return "main"
+            
+        # Writes always check the registry, so they never go to a partition
+        # another process retired since it was cached
+        entry = None if create else self._partitions.get(patch)
+        if entry is None:
+            with self._partition_lock:
+                entry = self._load_partitions(conn).get(patch)
+                if entry is None:
+                    if not create:
+                        return "main"
+                    entry = self._register_partition(conn, patch)
+                    
+        return self._attach_partition(conn, *entry)
+    
+    def _register_partition(self, conn: sqlite3.Connection, patch: str) -> Tuple[int, str]:
+        # Ordinals come from every row ever registered, tombstones included,
+        # so they only grow. The file is named after its ordinal too: a
+        # re-created patch never shares a path with its deleted predecessor.
+        self.partition_dir.mkdir(parents=True, exist_ok=True)
+        prefix = str(self.partition_dir.resolve() / f"matches_{patch}_p")
+        conn.execute("""
+            INSERT INTO main.match_partitions (patch, ordinal, path)
+            SELECT ?, next.ordinal, ? || next.ordinal || '.db'
+            FROM (SELECT COALESCE(MAX(ordinal), 0) + 1 AS ordinal FROM main.match_partitions) next
+            WHERE 1
+            ON CONFLICT(patch) DO UPDATE SET
+                ordinal = excluded.ordinal,
+                path = excluded.path,
+                created_at = CURRENT_TIMESTAMP,
+                retired_at = NULL
+            WHERE retired_at IS NOT NULL
+        """, (patch, prefix))
+        entry = self._load_partitions(conn)[patch]
+        logger.info(f"Created partition for patch {patch}: {entry[1]}")
+        return entry
+    
+    def _attach_partition(self, conn: sqlite3.Connection, ordinal: int, path: str) -> str:
+        schema = f"p{ordinal}"
+        attached = self._attached(conn).get(schema)
+        if attached is not None:
+            if Path(attached).resolve() == Path(path).resolve():
+                return schema
+            # Same name, different file: never write through a stale attachment
+            conn.execute(f"DETACH DATABASE {schema};")
+            
+        conn.execute(f"ATTACH DATABASE ? AS {schema};", (path,))
+        if self.config.wal_mode:
+            conn.execute(f"PRAGMA {schema}.journal_mode=WAL;")
+        # The current patch's file is small enough to stay in its own page cache
+        conn.execute(f"PRAGMA {schema}.cache_size=-{self.config.cache_size_kb};")
+        conn.execute(f"PRAGMA {schema}.synchronous=NORMAL;")
+        
+        conn.execute(MATCHES_TABLE_SQL.format(table=f"{schema}.matches"))
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {schema}.idx_matches_patch "
+            "ON matches(patch, queue_id, game_timestamp);"
+        )
+        conn.execute(ARCHIVE_TABLE_SQL.format(schema=schema))
+        return schema
+    
+    def _match_schemas(self, conn: sqlite3.Connection) -> List[Tuple[int, str]]:
+        """
+        (ordinal, schema) of the main database (ordinal 0) and every live
+        partition, oldest first, all attached. Retired partitions still
+        attached to this connection are detached.
+        """
+        if not self.config.partition_by_patch:
+            return [(0, "main")]
+            
+        with self._partition_lock:
+            live = dict(self._load_partitions(conn))
+            
+        live_schemas = {f"p{ordinal}" for ordinal, _ in live.values()}
+        for schema in self._attached(conn):
+            if PARTITION_SCHEMA.match(schema) and schema not in live_schemas:
+                conn.execute(f"DETACH DATABASE {schema};")
+                
+        schemas = [(0, "main")]
+        for ordinal, path in sorted(live.values()):
+            schemas.append((ordinal, self._attach_partition(conn, ordinal, path)))
+        return schemas
+    
+    def _matches_view(self, conn: sqlite3.Connection) -> str:
+        """
+        Name of a relation covering every stored match: main.matches, or the
+        TEMP view all_matches over the main table and all partitions
+        (recreated whenever the set of partitions changed).
+        """
+        schemas = self._match_schemas(conn)
+        if len(schemas) == 1:
+            return "main.matches"
+            
+        sql = "CREATE TEMP VIEW all_matches AS " + " UNION ALL ".join(
+            f"SELECT {MATCH_COLUMNS} FROM {schema}.matches" for _, schema in schemas
+        )
+        current = conn.execute(
+            "SELECT sql FROM temp.sqlite_master WHERE type = 'view' AND name = 'all_matches'"
+        ).fetchone()
+        if current is None or current[0] != sql:
+            conn.execute("DROP VIEW IF EXISTS temp.all_matches;")
+            conn.execute(sql)
+        return "all_matches"
     
     # ==================== PLAYER OPERATIONS ====================
     
@@ -364,108 +1194,363 @@ class MatchDatabase:
         """Insert or update a player record."""
         try:
             with self.get_connection() as conn:
-                conn.execute("""
-                    INSERT INTO players (puuid, region, last_crawled, matches_found, tier, rank)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                    ON CONFLICT(puuid) DO UPDATE SET
-                        last_crawled = ?,
-                        matches_found = matches_found + ?,
-                        tier = COALESCE(?, tier),
-                        rank = COALESCE(?, rank),
-                        updated_at = CURRENT_TIMESTAMP
-                """, (
-                    player.puuid, player.region, player.last_crawled.isoformat(),
-                    player.matches_found, player.tier, player.rank,
-                    player.last_crawled.isoformat(), player.matches_found, player.tier, player.rank
-                ))
+                conn.execute(UPSERT_PLAYER_SQL, self._player_params(player))
                 return True
         except sqlite3.Error as e:
             logger.error(f"Failed to upsert player {player.puuid}: {e}")
             return False
     
+    def upsert_players_batch(self, players: List[PlayerRecord]) -> int:
+        """
+        Insert or update many player records in a single transaction.
+        
+        Returns: Number of players written (0 if the transaction failed).
+        """
+        if not players:
+            return 0
+            
+        try:
+            with self.get_connection() as conn:
+                conn.execute("BEGIN TRANSACTION;")
+                conn.executemany(UPSERT_PLAYER_SQL, [self._player_params(p) for p in players])
+                conn.execute("COMMIT;")
+                return len(players)
+        except sqlite3.Error as e:
+            logger.error(f"Batch player upsert failed: {e}")
+            with self.get_connection() as conn:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK;")
+            return 0
+    
+    def record_player_ranks(self, players: List[Tuple[str, str, str, str]]) -> int:
+        """
+        Store ladder tier/rank for (puuid, region, tier, rank) tuples in one
+        transaction, without touching when the players were last crawled.
+        
+        Returns: Number of players written (0 if the transaction failed).
+        """
+        if not players:
+            return 0
+            
+        try:
+            with self.get_connection() as conn:
+                conn.execute("BEGIN TRANSACTION;")
+                conn.executemany(RECORD_RANK_SQL, players)
+                conn.execute("COMMIT;")
+                return len(players)
+        except sqlite3.Error as e:
+            logger.error(f"Recording player ranks failed: {e}")
+            with self.get_connection() as conn:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK;")
+            return 0
+    
+    def get_summoner_puuids(
+        self,
+        region: str,
+        summoner_ids: List[str],
+        chunk_size: int = 500
+    ) -> Dict[str, str]:
+        """
+        Look up already resolved summoner IDs.
+        
+        Returns: {summoner_id: puuid} for the IDs that are known
+        """
+        unique = list(dict.fromkeys(summoner_ids))
+        found: Dict[str, str] = {}
+        
+        with self.get_connection() as conn:
+            for start in range(0, len(unique), chunk_size):
+                chunk = unique[start:start + chunk_size]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"""
+                    SELECT summoner_id, puuid FROM summoner_ids
+                    WHERE region = ? AND summoner_id IN ({placeholders})
+                    """,
+                    (region, *chunk)
+                ).fetchall()
+                found.update((r[0], r[1]) for r in rows)
+                
+        return found
+    
+    def save_summoner_puuids(self, region: str, mapping: Dict[str, str]) -> int:
+        """Remember summonerId -> PUUID pairs resolved through summoner-v4."""
+        if not mapping:
+            return 0
+            
+        now = int(time.time())
+        try:
+            with self.get_connection() as conn:
+                conn.execute("BEGIN TRANSACTION;")
+                conn.executemany(
+                    """
+                    INSERT OR REPLACE INTO summoner_ids (region, summoner_id, puuid, resolved_at)
+                    VALUES (?, ?, ?, ?)
+                    """,
+                    [(region, sid, puuid, now) for sid, puuid in mapping.items()]
+                )
+                conn.execute("COMMIT;")
+                return len(mapping)
+        except sqlite3.Error as e:
+            logger.error(f"Saving summoner IDs failed: {e}")
+            with self.get_connection() as conn:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK;")
+            return 0
+    
+    @staticmethod
+    def _crawl_cutoff(hours: int) -> int:
+        """Epoch seconds before which a crawl counts as stale."""
+        return int(time.time()) - hours * 3600
+    
     def should_crawl_player(self, puuid: str, hours: int = 24) -> bool:
         """Check if a player should be crawled (not crawled recently)."""
-        with self.get_connection() as conn:
-            result = conn.execute(
-                "SELECT last_crawled FROM players WHERE puuid = ?", (puuid,)
-            ).fetchone()
+        return bool(self.filter_crawlable([puuid], hours))
+    
+    def filter_crawlable(
+        self,
+        puuids: List[str],
+        hours: int = 24,
+        chunk_size: int = 500
+    ) -> List[str]:
+        """
+        Return the PUUIDs not crawled within the last `hours`, preserving order.
+        
+        Eligibility for the whole list is an indexed range comparison on
+        last_crawled_at, one `IN (...)` query per chunk.
+        """
+        if not puuids:
+            return []
             
-            if not result:
-                return True  # Never crawled
+        cutoff = self._crawl_cutoff(hours)
+        unique = list(dict.fromkeys(puuids))
+        recent = set()
+        
+        with self.get_connection() as conn:
+            for start in range(0, len(unique), chunk_size):
+                chunk = unique[start:start + chunk_size]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"""
+                    SELECT puuid FROM players
+                    WHERE puuid IN ({placeholders}) AND last_crawled_at > ?
+                    """,
+                    (*chunk, cutoff)
+                ).fetchall()
+                recent.update(r[0] for r in rows)
                 
-            last_crawled = datetime.fromisoformat(result['last_crawled'])
-            return datetime.now() - last_crawled > timedelta(hours=hours)
+        return [p for p in unique if p not in recent]
     
     def get_players_to_crawl(self, region: str, limit: int = 100) -> List[str]:
         """Get PUUIDs that need crawling in a region."""
-        cutoff = (datetime.now() - timedelta(hours=config.crawler.player_rescan_hours)).isoformat()
+        cutoff = self._crawl_cutoff(config.crawler.player_rescan_hours)
         
         with self.get_connection() as conn:
             results = conn.execute("""
                 SELECT puuid FROM players 
-                WHERE region = ? AND last_crawled < ?
-                ORDER BY last_crawled ASC
+                WHERE region = ? AND last_crawled_at <= ?
+                ORDER BY last_crawled_at ASC
                 LIMIT ?
             """, (region, cutoff, limit)).fetchall()
             
             return [r['puuid'] for r in results]
     
+    def iter_recent_players(self, hours: int = 24, chunk_size: int = 50000) -> Iterator[List[str]]:
+        """Stream PUUIDs crawled within the last `hours`, one chunk at a time."""
+        cutoff = self._crawl_cutoff(hours)
+        last = 0
+        
+        while True:
+            with self.get_connection() as conn:
+                rows = conn.execute("""
+                    SELECT rowid, puuid FROM players
+                    WHERE rowid > ? AND last_crawled_at > ?
+                    ORDER BY rowid
+                    LIMIT ?
+                """, (last, cutoff, chunk_size)).fetchall()
+                
+            if not rows:
+                return
+                
+            last = rows[-1][0]
+            yield [r[1] for r in rows]
+    
     # ==================== QUEUE OPERATIONS ====================
     
-    def add_to_queue(self, puuids: List[Tuple[str, str]], priority: int = 0) -> int:
+    def add_to_queue(self, puuids: List[Tuple], priority: int = 0) -> int:
         """
         Add PUUIDs to crawl queue.
         
         Args:
-            puuids: List of (puuid, region) tuples
-            priority: Higher = crawled sooner
+            puuids: List of (puuid, region) or (puuid, region, priority) tuples
+            priority: Higher = crawled sooner (for entries without their own)
             
-        Returns: Number of PUUIDs added (excludes duplicates)
+        Returns: Number of PUUIDs submitted. Already-queued PUUIDs keep the
+            higher of their old and new priority.
         """
         if not puuids:
             return 0
             
-        data = [(p, r, priority) for p, r in puuids]
+        data = [
+            (entry[0], entry[1], entry[2] if len(entry) > 2 else priority)
+            for entry in puuids
+        ]
         
         with self.get_connection() as conn:
             conn.execute("BEGIN TRANSACTION;")
             conn.executemany("""
-                INSERT OR IGNORE INTO crawl_queue (puuid, region, priority)
+                INSERT INTO crawl_queue (puuid, region, priority)
                 VALUES (?, ?, ?)
+                ON CONFLICT(puuid) DO UPDATE SET
+                    priority = MAX(priority, excluded.priority)
             """, data)
             conn.execute("COMMIT;")
             
         return len(puuids)
     
-    def pop_from_queue(self, region: str, count: int = 10) -> List[Tuple[str, str]]:
+    def pop_from_queue(self, region: str, count: int = 10) -> List[Tuple[str, str, int]]:
         """
-        Pop PUUIDs from queue for crawling.
-        Returns list of (puuid, region) tuples.
+        Atomically remove the highest-priority unleased PUUIDs from the queue.
+        
+        A single DELETE ... RETURNING, so concurrent crawler processes can
+        never pop the same entry.
+        Returns list of (puuid, region, priority) tuples.
         """
         with self.get_connection() as conn:
             results = conn.execute("""
-                SELECT puuid, region FROM crawl_queue
-                WHERE region = ?
-                ORDER BY priority DESC, added_at ASC
-                LIMIT ?
-            """, (region, count)).fetchall()
+                DELETE FROM crawl_queue
+                WHERE puuid IN (
+                    SELECT puuid FROM crawl_queue
+                    WHERE region = ? AND (lease_expires IS NULL OR lease_expires < ?)
+                    ORDER BY priority DESC
+                    LIMIT ?
+                )
+                RETURNING puuid, region, priority
+            """, (region, int(time.time()), count)).fetchall()
+            
+        # RETURNING order is unspecified
+        rows = [(r['puuid'], r['region'], r['priority']) for r in results]
+        rows.sort(key=lambda r: r[2], reverse=True)
+        return rows
+    
+    def lease_from_queue(
+        self,
+        region: str,
+        owner: str,
+        count: int = 10,
+        lease_seconds: int = 900
+    ) -> List[Tuple[str, str, int]]:
+        """
+        Lease the highest-priority available PUUIDs to `owner`.
+        
+        Leased entries stay in the queue (so a crash loses nothing) but are
+        invisible to other owners until the lease expires or is released.
+        Expired leases from crashed workers are taken over automatically.
+        A single UPDATE ... RETURNING keeps the claim atomic across processes.
+        
+        Returns: List of (puuid, region, priority), highest priority first
+        """
+        now = int(time.time())
+        with self.get_connection() as conn:
+            results = conn.execute("""
+                UPDATE crawl_queue
+                SET lease_owner = ?, lease_expires = ?
+                WHERE puuid IN (
+                    SELECT puuid FROM crawl_queue
+                    WHERE region = ? AND (lease_expires IS NULL OR lease_expires < ?)
+                    ORDER BY priority DESC
+                    LIMIT ?
+                )
+                RETURNING puuid, region, priority
+            """, (owner, now + lease_seconds, region, now, count)).fetchall()
+            
+        rows = [(r['puuid'], r['region'], r['priority']) for r in results]
+        rows.sort(key=lambda r: r[2], reverse=True)
+        return rows
+    
+    def renew_leases(self, owner: str, lease_seconds: int = 900) -> int:
+        """Extend every lease held by `owner`. Returns number renewed."""
+        with self.get_connection() as conn:
+            cursor = conn.execute(
+                "UPDATE crawl_queue SET lease_expires = ? WHERE lease_owner = ?",
+                (int(time.time()) + lease_seconds, owner)
+            )
+            return cursor.rowcount
+    
+    def complete_leases(self, owner: str, puuids: List[str], chunk_size: int = 500) -> int:
+        """Delete finished entries still leased by `owner`. Returns number deleted."""
+        deleted = 0
+        with self.get_connection() as conn:
+            for start in range(0, len(puuids), chunk_size):
+                chunk = puuids[start:start + chunk_size]
+                placeholders = ",".join("?" * len(chunk))
+                cursor = conn.execute(
+                    f"DELETE FROM crawl_queue WHERE lease_owner = ? AND puuid IN ({placeholders})",
+                    (owner, *chunk)
+                )
+                deleted += cursor.rowcount
+        return deleted
+    
+    def release_leases(
+        self,
+        owner: str,
+        puuids: Optional[List[str]] = None,
+        chunk_size: int = 500
+    ) -> int:
+        """
+        Hand leased entries back to the queue unprocessed.
+        
+        Args:
+            owner: Lease holder
+            puuids: Entries to release (all of the owner's leases if None)
             
-            if results:
-                puuids = [r['puuid'] for r in results]
-                placeholders = ",".join("?" * len(puuids))
-                conn.execute(f"DELETE FROM crawl_queue WHERE puuid IN ({placeholders})", puuids)
+        Returns: Number of entries released
+        """
+        with self.get_connection() as conn:
+            if puuids is None:
+                return conn.execute("""
+                    UPDATE crawl_queue SET lease_owner = NULL, lease_expires = NULL
+                    WHERE lease_owner = ?
+                """, (owner,)).rowcount
                 
-            return [(r['puuid'], r['region']) for r in results]
+            released = 0
+            for start in range(0, len(puuids), chunk_size):
+                chunk = puuids[start:start + chunk_size]
+                placeholders = ",".join("?" * len(chunk))
+                released += conn.execute(f"""
+                    UPDATE crawl_queue SET lease_owner = NULL, lease_expires = NULL
+                    WHERE lease_owner = ? AND puuid IN ({placeholders})
+                """, (owner, *chunk)).rowcount
+            return released
     
-    def get_queue_size(self, region: Optional[str] = None) -> int:
-        """Get current queue size."""
+    def reclaim_expired_leases(self) -> int:
+        """Clear leases whose holders stopped renewing them (crashed workers)."""
         with self.get_connection() as conn:
-            if region:
-                result = conn.execute(
-                    "SELECT COUNT(*) FROM crawl_queue WHERE region = ?", (region,)
-                ).fetchone()
-            else:
-                result = conn.execute("SELECT COUNT(*) FROM crawl_queue").fetchone()
+            return conn.execute("""
+                UPDATE crawl_queue SET lease_owner = NULL, lease_expires = NULL
+                WHERE lease_expires IS NOT NULL AND lease_expires < ?
+            """, (int(time.time()),)).rowcount
+    
+    def get_queue_size(self, region: Optional[str] = None, available_only: bool = False) -> int:
+        """
+        Get current queue size.
+        
+        Args:
+            region: Count one region only
+            available_only: Skip entries under a live lease
+        """
+        query = "SELECT COUNT(*) FROM crawl_queue WHERE 1 = 1"
+        params: List[Any] = []
+        if region:
+            query += " AND region = ?"
+            params.append(region)
+        if available_only:
+            query += " AND (lease_expires IS NULL OR lease_expires < ?)"
+            params.append(int(time.time()))
+            
+        with self.get_connection() as conn:
+            result = conn.execute(query, params).fetchone()
             return result[0] if result else 0
     
     # ==================== STATISTICS ====================
@@ -473,10 +1558,16 @@ class MatchDatabase:
     def get_statistics(self) -> Dict[str, Any]:
         """Get database statistics."""
         with self.get_connection() as conn:
+            source = self._matches_view(conn)
             stats = {
-                "total_matches": conn.execute("SELECT COUNT(*) FROM matches").fetchone()[0],
+                "total_matches": conn.execute(f"SELECT COUNT(*) FROM {source}").fetchone()[0],
                 "total_players": conn.execute("SELECT COUNT(*) FROM players").fetchone()[0],
                 "queue_size": conn.execute("SELECT COUNT(*) FROM crawl_queue").fetchone()[0],
+                "archived_matches": sum(
+                    conn.execute(f"SELECT COUNT(*) FROM {schema}.match_archive").fetchone()[0]
+                    for _, schema in self._match_schemas(conn)
+                ),
+                "partitions": self.list_partitions(),
             }
             
             # Matches by version
@@ -487,8 +1578,8 @@ class MatchDatabase:
             stats["patches"] = {r['version']: r['match_count'] for r in versions}
             
             # Matches by region
-            regions = conn.execute("""
-                SELECT region, COUNT(*) as count FROM matches
+            regions = conn.execute(f"""
+                SELECT region, COUNT(*) as count FROM {source}
                 GROUP BY region ORDER BY count DESC
             """).fetchall()
             stats["regions"] = {r['region']: r['count'] for r in regions}
@@ -0,0 +1,139 @@
+"""
+JSON Decoding for API Responses.
+
+match-v5 bodies are hundreds of KB (challenges, perks, pings, ...) of
+which the crawler reads a few dozen fields. This module picks the fastest
+available decoder and describes those fields as a typed schema:
+
+- msgspec (if installed) decodes straight into the schema and skips every
+  other field without building it.
+- orjson (if installed) parses the whole document several times faster
+  than the standard library; the result is then trimmed to the schema.
+- The stdlib json module is the fallback and gives the same result.
+
+Decoders take the raw body bytes and raise ValueError on malformed input,
+whichever library is in use.
+"""
+
+import json
+import logging
+from typing import Any, Callable, Dict, List, Tuple, TypedDict
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+    
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    
+logger = logging.getLogger(__name__)
+
+
+# ==================== MATCH-V5 SCHEMA ====================
+# Keys are Riot's JSON names; anything not listed here is never kept.
+
+class MatchParticipant(TypedDict, total=False):
+    puuid: str
+    championId: int
+    teamId: int
+    win: bool
+    item0: int
+    item1: int
+    item2: int
+    item3: int
+    item4: int
+    item5: int
+
+
+class MatchInfo(TypedDict, total=False):
+    gameVersion: str
+    gameMode: str
+    queueId: int
+    gameDuration: int
+    gameCreation: int
+    participants: List[MatchParticipant]
+
+
+class MatchMetadata(TypedDict, total=False):
+    matchId: str
+    participants: List[str]
+
+
+class MatchPayload(TypedDict, total=False):
+    metadata: MatchMetadata
+    info: MatchInfo
+    
+    
+_PARTICIPANT_KEYS = tuple(MatchParticipant.__annotations__)
+_INFO_KEYS = tuple(k for k in MatchInfo.__annotations__ if k != "participants")
+_METADATA_KEYS = tuple(MatchMetadata.__annotations__)
+
+
+def _pick(obj: Any, keys: tuple) -> Dict[str, Any]:
+    if not isinstance(obj, dict):
+        return {}
+    return {k: obj[k] for k in keys if k in obj}
+
+
+def select_match(data: Any) -> MatchPayload:
+    """Trim a fully parsed match-v5 document to the MatchPayload fields."""
+    if not isinstance(data, dict):
+        raise ValueError("match payload is not a JSON object")
+        
+    info = data.get("info")
+    selected_info = _pick(info, _INFO_KEYS)
+    if isinstance(info, dict) and isinstance(info.get("participants"), list):
+        selected_info["participants"] = [
+            _pick(p, _PARTICIPANT_KEYS) for p in info["participants"]
+        ]
+        
+    return {
+        "metadata": _pick(data.get("metadata"), _METADATA_KEYS),
+        "info": selected_info
+    }
+    
+    
+# ==================== DECODERS ====================
+
+if msgspec is not None:
+    _json_decoder = msgspec.json.Decoder()
+    _match_decoder = msgspec.json.Decoder(MatchPayload)
+    
+    def loads(raw: bytes) -> Any:
+        """Decode a JSON body."""
+        try:
+            return _json_decoder.decode(raw)
+        except msgspec.MsgspecError as e:
+            raise ValueError(str(e)) from e
+    
+    def decode_match(raw: bytes) -> MatchPayload:
+        """Decode only the MatchPayload fields of a match-v5 body."""
+        try:
+            return _match_decoder.decode(raw)
+        except msgspec.MsgspecError as e:
+            raise ValueError(str(e)) from e
+            
+    BACKEND = "msgspec"
+    
+else:
+    if orjson is not None:
+        loads: Callable[[bytes], Any] = orjson.loads  # JSONDecodeError is a ValueError
+        BACKEND = "orjson"
+    else:
+        loads = json.loads
+        BACKEND = "json"
+    
+    def decode_match(raw: bytes) -> MatchPayload:
+        """Decode a match-v5 body and keep only the MatchPayload fields."""
+        return select_match(loads(raw))
+        
+        
+def decode_match_keep_raw(raw: bytes) -> Tuple[MatchPayload, bytes]:
+    """decode_match() that also hands back the body (for the raw archive)."""
+    return decode_match(raw), raw
+    
+    
+logger.debug(f"JSON decoding backend: {BACKEND}")
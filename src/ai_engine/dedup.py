@@ -0,0 +1,313 @@
+"""
+Persistent Seen-Index for the Crawler.
+
+Bloom filters over stored match IDs and recently crawled PUUIDs, saved to
+disk between runs and warmed from the database. They replace unbounded
+in-memory sets: memory is fixed by the configured capacity, and a restarted
+crawler knows which matches it already stored without asking the API.
+
+A Bloom filter never misses an added key but may report false positives,
+so callers treat a hit as "maybe" and confirm it exactly (e.g. with
+MatchDatabase.match_exists).
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import struct
+import time
+import numpy as np
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from .database import MatchDatabase, get_database
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter backed by a numpy bit array.
+    
+    Uses double hashing (Kirsch-Mitzenmacher) over a 128-bit BLAKE2b digest,
+    so k probe positions cost a single hash per key.
+    """
+    
+    MAGIC = b"SEEN1"
+    # magic, capacity, error rate, bits, hashes, count, metadata length
+    HEADER = struct.Struct("<5sQdQIQI")
+    
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.capacity = max(1, int(capacity))
+        self.error_rate = error_rate
+        
+        # Optimal sizing: m = -n ln p / (ln 2)^2, k = m/n ln 2
+        num_bits = math.ceil(-self.capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.num_bits = max(8, (num_bits + 7) // 8 * 8)
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        
+        self.bits = np.zeros(self.num_bits // 8, dtype=np.uint8)
+        self.count = 0
+    
+    @property
+    def saturated(self) -> bool:
+        """True once more keys were added than the filter was sized for."""
+        return self.count > self.capacity
+    
+    @property
+    def nbytes(self) -> int:
+        return self.bits.nbytes
+    
+    def _digests(self, keys: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Split each key's 128-bit digest into two uint64 hash values."""
+        raw = b"".join(
+            hashlib.blake2b(k.encode(), digest_size=16).digest() for k in keys
+        )
+        halves = np.frombuffer(raw, dtype="<u8").reshape(-1, 2)
+        return halves[:, 0], halves[:, 1]
+    
+    def _positions(self, keys: Iterable[str]) -> np.ndarray:
+        """(N, k) bit positions for each key (uint64 arithmetic wraps)."""
+        h1, h2 = self._digests(keys)
+        probes = np.arange(self.num_hashes, dtype=np.uint64)
+        with np.errstate(over="ignore"):
+            combined = h1[:, None] + probes[None, :] * h2[:, None]
+        return combined % np.uint64(self.num_bits)
+    
+    def update(self, keys: Iterable[str]) -> None:
+        """Add many keys with one vectorized pass."""
+        keys = list(keys)
+        if not keys:
+            return
+            
+        pos = self._positions(keys).ravel()
+        np.bitwise_or.at(
+            self.bits,
+            (pos >> np.uint64(3)).astype(np.intp),
+            (np.uint8(1) << (pos & np.uint64(7)).astype(np.uint8))
+        )
+        self.count += len(keys)
+    
+    def add(self, key: str) -> None:
+        self.update((key,))
+    
+    def __contains__(self, key: str) -> bool:
+        pos = self._positions((key,))[0]
+        byte = self.bits[(pos >> np.uint64(3)).astype(np.intp)]
+        mask = np.uint8(1) << (pos & np.uint64(7)).astype(np.uint8)
+        return bool(np.all(byte & mask))
+    
+    def save(self, path: Path, metadata: Optional[Dict[str, Any]] = None) -> None:
+        """Write the filter atomically (temp file + rename)."""
+        meta = json.dumps(metadata or {}).encode()
+        header = self.HEADER.pack(
+            self.MAGIC, self.capacity, self.error_rate,
+            self.num_bits, self.num_hashes, self.count, len(meta)
+        )
+        
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(header)
+            f.write(meta)
+            f.write(self.bits.tobytes())
+        os.replace(tmp, path)
+    
+    @classmethod
+    def load(cls, path: Path) -> Tuple["BloomFilter", Dict[str, Any]]:
+        """
+        Read a filter written by save().
+        
+        Returns: (filter, metadata)
+        """
+        with open(path, "rb") as f:
+            header = f.read(cls.HEADER.size)
+            magic, capacity, error_rate, num_bits, num_hashes, count, meta_len = (
+                cls.HEADER.unpack(header)
+            )
+            if magic != cls.MAGIC:
+                raise ValueError(f"{path} is not a seen-index file")
+            metadata = json.loads(f.read(meta_len) or b"{}")
+            bits = np.frombuffer(f.read(), dtype=np.uint8).copy()
+            
+        bloom = cls(capacity, error_rate)
+        if bloom.num_bits != num_bits or bloom.num_hashes != num_hashes or bits.size != num_bits // 8:
+            raise ValueError(f"{path} has an inconsistent layout")
+            
+        bloom.bits = bits
+        bloom.count = count
+        return bloom, metadata
+
+
+class SeenIndex:
+    """
+    Persistent "already seen" index for matches and players.
+    
+    - matches: every stored match ID. Stamped with the matches table's high
+      water mark, so a restart only hashes rows inserted since the last save.
+    - players: PUUIDs crawled within the rescan window plus those queued this
+      run. Bloom filters cannot forget, so it is rebuilt from the players
+      table once it is older than a quarter of the rescan window; that way
+      players become discoverable again roughly when they are due a rescan.
+      
+    A filter that outgrows its capacity is rebuilt from the database at
+    twice the size, which also drops matches deleted with old patches.
+    """
+    
+    MATCHES_FILE = "matches.bloom"
+    PLAYERS_FILE = "players.bloom"
+    
+    def __init__(
+        self,
+        db: Optional[MatchDatabase] = None,
+        index_dir: Optional[Path] = None,
+        capacity: int = 2_000_000,
+        error_rate: float = 0.001,
+        rescan_hours: int = 24
+    ):
+        self.db = db or get_database()
+        self.index_dir = Path(index_dir) if index_dir else Path("data/seen_index")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.rescan_hours = rescan_hours
+        
+        self.matches: Optional[BloomFilter] = None
+        self.players: Optional[BloomFilter] = None
+        self._high_water_mark = 0
+        self._players_built_at = 0.0
+    
+    @classmethod
+    def from_config(cls, cfg) -> "SeenIndex":
+        """Build an index from a CrawlerConfig."""
+        return cls(
+            index_dir=cfg.seen_index_dir,
+            capacity=cfg.seen_index_capacity,
+            error_rate=cfg.seen_index_error_rate,
+            rescan_hours=cfg.player_rescan_hours
+        )
+    
+    @property
+    def is_open(self) -> bool:
+        return self.matches is not None and self.players is not None
+    
+    def open(self) -> "SeenIndex":
+        """Load the saved filters (or build them) and catch up with the database."""
+        if not self.is_open:
+            self.matches, meta = self._load(self.MATCHES_FILE)
+            self._high_water_mark = meta.get("high_water_mark", 0) if self.matches else 0
+            
+            self.players, meta = self._load(self.PLAYERS_FILE)
+            self._players_built_at = meta.get("built_at", 0.0) if self.players else 0.0
+            
+        self.refresh()
+        return self
+    
+    def refresh(self) -> None:
+        """Fold in newly stored matches and rotate/grow filters as needed."""
+        hwm = self.db.get_high_water_mark()
+        
+        if self.matches is None or self.matches.saturated or hwm < self._high_water_mark:
+            self._rebuild_matches(hwm)
+        elif hwm > self._high_water_mark:
+            added = 0
+            for chunk in self.db.iter_match_ids(after_rowid=self._high_water_mark, up_to_rowid=hwm):
+                self.matches.update(chunk)
+                added += len(chunk)
+            self._high_water_mark = hwm
+            logger.info(f"Seen index: added {added} new matches")
+            
+        max_age = self.rescan_hours * 3600 / 4
+        if (
+            self.players is None
+            or self.players.saturated
+            or time.time() - self._players_built_at > max_age
+        ):
+            self._rebuild_players()
+    
+    def _load(self, name: str) -> Tuple[Optional[BloomFilter], Dict[str, Any]]:
+        path = self.index_dir / name
+        if not path.exists():
+            return None, {}
+            
+        try:
+            bloom, meta = BloomFilter.load(path)
+        except (OSError, ValueError, struct.error) as e:
+            logger.warning(f"Discarding unreadable seen index {path}: {e}")
+            return None, {}
+            
+        # Rebuild at the configured size if the config changed
+        if bloom.capacity < self.capacity or bloom.error_rate != self.error_rate:
+            return None, {}
+            
+        return bloom, meta
+    
+    def _rebuild_matches(self, hwm: int) -> None:
+        # The high water mark is a position (partition ordinal in its high
+        # bits), so size the filter from the rows actually stored
+        capacity = max(self.capacity, 2 * self.db.get_match_row_bound())
+        if self.matches is not None and self.matches.saturated:
+            logger.info(f"Seen index: match filter saturated, growing to {capacity}")
+            
+        self.matches = BloomFilter(capacity, self.error_rate)
+        for chunk in self.db.iter_match_ids(up_to_rowid=hwm):
+            self.matches.update(chunk)
+        self._high_water_mark = hwm
+        
+        logger.info(
+            f"Seen index: built match filter ({self.matches.count} IDs, "
+            f"{self.matches.nbytes / 1e6:.1f} MB)"
+        )
+    
+    def _rebuild_players(self) -> None:
+        capacity = self.capacity
+        if self.players is not None and self.players.saturated:
+            capacity = max(capacity, 2 * self.players.count)
+            
+        self.players = BloomFilter(capacity, self.error_rate)
+        for chunk in self.db.iter_recent_players(self.rescan_hours):
+            self.players.update(chunk)
+        self._players_built_at = time.time()
+        
+        logger.info(f"Seen index: built player filter ({self.players.count} PUUIDs)")
+        
+    # ==================== LOOKUPS ====================
+    
+    def might_have_match(self, match_id: str) -> bool:
+        """False means definitely not stored; True must be confirmed."""
+        return match_id in self.matches
+    
+    def add_match(self, match_id: str) -> None:
+        self.matches.add(match_id)
+    
+    def has_player(self, puuid: str) -> bool:
+        """Whether the PUUID was crawled recently or already queued (may be a false positive)."""
+        return puuid in self.players
+    
+    def add_player(self, puuid: str) -> None:
+        self.players.add(puuid)
+        
+    # ==================== PERSISTENCE ====================
+    
+    def save(self) -> None:
+        """
+        Persist both filters.
+        
+        Matches are stamped with the high water mark the filter was last
+        scanned up to, not the database's current one: rows other processes
+        inserted since then are not in the filter, and the next warm-up must
+        still hash them.
+        """
+        if not self.is_open:
+            return
+            
+        try:
+            self.matches.save(
+                self.index_dir / self.MATCHES_FILE, {"high_water_mark": self._high_water_mark}
+            )
+            self.players.save(
+                self.index_dir / self.PLAYERS_FILE, {"built_at": self._players_built_at}
+            )
+        except OSError as e:
+            logger.warning(f"Failed to save seen index: {e}")
@@ -0,0 +1,241 @@
+"""
+Durable Crawl Frontier.
+
+Priority queue of players waiting to be crawled. A bounded in-memory heap
+holds the hottest entries; overflow spills to the crawl_queue table in
+batches and is pulled back when the heap runs low, so discoveries are never
+dropped and a restarted crawler resumes where it stopped instead of
+re-seeding from the league endpoints.
+
+Entries pulled from crawl_queue are leased, not deleted: they stay in the
+table, invisible to other crawler processes, until this process finishes
+them (complete) or hands them back (persist). Several processes can
+therefore share one database without crawling the same player twice, and
+leases of a crashed process simply expire and are picked up by others.
+Live leases are renewed once half the lease time has passed, however long
+the entries wait in the heap.
+
+Priorities are single integers so SQLite can order them directly:
+skill score (tier/division) in the high bits, discovery time (epoch
+seconds) in the low 32 bits. Higher tiers go first; within a tier the most
+recently discovered players go first, since their games are the most
+likely to be on the current patch.
+"""
+
+import heapq
+import itertools
+import logging
+import os
+import socket
+import time
+import uuid
+from typing import Iterable, List, Optional, Set, Tuple
+
+from .database import MatchDatabase, get_database
+
+logger = logging.getLogger(__name__)
+
+
+TIER_ORDER = [
+    "IRON", "BRONZE", "SILVER", "GOLD", "PLATINUM", "EMERALD",
+    "DIAMOND", "MASTER", "GRANDMASTER", "CHALLENGER"
+]
+DIVISIONS = {"IV": 0, "III": 1, "II": 2, "I": 3}
+
+# Highest possible skill score (Challenger I)
+MAX_SCORE = len(TIER_ORDER) * 4
+
+
+def tier_score(tier: Optional[str], rank: Optional[str] = None) -> int:
+    """
+    Skill score for a tier/division: 0 if unknown, then 4 points per tier
+    and 1 per division (apex tiers only have division I).
+    """
+    if not tier or tier.upper() not in TIER_ORDER:
+        return 0
+    return 1 + TIER_ORDER.index(tier.upper()) * 4 + DIVISIONS.get((rank or "I").upper(), 3)
+
+
+def player_priority(score: int, discovered_at: Optional[float] = None) -> int:
+    """Pack a skill score and discovery time into one sortable priority."""
+    ts = int(discovered_at if discovered_at is not None else time.time())
+    return (max(0, score) << 32) | (ts & 0xFFFFFFFF)
+
+
+def priority_score(priority: int) -> int:
+    """Skill score a priority was built from."""
+    return priority >> 32
+
+
+def default_lease_owner() -> str:
+    """Lease owner ID unique to this process (host:pid:random)."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class CrawlFrontier:
+    """
+    Two-tier priority frontier for one region.
+    
+    push() goes to the in-memory heap; once it exceeds hot_size, the
+    lowest-priority batch_size entries are written to crawl_queue in one
+    transaction. pop_batch() leases a refill from crawl_queue (highest
+    priority first) whenever the heap drops below batch_size. Callers report
+    each popped player with complete(); persist() writes the whole heap back
+    and releases unfinished leases, so nothing is lost between runs.
+    """
+    
+    def __init__(
+        self,
+        region: str,
+        db: Optional[MatchDatabase] = None,
+        hot_size: int = 10000,
+        batch_size: int = 500,
+        owner: Optional[str] = None,
+        lease_seconds: int = 900
+    ):
+        self.region = region
+        self.db = db or get_database()
+        self.hot_size = max(hot_size, batch_size)
+        self.batch_size = batch_size
+        self.owner = owner or default_lease_owner()
+        self.lease_seconds = lease_seconds
+        
+        # Min-heap of (-priority, seq, puuid)
+        self._heap: List[Tuple[int, int, str]] = []
+        self._seq = itertools.count()
+        self._spilled = 0  # Entries for this region waiting in crawl_queue
+        self._leased: Set[str] = set()  # Entries we hold a lease on
+        self._completed: List[str] = []  # Finished leases not yet deleted
+        self._renewed_at = 0.0  # time.monotonic() of the last lease/renewal
+    
+    def __len__(self) -> int:
+        return len(self._heap) + self._spilled
+    
+    def open(self) -> int:
+        """
+        Attach to the persisted queue, reclaiming leases of crashed workers.
+        
+        Returns: Number of players available for this region
+        """
+        reclaimed = self.db.reclaim_expired_leases()
+        if reclaimed:
+            logger.info(f"Reclaimed {reclaimed} expired crawl_queue leases")
+            
+        self._spilled = self.db.get_queue_size(self.region, available_only=True)
+        return self._spilled
+    
+    def push(self, puuid: str, priority: int) -> None:
+        """Add a player; may spill the lowest-priority batch to the database."""
+        heapq.heappush(self._heap, (-priority, next(self._seq), puuid))
+        if len(self._heap) > self.hot_size:
+            self._spill()
+    
+    def push_many(self, entries: Iterable[Tuple[str, int]]) -> None:
+        """Add (puuid, priority) pairs, spilling at most once at the end."""
+        for puuid, priority in entries:
+            heapq.heappush(self._heap, (-priority, next(self._seq), puuid))
+        if len(self._heap) > self.hot_size:
+            self._spill()
+            
+    def pop_batch(self, count: int) -> List[Tuple[str, int]]:
+        """
+        Take up to `count` highest-priority players.
+        
+        Returns: List of (puuid, priority)
+        """
+        # Other processes may have queued entries, so an empty heap always checks
+        if not self._heap or (len(self._heap) < max(count, self.batch_size) and self._spilled > 0):
+            self._refill()
+        else:
+            self._renew_if_due()
+            
+        batch: List[Tuple[str, int]] = []
+        while self._heap and len(batch) < count:
+            neg_priority, _, puuid = heapq.heappop(self._heap)
+            batch.append((puuid, -neg_priority))
+        return batch
+    
+    def complete(self, puuid: str) -> None:
+        """Mark a popped player as done; its queue entry is deleted in batches."""
+        if puuid in self._leased:
+            self._leased.discard(puuid)
+            self._completed.append(puuid)
+            if len(self._completed) >= self.batch_size:
+                self._flush_completed()
+            self._renew_if_due()
+                
+    def complete_many(self, puuids: Iterable[str]) -> None:
+        """complete() for several players."""
+        for puuid in puuids:
+            self.complete(puuid)
+            
+    def persist(self) -> int:
+        """
+        Write every in-memory entry to crawl_queue, release unfinished leases
+        and clear the heap.
+        
+        Returns: Number of entries written
+        """
+        self._flush_completed()
+        entries = self._heap
+        self._heap = []
+        self._write(entries)
+        
+        # Popped but never completed (e.g. crawl aborted): hand them back
+        if self._leased:
+            self.db.release_leases(self.owner, list(self._leased))
+            self._leased.clear()
+        return len(entries)
+    
+    def _flush_completed(self) -> None:
+        if self._completed:
+            self.db.complete_leases(self.owner, self._completed)
+            self._completed = []
+    
+    def _spill(self) -> None:
+        # A sorted list is a valid heap; keep the best, spill the tail
+        self._heap.sort()
+        keep = self.hot_size - self.batch_size
+        spill = self._heap[keep:]
+        del self._heap[keep:]
+        self._write(spill)
+        logger.debug(f"Frontier {self.region}: spilled {len(spill)} players")
+    
+    def _renew_if_due(self) -> None:
+        # Leased entries can sit behind fresher discoveries for longer than
+        # a lease; renew before another process reclaims them
+        if self._leased and time.monotonic() - self._renewed_at >= self.lease_seconds / 2:
+            self.db.renew_leases(self.owner, self.lease_seconds)
+            self._renewed_at = time.monotonic()
+            
+    def _refill(self) -> None:
+        # Keep leases we still hold alive while taking new ones
+        if self._leased:
+            self.db.renew_leases(self.owner, self.lease_seconds)
+            
+        rows = self.db.lease_from_queue(
+            self.region, self.owner, self.batch_size, self.lease_seconds
+        )
+        if self._leased or rows:
+            self._renewed_at = time.monotonic()
+        for puuid, _, priority in rows:
+            heapq.heappush(self._heap, (-priority, next(self._seq), puuid))
+            self._leased.add(puuid)
+        self._spilled = max(0, self._spilled - len(rows)) if rows else 0
+    
+    def _write(self, entries: List[Tuple[int, int, str]]) -> None:
+        if not entries:
+            return
+            
+        # Entries that came from the table only need their lease dropped
+        leased = {puuid for _, _, puuid in entries if puuid in self._leased}
+        if leased:
+            self.db.release_leases(self.owner, list(leased))
+            self._leased.difference_update(leased)
+            
+        self.db.add_to_queue([
+            (puuid, self.region, -neg_priority)
+            for neg_priority, _, puuid in entries
+            if puuid not in leased
+        ])
+        self._spilled += len(entries)
@@ -0,0 +1,158 @@
+"""
+On-disk HTTP Response Cache.
+
+Caches JSON responses of slowly changing endpoints (DDragon versions, the
+apex league ladders) between crawler runs. Each entry is fresh for its TTL
+and served without any request; after that it is revalidated with
+If-None-Match / If-Modified-Since when the server sent validators, so an
+unchanged resource costs a 304 instead of a full download.
+
+Entries are plain JSON files named by a hash of the URL and query
+parameters. The API key is deliberately not part of the cache key: these
+responses are the same for every key.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedResponse:
+    """A cached JSON body with its validators."""
+    url: str
+    body: Any
+    stored_at: float
+    ttl: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    
+    @property
+    def fresh(self) -> bool:
+        """Whether the entry may be used without asking the server."""
+        return time.time() - self.stored_at < self.ttl
+    
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers for revalidating this entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    TTL + ETag cache of JSON responses, kept in memory and on disk.
+    
+    Shared by all region crawlers of a process; a missing or corrupt file is
+    simply a cache miss.
+    """
+    
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else Path("data/http_cache")
+        self._entries: Dict[str, CachedResponse] = {}
+    
+    @classmethod
+    def from_config(cls, cfg) -> "ResponseCache":
+        """Build a cache from a CrawlerConfig."""
+        return cls(cache_dir=cfg.http_cache_dir)
+    
+    @staticmethod
+    def cache_key(url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+        """Stable key for a URL and its query parameters."""
+        query = "&".join(f"{k}={params[k]}" for k in sorted(params or {}))
+        return hashlib.sha1(f"{url}?{query}".encode()).hexdigest()
+    
+    def get(
+        self,
+        url: str,
+        params: Optional[Mapping[str, Any]] = None
+    ) -> Optional[CachedResponse]:
+        """
+        Look up a response, fresh or stale.
+        
+        Returns: The cached entry, or None if nothing is cached
+        """
+        key = self.cache_key(url, params)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._load(key)
+            if entry is not None:
+                self._entries[key] = entry
+        return entry
+    
+    def store(
+        self,
+        url: str,
+        params: Optional[Mapping[str, Any]],
+        body: Any,
+        headers: Mapping[str, str],
+        ttl: float
+    ) -> CachedResponse:
+        """Cache a 200 response together with its ETag / Last-Modified."""
+        entry = CachedResponse(
+            url=url,
+            body=body,
+            stored_at=time.time(),
+            ttl=ttl,
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified")
+        )
+        key = self.cache_key(url, params)
+        self._entries[key] = entry
+        self._save(key, entry)
+        return entry
+    
+    def refresh(
+        self,
+        entry: CachedResponse,
+        params: Optional[Mapping[str, Any]],
+        headers: Mapping[str, str],
+        ttl: float
+    ) -> CachedResponse:
+        """Restart an entry's TTL after a 304 Not Modified."""
+        entry.stored_at = time.time()
+        entry.ttl = ttl
+        entry.etag = headers.get("ETag", entry.etag)
+        entry.last_modified = headers.get("Last-Modified", entry.last_modified)
+        self._save(self.cache_key(entry.url, params), entry)
+        return entry
+    
+    def clear(self) -> None:
+        """Drop every cached response."""
+        self._entries.clear()
+        if self.cache_dir.exists():
+            for path in self.cache_dir.glob("*.json"):
+                path.unlink(missing_ok=True)
+    
+    def _load(self, key: str) -> Optional[CachedResponse]:
+        path = self.cache_dir / f"{key}.json"
+        if not path.exists():
+            return None
+            
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return CachedResponse(**json.load(f))
+        except (OSError, ValueError, TypeError) as e:
+            logger.debug(f"Ignoring unreadable cache entry {path}: {e}")
+            return None
+    
+    def _save(self, key: str, entry: CachedResponse) -> None:
+        path = self.cache_dir / f"{key}.json"
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(asdict(entry), f)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Failed to write cache entry {path}: {e}")
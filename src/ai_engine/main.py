@@ -8,6 +8,8 @@ Usage:
     python main.py --mode predict --blue "1,2,3,4,5" --red "6,7,8,9,10"
     python main.py --mode stats
     python main.py --mode clean --keep-version 14.24
+    python main.py --mode migrate
+    python main.py --mode benchmark --max-players 200
 """
 
 import argparse
@@ -23,7 +25,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from src.ai_engine.config import config, initialize_config
 from src.ai_engine.database import get_database, MatchDatabase
-from src.ai_engine.crawler import MatchCrawler, main_crawl
+from src.ai_engine.crawler import MatchCrawler, MultiRegionCrawler, main_crawl
+from src.ai_engine.mock_riot import MockRiotConfig, run_benchmark
 from src.ai_engine.train import train_model
 from src.ai_engine.model import (
     MetaAwarePredictor, 
@@ -53,11 +56,13 @@ async def cmd_crawl(args: argparse.Namespace) -> int:
     """Run the crawler."""
     logger.info(f"Starting crawler for region: {args.region}")
     
-    if not config.crawler.api_key:
+    if not config.crawler.get_api_keys():
         if args.api_key:
             config.crawler.api_key = args.api_key
         else:
-            logger.error("Riot API key required. Set RIOT_API_KEY env var or use --api-key")
+            logger.error(
+                "Riot API key required. Set RIOT_API_KEY / RIOT_API_KEYS env vars or use --api-key"
+            )
             return 1
     
     try:
@@ -97,7 +102,9 @@ def cmd_train(args: argparse.Namespace) -> int:
             batch_size=args.batch_size,
             learning_rate=args.learning_rate,
             use_items=args.use_items,
-            max_samples=args.max_samples
+            max_samples=args.max_samples,
+            use_snapshot=not args.no_snapshot,
+            streaming=args.streaming
         )
         
         logger.info(f"Training complete!")
@@ -175,6 +182,9 @@ def cmd_stats(args: argparse.Namespace) -> int:
     print(f"Total Matches: {stats['total_matches']:,}")
     print(f"Total Players: {stats['total_players']:,}")
     print(f"Queue Size:    {stats['queue_size']:,}")
+    print(f"Archived JSON: {stats['archived_matches']:,}")
+    if stats.get('partitions'):
+        print(f"Partitions:    {', '.join(stats['partitions'])}")
     
     print(f"\nMatches by Patch:")
     for patch, count in stats.get('patches', {}).items():
@@ -210,6 +220,36 @@ def cmd_clean(args: argparse.Namespace) -> int:
     return 0
 
 
+def cmd_migrate(args: argparse.Namespace) -> int:
+    """
+    Convert legacy JSON composition columns to packed integer storage and,
+    with partitioning enabled, move matches into their patch partitions.
+    """
+    db = get_database()
+    db_path = Path(db.db_path)
+    size_before = db_path.stat().st_size if db_path.exists() else 0
+    
+    try:
+        migrated = db.migrate_packed_storage()
+        partitioned = db.migrate_to_partitions()
+    except Exception as e:
+        logger.error(f"Migration failed: {e}")
+        return 1
+        
+    size_after = db_path.stat().st_size if db_path.exists() else 0
+    
+    print(f"\n{'='*50}")
+    print(f"Packed Storage Migration")
+    print(f"{'='*50}")
+    print(f"Matches migrated: {migrated:,}")
+    if db.config.partition_by_patch:
+        print(f"Moved to patches: {partitioned:,} ({', '.join(db.list_partitions()) or 'none'})")
+    print(f"Database size:    {size_before / 1e6:.1f} MB -> {size_after / 1e6:.1f} MB")
+    print(f"{'='*50}")
+    
+    return 0
+
+
 def cmd_info(args: argparse.Namespace) -> int:
     """Show system information."""
     print(f"\n{'='*50}")
@@ -250,17 +290,65 @@ async def cmd_continuous_crawl(args: argparse.Namespace) -> int:
     """Run continuous multi-region crawler."""
     logger.info(f"Starting continuous crawler for regions: {args.regions}")
     
-    if not config.crawler.api_key:
+    if not config.crawler.get_api_keys():
         if args.api_key:
             config.crawler.api_key = args.api_key
         else:
             logger.error("Riot API key required.")
             return 1
     
-    regions = [r.strip() for r in args.regions.split(",")]
+    if args.regions == "all":
+        regions = list(config.crawler.regions)
+    else:
+        regions = [r.strip() for r in args.regions.split(",")]
+    
+    if args.parallel:
+        # One crawler per region, rate-limited per routing cluster/platform
+        await MultiRegionCrawler(regions=regions).run(batch_size=args.batch_size)
+    else:
+        crawler = MatchCrawler()
+        await crawler.run_continuous(regions=regions, batch_size=args.batch_size)
+    
+    return 0
+
+
+async def cmd_benchmark(args: argparse.Namespace) -> int:
+    """Benchmark the crawler against the local mock Riot API."""
+    mock_config = MockRiotConfig(
+        latency_ms=args.latency_ms,
+        inject_429_rate=args.inject_429,
+        inject_5xx_rate=args.inject_5xx,
+        replay_dir=Path(args.replay_dir) if args.replay_dir else None
+    )
     
-    crawler = MatchCrawler()
-    await crawler.run_continuous(regions=regions, batch_size=args.batch_size)
+    try:
+        result = await run_benchmark(
+            region=args.region,
+            max_players=args.max_players,
+            max_matches=args.max_matches,
+            mock_config=mock_config,
+            num_keys=args.mock_keys
+        )
+    except Exception as e:
+        logger.error(f"Benchmark failed: {e}")
+        return 1
+        
+    if args.json:
+        print(json.dumps(result.to_dict()))
+        return 0
+        
+    print(f"\n{'='*50}")
+    print(f"Crawler Benchmark (mock Riot API)")
+    print(f"{'='*50}")
+    print(f"Latency:          {args.latency_ms:.0f} ms, {args.mock_keys} key(s)")
+    print(f"Players Crawled:  {result.players_crawled:,}")
+    print(f"Matches Stored:   {result.matches_stored:,}")
+    print(f"Elapsed:          {result.elapsed_seconds:.2f}s")
+    print(f"Matches/sec:      {result.matches_per_second:.2f}")
+    print(f"Requests/match:   {result.requests_per_match:.2f}")
+    print(f"429 Rate:         {result.rate_limited_pct:.2f}% ({result.rate_limited:,} of {result.requests:,})")
+    print(f"Errors:           {result.errors:,}")
+    print(f"{'='*50}")
     
     return 0
 
@@ -281,11 +369,20 @@ Examples:
   # Predict match outcome
   python main.py --mode predict --blue "1,2,3,4,5" --red "6,7,8,9,10"
   
+  # Crawl every configured region concurrently
+  python main.py --mode continuous --regions all --parallel
+  
   # Show database stats
   python main.py --mode stats
   
   # Clean old patch data
   python main.py --mode clean --keep-version 14.24
+  
+  # Convert JSON composition columns to packed storage
+  python main.py --mode migrate
+  
+  # Measure crawler throughput offline against the mock Riot API
+  python main.py --mode benchmark --max-players 200 --latency-ms 50 --inject-429 0.01
         """
     )
     
@@ -293,7 +390,7 @@ Examples:
         "--mode", "-m",
         type=str,
         required=True,
-        choices=["crawl", "train", "predict", "stats", "clean", "info", "continuous"],
+        choices=["crawl", "train", "predict", "stats", "clean", "info", "continuous", "migrate", "benchmark"],
         help="Operation mode"
     )
     parser.add_argument("--verbose", "-v", action="store_true", help="Verbose logging")
@@ -301,7 +398,8 @@ Examples:
     
     # Crawler args
     parser.add_argument("--region", type=str, default="tr1", help="Region code")
-    parser.add_argument("--regions", type=str, default="tr1,euw1", help="Comma-separated regions for continuous mode")
+    parser.add_argument("--regions", type=str, default="tr1,euw1", help="Comma-separated regions for continuous mode ('all' for every configured region)")
+    parser.add_argument("--parallel", action="store_true", help="Crawl all continuous-mode regions concurrently")
     parser.add_argument("--max-matches", type=int, default=10000, help="Max matches to crawl")
     parser.add_argument("--max-players", type=int, default=500, help="Max players to crawl")
     
@@ -312,6 +410,8 @@ Examples:
     parser.add_argument("--learning-rate", "--lr", type=float, default=1e-3, help="Learning rate")
     parser.add_argument("--use-items", action="store_true", help="Include item data")
     parser.add_argument("--max-samples", type=int, default=None, help="Max training samples")
+    parser.add_argument("--no-snapshot", action="store_true", help="Query rows per sample instead of a tensor snapshot")
+    parser.add_argument("--streaming", action="store_true", help="Stream training data from SQLite (patches larger than RAM)")
     
     # Prediction args
     parser.add_argument("--blue", type=str, help="Blue team champion IDs (comma-separated)")
@@ -320,6 +420,14 @@ Examples:
     # Clean args
     parser.add_argument("--keep-version", type=str, help="Version to keep when cleaning")
     
+    # Benchmark args (also uses --region, --max-players, --max-matches)
+    parser.add_argument("--latency-ms", type=float, default=30.0, help="Mock API response latency")
+    parser.add_argument("--inject-429", type=float, default=0.0, help="Fraction of mock requests answered with a service 429")
+    parser.add_argument("--inject-5xx", type=float, default=0.0, help="Fraction of mock requests answered with a 503")
+    parser.add_argument("--mock-keys", type=int, default=1, help="Number of fake API keys in the crawler's key pool")
+    parser.add_argument("--replay-dir", type=str, default=None, help="Directory of recorded responses to serve")
+    parser.add_argument("--json", action="store_true", help="Print the benchmark result as JSON")
+    
     args = parser.parse_args()
     
     # Setup
@@ -341,6 +449,10 @@ Examples:
         return cmd_clean(args)
     elif args.mode == "info":
         return cmd_info(args)
+    elif args.mode == "migrate":
+        return cmd_migrate(args)
+    elif args.mode == "benchmark":
+        return asyncio.run(cmd_benchmark(args))
     else:
         parser.print_help()
         return 1
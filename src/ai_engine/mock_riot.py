@@ -0,0 +1,492 @@
+"""
+Local Mock Riot API for Offline Crawler Benchmarks.
+
+Serves every endpoint MatchCrawler uses (DDragon versions, league-v4 apex
+ladders, summoner-v4, match-v5 ids and details) from a deterministic
+synthetic world, with configurable latency, Riot-style rate-limit headers,
+enforced application/method limits and injected 429/5xx responses.
+
+Recorded responses take precedence over synthetic ones when a replay
+directory is given:
+    matches/{match_id}.json     match-v5 match
+    ids/{puuid}.json            match-v5 match IDs of a player
+    league/{kind}.json          league-v4 ladder (challengerleagues, ...)
+
+run_benchmark() crawls the mock into a scratch database and reports
+matches/sec, requests/match and the 429 rate.
+"""
+
+import asyncio
+import dataclasses
+import json
+import logging
+import random
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+from .config import config
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MockRiotConfig:
+    """Mock server settings."""
+    
+    # Synthetic world
+    num_players: int = 20000
+    num_matches: int = 200000
+    current_version: str = "14.24.1"
+    old_patch_rate: float = 0.2  # Fraction of matches on the previous patch
+    seed: int = 0
+    replay_dir: Optional[Path] = None
+    
+    # Network behaviour
+    latency_ms: float = 30.0
+    latency_jitter_ms: float = 10.0
+    
+    # Rate limits enforced per API key and host (Riot header format)
+    app_rate_limit: str = "500:10,30000:600"
+    method_rate_limits: Dict[str, str] = field(default_factory=lambda: {
+        "match-v5.ids": "2000:10",
+        "match-v5.match": "2000:10",
+        "league-v4.league": "30:10",
+        "summoner-v4.summoner": "1600:60"
+    })
+    
+    # Fault injection (probability per API request)
+    inject_429_rate: float = 0.0  # Service-level 429s without Retry-After
+    inject_5xx_rate: float = 0.0
+
+
+@dataclass
+class MockStats:
+    """What the mock server saw and answered."""
+    requests: int = 0  # Riot API requests (DDragon excluded)
+    by_method: Counter = field(default_factory=Counter)
+    by_status: Counter = field(default_factory=Counter)
+    
+    @property
+    def rate_limited(self) -> int:
+        return self.by_status[429]
+
+
+def _parse_limits(header: str) -> List[Tuple[int, int]]:
+    """'500:10,30000:600' -> [(500, 10), (30000, 600)]"""
+    limits = []
+    for part in header.split(","):
+        if ":" in part:
+            count, seconds = part.split(":", 1)
+            limits.append((int(count), int(seconds)))
+    return limits
+
+
+class _FixedWindows:
+    """Riot-style fixed windows: each starts with its first request."""
+    
+    def __init__(self, limits: List[Tuple[int, int]]):
+        self.limits = limits
+        self._starts = [0.0] * len(limits)
+        self._counts = [0] * len(limits)
+    
+    def hit(self, now: float) -> Optional[float]:
+        """
+        Count a request.
+        
+        Returns: None if allowed, else seconds until the full window resets
+        """
+        for i, (_, seconds) in enumerate(self.limits):
+            if now - self._starts[i] >= seconds:
+                self._starts[i] = now
+                self._counts[i] = 0
+                
+        retry_after = max(
+            (
+                self._starts[i] + seconds - now
+                for i, (count, seconds) in enumerate(self.limits)
+                if self._counts[i] >= count
+            ),
+            default=None
+        )
+        if retry_after is not None:
+            return retry_after
+            
+        for i in range(len(self.limits)):
+            self._counts[i] += 1
+        return None
+    
+    def counts_header(self) -> str:
+        return ",".join(
+            f"{self._counts[i]}:{seconds}" for i, (_, seconds) in enumerate(self.limits)
+        )
+
+
+class MockRiotServer:
+    """
+    aiohttp server impersonating the Riot API and DDragon.
+    
+    Riot endpoints live under /{host}/..., so CrawlerConfig.api_base_url can
+    be set to `server.api_base_url` ("http://127.0.0.1:PORT/{host}").
+    """
+    
+    TIERS = {
+        "challengerleagues": ("CHALLENGER", 0.015),
+        "grandmasterleagues": ("GRANDMASTER", 0.035),
+        "masterleagues": ("MASTER", 0.1)
+    }
+    
+    # Synthetic timeline: the current patch went live at PATCH_START
+    PATCH_START = 1_700_000_000_000
+    DAY_MS = 86_400_000
+    
+    def __init__(
+        self,
+        mock_config: Optional[MockRiotConfig] = None,
+        host: str = "127.0.0.1",
+        port: int = 0
+    ):
+        self.config = mock_config or MockRiotConfig()
+        self.host = host
+        self.port = port
+        self.stats = MockStats()
+        
+        self._runner: Optional[web.AppRunner] = None
+        self._rng = random.Random(self.config.seed)
+        self._app_windows: Dict[Tuple[str, str], _FixedWindows] = {}
+        self._method_windows: Dict[Tuple[str, str, str], _FixedWindows] = {}
+        
+        major, minor = self.config.current_version.split(".")[:2]
+        self._patches = (f"{major}.{minor}", f"{major}.{int(minor) - 1}")
+    
+    @property
+    def api_base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/{{host}}"
+    
+    @property
+    def ddragon_base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/ddragon"
+    
+    async def start(self) -> "MockRiotServer":
+        """Start listening; a port of 0 picks a free one."""
+        app = web.Application(middlewares=[self._riot_middleware])
+        app.router.add_get("/ddragon/api/versions.json", self._versions)
+        app.router.add_get("/{host}/lol/league/v4/{kind}/by-queue/{queue}", self._league)
+        app.router.add_get("/{host}/lol/summoner/v4/summoners/{summoner_id}", self._summoner)
+        app.router.add_get("/{host}/lol/match/v5/matches/by-puuid/{puuid}/ids", self._match_ids)
+        app.router.add_get("/{host}/lol/match/v5/matches/{match_id}", self._match)
+        
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        self.port = self._runner.addresses[0][1]
+        
+        logger.info(f"Mock Riot API listening on http://{self.host}:{self.port}")
+        return self
+    
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+            
+    # ==================== REQUEST PIPELINE ====================
+    
+    @staticmethod
+    def _method_name(path: str) -> str:
+        if "/league/" in path:
+            return "league-v4.league"
+        if "/summoner/" in path:
+            return "summoner-v4.summoner"
+        if "/by-puuid/" in path:
+            return "match-v5.ids"
+        return "match-v5.match"
+    
+    @web.middleware
+    async def _riot_middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        if request.path.startswith("/ddragon/"):
+            return await handler(request)
+            
+        method = self._method_name(request.path)
+        self.stats.requests += 1
+        self.stats.by_method[method] += 1
+        
+        response = await self._answer(request, handler, method)
+        self.stats.by_status[response.status] += 1
+        return response
+    
+    async def _answer(self, request: web.Request, handler, method: str) -> web.StreamResponse:
+        cfg = self.config
+        key = request.headers.get("X-Riot-Token")
+        if not key:
+            return web.Response(status=401)
+            
+        latency = cfg.latency_ms + self._rng.uniform(-1, 1) * cfg.latency_jitter_ms
+        if latency > 0:
+            await asyncio.sleep(latency / 1000)
+            
+        roll = self._rng.random()
+        if roll < cfg.inject_5xx_rate:
+            return web.Response(status=503)
+        if roll < cfg.inject_5xx_rate + cfg.inject_429_rate:
+            return web.Response(status=429, headers={"X-Rate-Limit-Type": "service"})
+            
+        # Enforce application limits, then the method's limits
+        host = request.match_info.get("host", "")
+        app = self._app_windows.setdefault(
+            (key, host), _FixedWindows(_parse_limits(cfg.app_rate_limit))
+        )
+        method_limit = cfg.method_rate_limits.get(method, "")
+        meth = self._method_windows.setdefault(
+            (key, host, method), _FixedWindows(_parse_limits(method_limit))
+        )
+        headers = {"X-App-Rate-Limit": cfg.app_rate_limit}
+        if method_limit:
+            headers["X-Method-Rate-Limit"] = method_limit
+            
+        now = time.monotonic()
+        for limit_type, windows in (("application", app), ("method", meth)):
+            retry_after = windows.hit(now)
+            if retry_after is not None:
+                headers.update(self._count_headers(app, meth))
+                headers["X-Rate-Limit-Type"] = limit_type
+                headers["Retry-After"] = str(max(1, int(retry_after + 0.999)))
+                return web.Response(status=429, headers=headers)
+                
+        response = await handler(request)
+        response.headers.update(headers)
+        response.headers.update(self._count_headers(app, meth))
+        return response
+    
+    @staticmethod
+    def _count_headers(app: _FixedWindows, meth: _FixedWindows) -> Dict[str, str]:
+        headers = {"X-App-Rate-Limit-Count": app.counts_header()}
+        if meth.limits:
+            headers["X-Method-Rate-Limit-Count"] = meth.counts_header()
+        return headers
+    
+    def _replay(self, *parts: str) -> Optional[Any]:
+        """Recorded response for a path under replay_dir, if any."""
+        if self.config.replay_dir is None:
+            return None
+        path = Path(self.config.replay_dir).joinpath(*parts)
+        if not path.exists():
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+            
+    # ==================== SYNTHETIC WORLD ====================
+    
+    def _puuid(self, index: int) -> str:
+        return f"mock-puuid-{index:07d}"
+    
+    def _index(self, puuid: str) -> int:
+        try:
+            return int(puuid.rsplit("-", 1)[1])
+        except (IndexError, ValueError):
+            return abs(hash(puuid)) % self.config.num_players
+    
+    async def _versions(self, request: web.Request) -> web.Response:
+        major, minor = self._patches[1].split(".")
+        return web.json_response([self.config.current_version, f"{major}.{minor}.1"])
+    
+    async def _league(self, request: web.Request) -> web.Response:
+        kind = request.match_info["kind"]
+        recorded = self._replay("league", f"{kind}.json")
+        if recorded is not None:
+            return web.json_response(recorded)
+            
+        tier, share = self.TIERS.get(kind, ("MASTER", 0.1))
+        # Ladders are consecutive slices of the player list, best first
+        offset = 0
+        for other, (_, other_share) in self.TIERS.items():
+            if other == kind:
+                break
+            offset += int(self.config.num_players * other_share)
+        size = int(self.config.num_players * share)
+        
+        entries = [
+            {
+                "puuid": self._puuid(i),
+                "summonerId": f"mock-summoner-{i:07d}",
+                "rank": "I",
+                "leaguePoints": max(0, 2000 - (i - offset))
+            }
+            for i in range(offset, min(offset + size, self.config.num_players))
+        ]
+        return web.json_response({"tier": tier, "queue": request.match_info["queue"], "entries": entries})
+    
+    async def _summoner(self, request: web.Request) -> web.Response:
+        summoner_id = request.match_info["summoner_id"]
+        return web.json_response({"id": summoner_id, "puuid": self._puuid(self._index(summoner_id))})
+    
+    async def _match_ids(self, request: web.Request) -> web.Response:
+        puuid = request.match_info["puuid"]
+        recorded = self._replay("ids", f"{puuid}.json")
+        if recorded is not None:
+            return web.json_response(recorded)
+            
+        start = int(request.query.get("start", 0))
+        count = min(int(request.query.get("count", 20)), 100)
+        start_time = int(request.query.get("startTime", 0)) * 1000
+        rng = random.Random(f"{self.config.seed}:{puuid}")
+        
+        # A player's history is finite; startTime hides the games before it
+        ids = []
+        for _ in range(start + count):
+            match_id = f"MOCK_{rng.randrange(self.config.num_matches)}"
+            if self._match_meta(match_id)[1] >= start_time:
+                ids.append(match_id)
+        return web.json_response(ids[start:])
+    
+    async def _match(self, request: web.Request) -> web.Response:
+        match_id = request.match_info["match_id"]
+        recorded = self._replay("matches", f"{match_id}.json")
+        if recorded is not None:
+            return web.json_response(recorded)
+        return web.json_response(self._synthetic_match(match_id))
+    
+    def _match_meta(self, match_id: str) -> Tuple[str, int]:
+        """Patch and gameCreation (ms) of a synthetic match; old patches end at PATCH_START."""
+        rng = random.Random(f"{self.config.seed}:{match_id}:meta")
+        if rng.random() < self.config.old_patch_rate:
+            return self._patches[1], self.PATCH_START - rng.randrange(1, 14 * self.DAY_MS)
+        return self._patches[0], self.PATCH_START + rng.randrange(14 * self.DAY_MS)
+    
+    def _synthetic_match(self, match_id: str) -> Dict[str, Any]:
+        rng = random.Random(f"{self.config.seed}:{match_id}")
+        patch, created = self._match_meta(match_id)
+        players = [self._puuid(i) for i in rng.sample(range(self.config.num_players), 10)]
+        champions = rng.sample(range(1, 170), 10)
+        blue_win = rng.random() < 0.5
+        
+        participants = [
+            {
+                "puuid": puuid,
+                "championId": champions[i],
+                "teamId": 100 if i < 5 else 200,
+                "win": (i < 5) == blue_win,
+                **{f"item{slot}": rng.randrange(1000, 8000) for slot in range(7)}
+            }
+            for i, puuid in enumerate(players)
+        ]
+        return {
+            "metadata": {"matchId": match_id, "participants": players},
+            "info": {
+                "gameVersion": f"{patch}.{rng.randrange(100, 700)}.{rng.randrange(1000, 9999)}",
+                "gameMode": "CLASSIC",
+                "queueId": 420,
+                "gameDuration": rng.randrange(900, 2700),
+                "gameCreation": created,
+                "participants": participants
+            }
+        }
+        
+        
+# ==================== BENCHMARK ====================
+
+@dataclass
+class BenchmarkResult:
+    """Throughput of one crawler run against the mock server."""
+    elapsed_seconds: float
+    matches_stored: int
+    players_crawled: int
+    requests: int
+    rate_limited: int
+    errors: int
+    
+    @property
+    def matches_per_second(self) -> float:
+        return self.matches_stored / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+    
+    @property
+    def requests_per_match(self) -> float:
+        return self.requests / self.matches_stored if self.matches_stored else 0.0
+    
+    @property
+    def rate_limited_pct(self) -> float:
+        return 100.0 * self.rate_limited / self.requests if self.requests else 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "elapsedSeconds": round(self.elapsed_seconds, 3),
+            "matchesStored": self.matches_stored,
+            "playersCrawled": self.players_crawled,
+            "requests": self.requests,
+            "rateLimited": self.rate_limited,
+            "errors": self.errors,
+            "matchesPerSecond": round(self.matches_per_second, 2),
+            "requestsPerMatch": round(self.requests_per_match, 3),
+            "rateLimitedPct": round(self.rate_limited_pct, 2)
+        }
+
+
+async def run_benchmark(
+    region: str = "tr1",
+    max_players: Optional[int] = 200,
+    max_matches: Optional[int] = None,
+    mock_config: Optional[MockRiotConfig] = None,
+    num_keys: int = 1,
+    work_dir: Optional[Path] = None
+) -> BenchmarkResult:
+    """
+    Crawl a fresh mock world and measure throughput.
+    
+    Everything the crawler persists (database, seen-index, HTTP cache) goes
+    to a scratch directory. The database singleton is pointed there too, so
+    call this from its own process (as `main.py --mode benchmark` does).
+    
+    Args:
+        region: Platform to crawl
+        max_players: Stop after crawling this many players
+        max_matches: Stop after storing this many matches
+        mock_config: Mock server settings
+        num_keys: Number of (fake) API keys in the crawler's key pool
+        work_dir: Scratch directory (a temporary one if None)
+    """
+    from .crawler import MatchCrawler
+    from .database import get_database
+    
+    server = await MockRiotServer(mock_config).start()
+    scratch = tempfile.TemporaryDirectory(prefix="ai_engine_bench_") if work_dir is None else None
+    root = Path(scratch.name) if scratch else Path(work_dir)
+    
+    try:
+        config.database.db_path = root / "benchmark.db"
+        if Path(get_database().db_path) != config.database.db_path:
+            raise RuntimeError("run_benchmark() must run before the database is opened")
+            
+        keys = [f"mock-key-{i}" for i in range(max(1, num_keys))]
+        crawler_config = dataclasses.replace(
+            config.crawler,
+            api_base_url=server.api_base_url,
+            ddragon_base_url=server.ddragon_base_url,
+            api_key=keys[0],
+            api_keys=keys[1:],
+            seen_index_dir=root / "seen_index",
+            http_cache_dir=root / "http_cache"
+        )
+        
+        crawler = MatchCrawler(crawler_config)
+        started = time.perf_counter()
+        stats = await crawler.run(region, max_matches=max_matches, max_players=max_players)
+        elapsed = time.perf_counter() - started
+        
+        return BenchmarkResult(
+            elapsed_seconds=elapsed,
+            matches_stored=stats.matches_stored,
+            players_crawled=stats.players_crawled,
+            requests=server.stats.requests,
+            rate_limited=server.stats.rate_limited,
+            errors=stats.errors
+        )
+        
+    finally:
+        await server.stop()
+        get_database().close()
+        if scratch is not None:
+            scratch.cleanup()
@@ -12,6 +12,7 @@ import torch
 import torch.nn as nn
 import torch.nn.functional as F
 from typing import Optional, Tuple, List, Dict
+from collections import OrderedDict
 import logging
 
 from .config import config, ModelConfig
@@ -126,8 +127,29 @@ class TeamEncoder(nn.Module):
         Returns:
             team_vector: (batch_size, hidden_dim)
         """
-        # Compute attention weights
+        # Compute attention scores
         attn_scores = self.attention(champion_embeddings)  # (batch, 5, 1)
+        
+        return self.pool(champion_embeddings, attn_scores)
+    
+    def pool(
+        self, 
+        champion_embeddings: torch.Tensor, 
+        attn_scores: torch.Tensor
+    ) -> torch.Tensor:
+        """
+        Pool champion embeddings using precomputed attention scores.
+        
+        Split out of forward() so cached per-champion scores can be reused
+        during incremental draft evaluation.
+        
+        Args:
+            champion_embeddings: (batch_size, 5, embedding_dim)
+            attn_scores: (batch_size, 5, 1) unnormalized attention scores
+            
+        Returns:
+            team_vector: (batch_size, hidden_dim)
+        """
         attn_weights = F.softmax(attn_scores, dim=1)  # (batch, 5, 1)
         
         # Weighted sum of embeddings
@@ -235,6 +257,23 @@ class MetaAwarePredictor(nn.Module):
         blue_vector = self.blue_encoder(blue_embeds)  # (batch, hidden/2)
         red_vector = self.red_encoder(red_embeds)     # (batch, hidden/2)
         
+        return self.head(blue_vector, red_vector)
+    
+    def head(
+        self, 
+        blue_vector: torch.Tensor, 
+        red_vector: torch.Tensor
+    ) -> torch.Tensor:
+        """
+        Classify a pair of encoded teams.
+        
+        Args:
+            blue_vector: (batch_size, hidden/2) encoded blue team
+            red_vector: (batch_size, hidden/2) encoded red team
+            
+        Returns:
+            win_prob: (batch_size, 1) - Probability that blue team wins
+        """
         # Compute interaction features
         interaction = blue_vector * red_vector  # Element-wise
         
@@ -385,6 +424,147 @@ class MetaAwarePredictorWithItems(MetaAwarePredictor):
         return torch.sigmoid(logits)
 
 
+class IncrementalDraftEncoder:
+    """
+    Cached inference path for live draft evaluation.
+    
+    Between two draft calls only one slot changes, so re-embedding and
+    re-encoding both teams for every candidate is wasted work. This keeps:
+    
+    1. Per-champion tables: embedding and attention score for every
+       champion ID, per encoder (attention scores are context-free)
+    2. Encoded vectors of the opposing team, keyed by composition
+    3. Embeddings/scores of the picking team's partial composition
+    
+    Evaluating N candidates then only gathers table rows, recomputes the
+    attention softmax + team MLP for the picking side and runs the classifier.
+    
+    Call clear() whenever the underlying model weights change.
+    """
+    
+    def __init__(self, model: MetaAwarePredictor, max_cache_entries: int = 256):
+        self.model = model
+        self.max_cache_entries = max_cache_entries
+        
+        # side -> (embeddings (C+1, E), attention scores (C+1, 1))
+        self._tables: Dict[str, Tuple[torch.Tensor, torch.Tensor]] = {}
+        
+        # (side, composition) -> (1, hidden) encoded team vector
+        self._team_vectors: "OrderedDict[Tuple[str, Tuple[int, ...]], torch.Tensor]" = OrderedDict()
+        
+        # (side, composition) -> ((5, E) embeddings, (5, 1) attention scores)
+        self._partials: "OrderedDict[Tuple[str, Tuple[int, ...]], Tuple[torch.Tensor, torch.Tensor]]" = OrderedDict()
+        
+    @property
+    def device(self) -> torch.device:
+        return next(self.model.parameters()).device
+    
+    def clear(self) -> None:
+        """Drop all cached tables and team encodings."""
+        self._tables.clear()
+        self._team_vectors.clear()
+        self._partials.clear()
+        
+    def _encoder(self, side: str) -> TeamEncoder:
+        return self.model.blue_encoder if side == "blue" else self.model.red_encoder
+    
+    def _remember(self, cache: OrderedDict, key, value) -> None:
+        """Insert into an LRU cache, evicting the oldest entry when full."""
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > self.max_cache_entries:
+            cache.popitem(last=False)
+    
+    def _table(self, side: str) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Per-champion (embedding, attention score) lookup tables for one side."""
+        if side not in self._tables:
+            embeddings = self.model.champion_embedding.embedding.weight
+            scores = self._encoder(side).attention(embeddings)  # (C+1, 1)
+            self._tables[side] = (embeddings, scores)
+        return self._tables[side]
+    
+    def _partial(self, side: str, team: List[int]) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Embeddings and attention scores of a (partial) composition."""
+        key = (side, tuple(team))
+        if key in self._partials:
+            self._partials.move_to_end(key)
+            return self._partials[key]
+            
+        embeddings, scores = self._table(side)
+        ids = torch.tensor(team, dtype=torch.long, device=self.device)
+        value = (embeddings[ids], scores[ids])  # (5, E), (5, 1)
+        self._remember(self._partials, key, value)
+        return value
+    
+    def encode_team(self, side: str, team: List[int]) -> torch.Tensor:
+        """Encoded (1, hidden) vector for a composition, cached by composition."""
+        key = (side, tuple(team))
+        if key in self._team_vectors:
+            self._team_vectors.move_to_end(key)
+            return self._team_vectors[key]
+            
+        embeds, scores = self._partial(side, team)
+        vector = self._encoder(side).pool(embeds.unsqueeze(0), scores.unsqueeze(0))
+        self._remember(self._team_vectors, key, vector)
+        return vector
+    
+    def score_candidates(
+        self,
+        blue_team: List[int],
+        red_team: List[int],
+        pick_slot: str,
+        candidates: List[int]
+    ) -> torch.Tensor:
+        """
+        Blue team win probability for each candidate filling the picking team.
+        
+        The candidate takes the first unpicked (zero) slot of the picking team;
+        if the team is already full every candidate scores the same composition.
+        
+        Args:
+            blue_team: Current blue team (may have zeros for unpicked)
+            red_team: Current red team (may have zeros for unpicked)
+            pick_slot: Which team is picking ("blue" or "red")
+            candidates: Champion IDs to evaluate
+            
+        Returns:
+            (N,) blue team win probabilities on the CPU
+        """
+        self.model.eval()
+        with torch.no_grad():
+            picking_side = "blue" if pick_slot == "blue" else "red"
+            fixed_side = "red" if picking_side == "blue" else "blue"
+            picking_team = blue_team if picking_side == "blue" else red_team
+            fixed_team = red_team if picking_side == "blue" else blue_team
+            n = len(candidates)
+            
+            # Opposing team: encoded once per composition
+            fixed_vector = self.encode_team(fixed_side, fixed_team).expand(n, -1)
+            
+            # Picking team: only the open slot differs between candidates
+            if 0 in picking_team:
+                slot = picking_team.index(0)
+                embeds, scores = self._partial(picking_side, picking_team)
+                table_embeds, table_scores = self._table(picking_side)
+                ids = torch.tensor(candidates, dtype=torch.long, device=self.device)
+                
+                embeds = embeds.unsqueeze(0).repeat(n, 1, 1)  # (N, 5, E)
+                scores = scores.unsqueeze(0).repeat(n, 1, 1)  # (N, 5, 1)
+                embeds[:, slot] = table_embeds[ids]
+                scores[:, slot] = table_scores[ids]
+                
+                picking_vector = self._encoder(picking_side).pool(embeds, scores)
+            else:
+                picking_vector = self.encode_team(picking_side, picking_team).expand(n, -1)
+                
+            if picking_side == "blue":
+                probs = self.model.head(picking_vector, fixed_vector)
+            else:
+                probs = self.model.head(fixed_vector, picking_vector)
+                
+            return probs.view(-1).cpu()
+
+
 class EarlyStopping:
     """Early stopping callback to prevent overfitting."""
     
@@ -12,7 +12,7 @@ from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
 
 from .config import config
-from .model import MetaAwarePredictor, get_device, load_model
+from .model import MetaAwarePredictor, IncrementalDraftEncoder, get_device, load_model
 
 logger = logging.getLogger(__name__)
 
@@ -64,6 +64,7 @@ class MatchPredictor:
     def __init__(self, model_path: Optional[Path] = None):
         self.model_path = model_path or config.model.best_model_path
         self.model: Optional[MetaAwarePredictor] = None
+        self.draft_encoder: Optional[IncrementalDraftEncoder] = None
         self.device = get_device()
         self._loaded = False
         
@@ -84,6 +85,7 @@ class MatchPredictor:
         try:
             self.model, checkpoint = load_model(self.model_path, device=self.device)
             self.model.eval()
+            self.draft_encoder = IncrementalDraftEncoder(self.model)
             self._loaded = True
             
             logger.info(f"Model loaded successfully from {self.model_path}")
@@ -101,6 +103,7 @@ class MatchPredictor:
         if self.model:
             del self.model
             self.model = None
+            self.draft_encoder = None
             self._loaded = False
             
             # Clear CUDA cache if applicable
@@ -185,37 +188,40 @@ class MatchPredictor:
         if not self.is_ready():
             if not self.load():
                 return []
-                
-        results: List[Tuple[int, float]] = []
-        
-        for champ_id in candidate_champions:
-            # Create hypothetical team with this pick
-            if pick_slot == "blue":
-                # Find first zero slot
-                test_blue = blue_team.copy()
-                for i, c in enumerate(test_blue):
-                    if c == 0:
-                        test_blue[i] = champ_id
-                        break
-                test_red = red_team
-            else:
-                test_blue = blue_team
-                test_red = red_team.copy()
-                for i, c in enumerate(test_red):
-                    if c == 0:
-                        test_red[i] = champ_id
-                        break
-            
-            # Predict
-            result = self.predict(test_blue, test_red)
-            if result:
-                # For red team picks, we want lower blue win probability
-                prob = result.blue_win_probability if pick_slot == "blue" else result.red_win_probability
-                results.append((champ_id, prob))
-                
+
+        if not candidate_champions:
+            return []
+
+        # Validate input
+        if len(blue_team) != 5 or len(red_team) != 5:
+            logger.error("Each team must have exactly 5 champions")
+            return []
+
+        if self.draft_encoder is None or self.draft_encoder.model is not self.model:
+            self.draft_encoder = IncrementalDraftEncoder(self.model)
+
+        try:
+            # Opposing team encoding and picking team partials are cached
+            # between calls; each candidate fills the first unpicked slot
+            blue_probs = self.draft_encoder.score_candidates(
+                blue_team, red_team, pick_slot, candidate_champions
+            )
+
+            # For red team picks, we want lower blue win probability
+            probs = blue_probs if pick_slot == "blue" else 1 - blue_probs
+
+        except Exception as e:
+            logger.error(f"Batched pick scoring failed: {e}")
+            return []
+
+        results: List[Tuple[int, float]] = [
+            (champ_id, round(prob, 4))
+            for champ_id, prob in zip(candidate_champions, probs.tolist())
+        ]
+
         # Sort by probability (highest first)
         results.sort(key=lambda x: x[1], reverse=True)
-        
+
         return results
     
     def analyze_draft(
@@ -258,7 +264,7 @@ class MatchPredictor:
             if blue_empty > 0:
                 blue_picks = self.predict_with_pick(
                     blue_team, red_team, "blue", 
-                    available_champions[:20]  # Top 20 candidates
+                    available_champions  # Full pool, scored in one batch
                 )
                 if blue_picks:
                     recommendations.append({
@@ -273,7 +279,7 @@ class MatchPredictor:
             if red_empty > 0:
                 red_picks = self.predict_with_pick(
                     blue_team, red_team, "red",
-                    available_champions[:20]
+                    available_champions
                 )
                 if red_picks:
                     recommendations.append({
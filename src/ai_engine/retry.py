@@ -0,0 +1,230 @@
+"""
+Retries, Backoff and Circuit Breakers for the Crawler.
+
+- backoff_delay: exponential backoff with jitter, so clients that failed
+  together do not retry together.
+- CircuitBreaker: stops sending requests to an endpoint that keeps failing
+  (5xx, timeouts, service-level 429s) and lets a single probe through
+  once the reset timeout has passed.
+- RetryQueue: work that could not be done now (a match detail fetch, a
+  player's match listing) is rescheduled with backoff instead of dropped.
+"""
+
+import heapq
+import itertools
+import logging
+import random
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """
+    Delay before retry number `attempt` (0-based).
+    
+    Doubles per attempt up to `cap`, then picks a point in the upper half of
+    that range ("equal jitter"): never near zero, never synchronized.
+    """
+    delay = min(cap, base * (2 ** attempt))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def is_retryable(status: int) -> bool:
+    """Whether a _make_request status is a transient failure (0 = no response)."""
+    return status == 0 or status == 429 or status >= 500
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after `failure_threshold` consecutive failures; open ->
+    half-open after `reset_timeout` seconds, when one probe request is let
+    through. The probe's outcome closes the breaker or re-opens it; a probe
+    that ends without one (e.g. our own rate limit) must be released.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(
+        self,
+        name: str = "",
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0
+    ):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+    
+    def retry_after(self) -> float:
+        """Seconds until the breaker lets a request through (0 if it would now)."""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+    
+    def allow(self) -> bool:
+        """Whether a request may be sent now."""
+        if self.state == self.CLOSED:
+            return True
+            
+        if self.state == self.OPEN:
+            if self.retry_after() > 0:
+                return False
+            self.state = self.HALF_OPEN
+            self._probing = False
+            
+        # Half-open: exactly one probe at a time
+        if self._probing:
+            return False
+        self._probing = True
+        return True
+    
+    def release_probe(self) -> None:
+        """Give up a half-open probe that got no verdict, so another can go out."""
+        if self.state == self.HALF_OPEN:
+            self._probing = False
+    
+    def record_success(self) -> None:
+        if self.state != self.CLOSED:
+            logger.info(f"Circuit {self.name} closed")
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probing = False
+    
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == self.HALF_OPEN or (
+            self.state == self.CLOSED and self.failures >= self.failure_threshold
+        ):
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+            self._probing = False
+            logger.warning(
+                f"Circuit {self.name} opened after {self.failures} failures; "
+                f"pausing for {self.reset_timeout:.0f}s"
+            )
+
+
+class CircuitBreakerPool:
+    """One CircuitBreaker per (host, method) endpoint."""
+    
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+    
+    def get(self, host: str, method: str) -> CircuitBreaker:
+        """Get (or lazily create) the breaker for an endpoint."""
+        key = (host, method)
+        if key not in self._breakers:
+            self._breakers[key] = CircuitBreaker(
+                name=f"{method}@{host}",
+                failure_threshold=self.failure_threshold,
+                reset_timeout=self.reset_timeout
+            )
+        return self._breakers[key]
+    
+    @classmethod
+    def from_config(cls, cfg) -> "CircuitBreakerPool":
+        """Build a pool from a CrawlerConfig."""
+        return cls(
+            failure_threshold=cfg.breaker_failure_threshold,
+            reset_timeout=cfg.breaker_reset_seconds
+        )
+
+
+class RetryQueue:
+    """
+    Delayed retries of failed work items, earliest due first.
+    
+    Each item has a string key (match ID, PUUID) and an opaque payload.
+    Attempts are counted per key until forget() is called on success; an
+    item that failed max_attempts times is dropped.
+    """
+    
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 10.0,
+        max_delay: float = 300.0
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.dropped = 0
+        
+        # Min-heap of (due, seq, key, payload)
+        self._heap: List[Tuple[float, int, str, Any]] = []
+        self._seq = itertools.count()
+        self._queued: Set[str] = set()
+        self._attempts: Dict[str, int] = {}
+    
+    @classmethod
+    def from_config(cls, cfg) -> "RetryQueue":
+        """Build a queue from a CrawlerConfig."""
+        return cls(
+            max_attempts=cfg.retry_queue_attempts,
+            base_delay=cfg.retry_queue_delay
+        )
+    
+    def __len__(self) -> int:
+        return len(self._heap)
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._queued
+    
+    def schedule(self, key: str, payload: Any, min_delay: float = 0.0) -> bool:
+        """
+        Retry an item after its backoff (and at least `min_delay` seconds).
+        
+        Returns: False if the item is out of attempts and was dropped
+        """
+        if key in self._queued:
+            return True
+            
+        attempt = self._attempts.get(key, 0)
+        if attempt >= self.max_attempts:
+            self._attempts.pop(key, None)
+            self.dropped += 1
+            return False
+            
+        self._attempts[key] = attempt + 1
+        delay = max(min_delay, backoff_delay(attempt, self.base_delay, self.max_delay))
+        heapq.heappush(self._heap, (time.monotonic() + delay, next(self._seq), key, payload))
+        self._queued.add(key)
+        return True
+    
+    def pop_due(self) -> List[Any]:
+        """Payloads whose retry time has come."""
+        now = time.monotonic()
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, _, key, payload = heapq.heappop(self._heap)
+            self._queued.discard(key)
+            due.append(payload)
+        return due
+    
+    def next_delay(self) -> Optional[float]:
+        """Seconds until the next item is due (None if empty)."""
+        if not self._heap:
+            return None
+        return max(0.0, self._heap[0][0] - time.monotonic())
+    
+    def forget(self, key: str) -> None:
+        """Reset an item's attempt count after it succeeded."""
+        self._attempts.pop(key, None)
+    
+    def drain(self) -> List[Any]:
+        """Remove and return every queued payload, due or not."""
+        payloads = [payload for _, _, _, payload in self._heap]
+        self._heap = []
+        self._queued.clear()
+        self._attempts.clear()
+        return payloads
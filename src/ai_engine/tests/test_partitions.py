@@ -0,0 +1,90 @@
+"""
+Patch partition regression tests.
+
+Run from src/: python -m pytest ai_engine/tests
+"""
+
+import dataclasses
+from concurrent.futures import ThreadPoolExecutor
+
+from ..config import DatabaseConfig
+from ..database import MatchDatabase, MatchRecord
+from ..dedup import SeenIndex
+
+
+def make_match(match_id: str, version: str) -> MatchRecord:
+    return MatchRecord(
+        match_id=match_id,
+        game_version=version,
+        region="euw1",
+        game_duration=1800,
+        game_mode="CLASSIC",
+        queue_id=420,
+        blue_team_win=True,
+        blue_team_champions=[1, 2, 3, 4, 5],
+        red_team_champions=[6, 7, 8, 9, 10],
+        blue_team_items=[[1001] * 6] * 5,
+        red_team_items=[[1001] * 6] * 5,
+        timestamp=1700000000000
+    )
+
+
+def partitioned_db(tmp_path) -> MatchDatabase:
+    return MatchDatabase(dataclasses.replace(
+        DatabaseConfig(), db_path=tmp_path / "matches.db", partition_by_patch=True
+    ))
+
+
+def test_retired_ordinal_not_reused_by_next_patch(tmp_path):
+    db = partitioned_db(tmp_path)
+    
+    # A long-lived writer thread, whose connection keeps 14.24 attached as p1
+    with ThreadPoolExecutor(max_workers=1) as writer:
+        commit = lambda *matches: writer.submit(db.commit_group, list(matches)).result()
+        
+        assert commit(make_match("EUW1_1", "14.24.1")) == {"EUW1_1"}
+        assert db.retire_partition("14.24") == 1
+        
+        assert commit(make_match("EUW1_2", "14.25.1")) == {"EUW1_2"}
+        assert db.get_match_count("14.25") == 1
+        assert db.match_exists("EUW1_2")
+        assert db.list_partitions() == ["14.25"]
+        
+        writer.submit(db.close).result()
+    db.close()
+
+
+def test_stale_process_cache_does_not_write_to_retired_file(tmp_path):
+    first = partitioned_db(tmp_path)
+    
+    # Another process: its own instance, cache and connection
+    with ThreadPoolExecutor(max_workers=1) as other:
+        second = other.submit(partitioned_db, tmp_path).result()
+        run = lambda fn, *args: other.submit(fn, *args).result()
+        
+        first.commit_group([make_match("EUW1_1", "14.24.1")])
+        assert run(second.get_match_count, "14.24") == 1  # Caches and attaches 14.24
+        first.retire_partition("14.24")
+        
+        # A re-created 14.24 gets a new ordinal and file, not the deleted one
+        assert run(second.commit_group, [make_match("EUW1_2", "14.24.1")]) == {"EUW1_2"}
+        assert first.get_match_count("14.24") == 1
+        assert first.match_exists("EUW1_2")
+        
+        run(second.close)
+    first.close()
+
+
+def test_seen_index_sized_by_rows_not_position(tmp_path):
+    db = partitioned_db(tmp_path)
+    db.commit_group([make_match("EUW1_1", "14.24.1"), make_match("EUW1_2", "14.25.1")])
+    
+    # Positions of partitioned rows start at 2^40; the filter must not
+    index = SeenIndex(db, tmp_path / "seen_index", capacity=1000).open()
+    assert index.matches.capacity == 1000
+    assert index.might_have_match("EUW1_1") and index.might_have_match("EUW1_2")
+    
+    index.save()
+    db.commit_group([make_match("EUW1_3", "14.25.1")])
+    assert SeenIndex(db, tmp_path / "seen_index", capacity=1000).open().might_have_match("EUW1_3")
+    db.close()
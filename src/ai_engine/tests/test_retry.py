@@ -0,0 +1,108 @@
+"""
+Circuit breaker regression tests.
+
+Run from src/: python -m pytest ai_engine/tests
+"""
+
+import asyncio
+import dataclasses
+
+from aiohttp import web
+
+from .. import database
+from ..config import config
+from ..crawler import MatchCrawler
+from ..decoding import decode_match
+from ..retry import CircuitBreaker, is_retryable
+
+
+def test_released_probe_lets_next_request_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    
+    assert breaker.allow()  # The probe
+    assert not breaker.allow()
+    breaker.release_probe()
+    assert breaker.allow()
+
+
+async def serve(handler, tmp_path, **overrides):
+    """Start a mock API server; returns (crawler, url, runner)."""
+    app = web.Application()
+    app.router.add_get("/ids", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    
+    crawler = MatchCrawler(dataclasses.replace(
+        config.crawler,
+        api_base_url=f"http://127.0.0.1:{port}",
+        seen_index_dir=tmp_path / "seen_index",
+        http_cache_dir=tmp_path / "http_cache",
+        **overrides
+    ))
+    crawler.semaphore = asyncio.Semaphore(1)
+    return crawler, f"http://127.0.0.1:{port}/ids", runner
+
+
+def test_half_open_probe_answered_by_rate_limit(tmp_path, monkeypatch):
+    # Half-open -> probe gets an application-limit 429 -> next request still goes out
+    monkeypatch.setattr(config.database, "db_path", tmp_path / "matches.db")
+    monkeypatch.setattr(database, "_db_instance", None)
+    
+    responses = [
+        web.Response(status=429, headers={"X-Rate-Limit-Type": "application", "Retry-After": "1"}),
+        web.json_response(["EUW1_1"]),
+    ]
+    
+    async def handler(request: web.Request) -> web.Response:
+        return responses.pop(0)
+    
+    async def scenario() -> None:
+        crawler, url, runner = await serve(
+            handler, tmp_path,
+            api_key="key-a",
+            api_keys=["key-b"],  # The paused key's twin serves the next request
+            max_retries=0
+        )
+        
+        breaker = crawler.breakers.get("europe", "ids")
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+        breaker.reset_timeout = 0
+        
+        try:
+            assert await crawler._make_request(url, method="ids", host="europe") == (None, 429)
+            assert await crawler._make_request(url, method="ids", host="europe") == (["EUW1_1"], 200)
+            assert breaker.state == CircuitBreaker.CLOSED
+        finally:
+            await crawler.close()
+            await runner.cleanup()
+            database.get_database().close()
+            
+    asyncio.run(scenario())
+
+
+def test_undecodable_payload_is_not_refetched(tmp_path, monkeypatch):
+    monkeypatch.setattr(config.database, "db_path", tmp_path / "matches.db")
+    monkeypatch.setattr(database, "_db_instance", None)
+    hits = []
+    
+    async def handler(request: web.Request) -> web.Response:
+        hits.append(request)
+        return web.Response(body=b'{"metadata": {"matchId": "EUW1_1"', content_type="application/json")
+    
+    async def scenario() -> None:
+        crawler, url, runner = await serve(handler, tmp_path, api_key="key-a", max_retries=3)
+        try:
+            data, status = await crawler._make_request(url, method="ids", host="europe", decode=decode_match)
+            assert data is None and not is_retryable(status)
+            assert len(hits) == 1
+        finally:
+            await crawler.close()
+            await runner.cleanup()
+            database.get_database().close()
+            
+    asyncio.run(scenario())
@@ -0,0 +1,93 @@
+"""
+Training dataset tests.
+
+Run from src/: python -m pytest ai_engine/tests
+"""
+
+import pytest
+from torch.utils.data import DataLoader
+
+from .. import database
+from ..config import config
+from ..database import MatchRecord, get_database
+from ..train import PatchTensorDataset, StreamingDataset
+
+
+def make_match(i: int) -> MatchRecord:
+    return MatchRecord(
+        match_id=f"EUW1_{i}",
+        game_version="14.24.1",
+        region="euw1",
+        game_duration=1800,
+        game_mode="CLASSIC",
+        queue_id=420,
+        blue_team_win=i % 100 >= 70,  # Mostly outside the train buckets
+        blue_team_champions=[1, 2, 3, 4, 5],
+        red_team_champions=[6, 7, 8, 9, 10],
+        blue_team_items=[[1001] * 6] * 5,
+        red_team_items=[[1001] * 6] * 5,
+        timestamp=1700000000000 + i % 7  # Ties exercise the rowid tiebreak
+    )
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(config.database, "db_path", tmp_path / "matches.db")
+    monkeypatch.setattr(database, "_db_instance", None)
+    
+    db = get_database()
+    db.commit_group([make_match(i) for i in range(300)])
+    yield db
+    db.close()
+
+
+@pytest.mark.parametrize("split", [None, "train"])
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test_pages_are_index_seeks(db, split, num_workers):
+    dataset = StreamingDataset("14.24", split=split)
+    query, extra = dataset._page_query("main.matches", 0, num_workers)
+    
+    with db.get_connection() as conn:
+        plan = " ".join(
+            row[3] for row in conn.execute(
+                "EXPLAIN QUERY PLAN " + query, ["14.24", 420, -1, 0, *extra]
+            )
+        )
+    assert "idx_matches_patch" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_pages_cover_every_row_once(db):
+    dataset = StreamingDataset("14.24", batch_size=7, shuffle_buffer=0)
+    assert len(list(dataset)) == 300
+    
+    splits = {split: StreamingDataset("14.24", split=split) for split in StreamingDataset.SPLITS}
+    assert sum(len(ds) for ds in splits.values()) == 300
+    assert sum(len(list(ds)) for ds in splits.values()) == 300
+
+
+def test_spawned_workers_stream_every_row(db):
+    # Spawn (the macOS default) pickles the dataset into each worker
+    dataset = StreamingDataset("14.24", split="train", batch_size=50)
+    loader = DataLoader(dataset, batch_size=64, num_workers=2, multiprocessing_context="spawn")
+    
+    assert sum(batch["label"].shape[0] for batch in loader) == len(dataset)
+
+
+def test_class_weights_count_only_the_split(db):
+    train = StreamingDataset("14.24", split="train", shuffle_buffer=0)
+    labels = [float(sample["label"]) for sample in train]
+    blue_wins = sum(labels)
+    
+    assert float(train.get_class_weights()) == pytest.approx((len(labels) - blue_wins) / blue_wins)
+
+
+def test_snapshot_save_keeps_other_sample_limits(db, tmp_path):
+    PatchTensorDataset("14.24", max_samples=100, snapshot_dir=tmp_path / "snapshots")
+    PatchTensorDataset("14.24", snapshot_dir=tmp_path / "snapshots")
+    assert len(list((tmp_path / "snapshots").iterdir())) == 2
+    
+    # New rows make the full snapshot stale; the limited one is left alone
+    db.commit_group([make_match(300)])
+    PatchTensorDataset("14.24", snapshot_dir=tmp_path / "snapshots")
+    assert sorted(p.name.endswith("_max100") for p in (tmp_path / "snapshots").iterdir()) == [False, True]
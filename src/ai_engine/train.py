@@ -12,18 +12,32 @@ Features:
 import torch
 import torch.nn as nn
 import torch.optim as optim
-from torch.utils.data import Dataset, DataLoader, random_split
+from torch.utils.data import Dataset, IterableDataset, DataLoader, random_split, get_worker_info
 from torch.cuda.amp import GradScaler, autocast
-import json
+import numpy as np
 import logging
+import queue
+import random
+import re
+import shutil
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, List, Tuple, Iterator
+from typing import Optional, Dict, List, Tuple, Iterator, Union
 from dataclasses import dataclass, field
 import time
 
 from .config import config, ModelConfig
-from .database import get_database, MatchRecord
+from .database import (
+    get_database,
+    MatchDatabase,
+    MatchRecord,
+    unpack_champions,
+    unpack_items,
+    unpack_champions_column,
+    unpack_items_column
+)
+from .utils import get_major_minor
 from .model import (
     MetaAwarePredictor, 
     MetaAwarePredictorWithItems,
@@ -44,6 +58,7 @@ class TrainingMetrics:
     val_acc: List[float] = field(default_factory=list)
     learning_rates: List[float] = field(default_factory=list)
     epoch_times: List[float] = field(default_factory=list)
+    samples_per_sec: List[float] = field(default_factory=list)
     
     best_val_loss: float = float('inf')
     best_val_acc: float = 0.0
@@ -56,7 +71,8 @@ class TrainingMetrics:
         train_acc: float,
         val_acc: float,
         lr: float,
-        epoch_time: float
+        epoch_time: float,
+        samples_per_sec: float = 0.0
     ):
         self.train_loss.append(train_loss)
         self.val_loss.append(val_loss)
@@ -64,6 +80,7 @@ class TrainingMetrics:
         self.val_acc.append(val_acc)
         self.learning_rates.append(lr)
         self.epoch_times.append(epoch_time)
+        self.samples_per_sec.append(samples_per_sec)
         
         if val_loss < self.best_val_loss:
             self.best_val_loss = val_loss
@@ -80,6 +97,7 @@ class TrainingMetrics:
             'val_acc': self.val_acc,
             'learning_rates': self.learning_rates,
             'epoch_times': self.epoch_times,
+            'samples_per_sec': self.samples_per_sec,
             'best_val_loss': self.best_val_loss,
             'best_val_acc': self.best_val_acc,
             'best_epoch': self.best_epoch
@@ -123,12 +141,12 @@ class CurrentPatchDataset(Dataset):
         self.match_ids: List[str] = []
         
         with self.db.get_connection() as conn:
-            query = """
-                SELECT match_id FROM matches 
-                WHERE game_version LIKE ? AND queue_id = ?
+            query = f"""
+                SELECT match_id FROM {self.db.matches_table(conn, self.version)} 
+                WHERE patch = ? AND queue_id = ?
                 ORDER BY game_timestamp DESC
             """
-            params = [f"{self.version}%", self.queue_id]
+            params = [get_major_minor(self.version), self.queue_id]
             
             if max_samples:
                 query += " LIMIT ?"
@@ -155,29 +173,30 @@ class CurrentPatchDataset(Dataset):
         
         with self.db.get_connection() as conn:
             row = conn.execute(
-                "SELECT * FROM matches WHERE match_id = ?", (match_id,)
+                f"SELECT * FROM {self.db.matches_table(conn, self.version)} WHERE match_id = ?",
+                (match_id,)
             ).fetchone()
             
         if row is None:
             # Return dummy data (shouldn't happen)
             return self._get_dummy_sample()
             
-        blue_champs = json.loads(row['blue_team_champions'])
-        red_champs = json.loads(row['red_team_champions'])
+        blue_champs = unpack_champions(row['blue_team_champions'])
+        red_champs = unpack_champions(row['red_team_champions'])
         blue_win = row['blue_team_win']
         
         sample = {
-            'blue_team': torch.tensor(blue_champs, dtype=torch.long),
-            'red_team': torch.tensor(red_champs, dtype=torch.long),
+            'blue_team': torch.from_numpy(blue_champs.astype(np.int64)),
+            'red_team': torch.from_numpy(red_champs.astype(np.int64)),
             'label': torch.tensor([blue_win], dtype=torch.float)
         }
         
         if self.include_items:
-            blue_items = json.loads(row['blue_team_items']) if row['blue_team_items'] else [[0]*6]*5
-            red_items = json.loads(row['red_team_items']) if row['red_team_items'] else [[0]*6]*5
+            blue_items = unpack_items(row['blue_team_items'])
+            red_items = unpack_items(row['red_team_items'])
             
-            sample['blue_items'] = torch.tensor(blue_items, dtype=torch.long)
-            sample['red_items'] = torch.tensor(red_items, dtype=torch.long)
+            sample['blue_items'] = torch.from_numpy(blue_items.astype(np.int64))
+            sample['red_items'] = torch.from_numpy(red_items.astype(np.int64))
             
         return sample
     
@@ -195,13 +214,13 @@ class CurrentPatchDataset(Dataset):
         Returns tensor for BCEWithLogitsLoss pos_weight.
         """
         with self.db.get_connection() as conn:
-            result = conn.execute("""
+            result = conn.execute(f"""
                 SELECT 
                     SUM(CASE WHEN blue_team_win = 1 THEN 1 ELSE 0 END) as blue_wins,
                     SUM(CASE WHEN blue_team_win = 0 THEN 1 ELSE 0 END) as red_wins
-                FROM matches 
-                WHERE game_version LIKE ? AND queue_id = ?
-            """, (f"{self.version}%", self.queue_id)).fetchone()
+                FROM {self.db.matches_table(conn, self.version)} 
+                WHERE patch = ? AND queue_id = ?
+            """, (get_major_minor(self.version), self.queue_id)).fetchone()
             
         blue_wins = result[0] or 1
         red_wins = result[1] or 1
@@ -212,70 +231,566 @@ class CurrentPatchDataset(Dataset):
         return torch.tensor([pos_weight])
 
 
-class StreamingDataset(Dataset):
+class PatchTensorDataset(Dataset):
     """
-    Memory-efficient dataset that streams from database.
-    Uses SQLite cursor for large datasets.
+    In-memory dataset built from a single scan of one patch.
+    
+    Drop-in replacement for CurrentPatchDataset: the whole patch is read once
+    into contiguous tensors (int16 champions, int32 items, uint8 labels) and
+    samples are served by tensor indexing instead of one SQLite query each.
+    
+    The tensors are cached as .npy files keyed by version, queue and the
+    database high-water mark, and memory-mapped on later runs.
     """
     
+    SNAPSHOT_ARRAYS = ("blue_team", "red_team", "blue_items", "red_items", "labels")
+    
     def __init__(
         self,
         version: str,
         queue_id: int = 420,
-        batch_size: int = 1000
+        include_items: bool = False,
+        max_samples: Optional[int] = None,
+        snapshot_dir: Optional[Path] = None,
+        use_cache: bool = True
     ):
+        """
+        Args:
+            version: Patch version to filter (e.g., "14.24")
+            queue_id: Queue type (420=Ranked Solo, 440=Ranked Flex)
+            include_items: Whether to include item data in samples
+            max_samples: Limit number of samples (for testing)
+            snapshot_dir: Where snapshots are cached (config default if None)
+            use_cache: Read/write the on-disk snapshot
+        """
         self.db = get_database()
         self.version = version
         self.queue_id = queue_id
+        self.include_items = include_items
+        self.max_samples = max_samples
+        self.snapshot_dir = Path(snapshot_dir or config.model.snapshot_dir)
+        
+        arrays = self._load_snapshot() if use_cache else None
+        if arrays is None:
+            arrays = self._scan_patch()
+            if use_cache:
+                self._save_snapshot(arrays)
+                
+        self.blue_team = torch.from_numpy(arrays["blue_team"])
+        self.red_team = torch.from_numpy(arrays["red_team"])
+        self.blue_items = torch.from_numpy(arrays["blue_items"])
+        self.red_items = torch.from_numpy(arrays["red_items"])
+        self.labels = torch.from_numpy(arrays["labels"])
+        
+        logger.info(f"Tensor dataset initialized: {len(self)} matches (v{version})")
+        
+    # ---------- snapshot cache ----------
+    
+    def _snapshot_prefix(self) -> str:
+        return f"v{self.version}_q{self.queue_id}"
+    
+    def _snapshot_suffix(self) -> str:
+        return f"_max{self.max_samples}" if self.max_samples else ""
+    
+    def _snapshot_key(self) -> str:
+        """Cache key: version + queue + DB high-water mark (+ sample limit)."""
+        return (
+            f"{self._snapshot_prefix()}_hw{self.db.get_high_water_mark()}"
+            f"_n{self.db.get_match_count(self.version, self.queue_id)}"
+            f"{self._snapshot_suffix()}"
+        )
+    
+    def _is_stale_snapshot(self, name: str) -> bool:
+        """Same patch, queue and sample limit; only the DB state differs."""
+        pattern = rf"{re.escape(self._snapshot_prefix())}_hw\d+_n\d+{re.escape(self._snapshot_suffix())}"
+        return re.fullmatch(pattern, name) is not None
+    
+    def _load_snapshot(self) -> Optional[Dict[str, np.ndarray]]:
+        """Memory-map a cached snapshot if one matches the current key."""
+        path = self.snapshot_dir / self._snapshot_key()
+        if not path.is_dir():
+            return None
+            
+        try:
+            # Copy-on-write mapping: pages are read lazily and stay writable
+            # for torch.from_numpy without touching the file
+            arrays = {
+                name: np.load(path / f"{name}.npy", mmap_mode="c")
+                for name in self.SNAPSHOT_ARRAYS
+            }
+            logger.info(f"Loaded tensor snapshot from {path}")
+            return arrays
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable snapshot {path}: {e}")
+            return None
+            
+    def _save_snapshot(self, arrays: Dict[str, np.ndarray]) -> None:
+        """Write the snapshot atomically and drop stale ones for this patch."""
+        path = self.snapshot_dir / self._snapshot_key()
+        tmp_path = path.with_name(path.name + ".tmp")
+        
+        try:
+            self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            tmp_path.mkdir()
+            for name in self.SNAPSHOT_ARRAYS:
+                np.save(tmp_path / f"{name}.npy", arrays[name])
+                
+            for stale in self.snapshot_dir.glob(f"{self._snapshot_prefix()}_hw*"):
+                if self._is_stale_snapshot(stale.name):
+                    shutil.rmtree(stale, ignore_errors=True)
+            tmp_path.rename(path)
+            logger.info(f"Saved tensor snapshot to {path}")
+            
+        except OSError as e:
+            logger.warning(f"Failed to save tensor snapshot: {e}")
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            
+    # ---------- loading ----------
+    
+    def _scan_patch(self, chunk_size: int = 50000) -> Dict[str, np.ndarray]:
+        """Read the whole patch with one query into contiguous arrays."""
+        query = """
+            SELECT blue_team_champions, red_team_champions,
+                   blue_team_items, red_team_items, blue_team_win
+            FROM {table} 
+            WHERE patch = ? AND queue_id = ?
+            ORDER BY game_timestamp DESC
+        """
+        params: List = [get_major_minor(self.version), self.queue_id]
+        
+        if self.max_samples:
+            query += " LIMIT ?"
+            params.append(self.max_samples)
+            
+        columns: List[List] = [[], [], [], [], []]
+        with self.db.get_connection() as conn:
+            table = self.db.matches_table(conn, self.version)
+            cursor = conn.execute(query.format(table=table), params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                for column, values in zip(columns, zip(*rows)):
+                    column.extend(values)
+                    
+        blue_champs, red_champs, blue_items, red_items, wins = columns
+        
+        return {
+            "blue_team": unpack_champions_column(blue_champs).astype(np.int16),
+            "red_team": unpack_champions_column(red_champs).astype(np.int16),
+            "blue_items": unpack_items_column(blue_items).astype(np.int32),
+            "red_items": unpack_items_column(red_items).astype(np.int32),
+            "labels": np.asarray(wins, dtype=np.uint8),
+        }
+        
+    # ---------- Dataset API ----------
+    
+    def __len__(self) -> int:
+        return self.labels.shape[0]
+    
+    def get_batch(self, indices: torch.Tensor) -> Dict[str, torch.Tensor]:
+        """Gather a whole batch with one indexing op per tensor."""
+        batch = {
+            'blue_team': self.blue_team[indices].long(),
+            'red_team': self.red_team[indices].long(),
+            'label': self.labels[indices].float().unsqueeze(-1)
+        }
+        
+        if self.include_items:
+            batch['blue_items'] = self.blue_items[indices].long()
+            batch['red_items'] = self.red_items[indices].long()
+            
+        return batch
+    
+    def __getitem__(self, idx: int) -> Dict[str, torch.Tensor]:
+        """Same sample layout as CurrentPatchDataset.__getitem__."""
+        return self.get_batch(torch.tensor(idx))
+    
+    def get_class_weights(self) -> torch.Tensor:
+        """
+        Calculate class weights for imbalanced data.
+        Returns tensor for BCEWithLogitsLoss pos_weight.
+        """
+        blue_wins = int(self.labels.sum()) or 1
+        red_wins = (len(self) - int(self.labels.sum())) or 1
+        
+        # pos_weight = negative_samples / positive_samples
+        return torch.tensor([red_wins / blue_wins])
+
+
+class TensorBatchLoader:
+    """
+    Batch iterator over a PatchTensorDataset that bypasses per-sample collation.
+    
+    Each epoch shuffles an index permutation and gathers whole batches from
+    the preloaded tensors with one indexing op, instead of building and
+    collating a dict of tiny tensors per sample. On CUDA it can double-buffer:
+    the next batch is pinned and copied on a side stream while the current
+    one is being consumed.
+    
+    Yields the same batch dicts as a DataLoader over CurrentPatchDataset.
+    """
+    
+    def __init__(
+        self,
+        dataset: PatchTensorDataset,
+        indices: Optional[torch.Tensor] = None,
+        batch_size: int = 256,
+        shuffle: bool = False,
+        drop_last: bool = False,
+        device: Optional[torch.device] = None,
+        pin_memory: bool = False,
+        seed: Optional[int] = None
+    ):
+        """
+        Args:
+            dataset: Preloaded tensor dataset
+            indices: Subset of dataset rows to serve (all rows if None)
+            batch_size: Samples per batch
+            shuffle: Reshuffle the indices every epoch
+            drop_last: Drop the final incomplete batch
+            device: Target device for double-buffered transfers
+            pin_memory: Enable pinned-memory double buffering (CUDA only)
+            seed: Seed for the shuffle generator
+        """
+        self.dataset = dataset
+        self.indices = indices if indices is not None else torch.arange(len(dataset))
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.drop_last = drop_last
+        self.device = device
+        self.double_buffer = (
+            pin_memory and device is not None and device.type == 'cuda'
+        )
+        self.generator = torch.Generator()
+        if seed is not None:
+            self.generator.manual_seed(seed)
+            
+    @property
+    def num_samples(self) -> int:
+        return len(self.indices)
+    
+    def __len__(self) -> int:
+        if self.drop_last:
+            return self.num_samples // self.batch_size
+        return (self.num_samples + self.batch_size - 1) // self.batch_size
+    
+    def _batch_indices(self) -> List[torch.Tensor]:
+        """Split this epoch's (optionally shuffled) indices into batches."""
+        order = self.indices
+        if self.shuffle:
+            order = order[torch.randperm(len(order), generator=self.generator)]
+            
+        batches = list(order.split(self.batch_size))
+        if self.drop_last and batches and len(batches[-1]) < self.batch_size:
+            batches.pop()
+        return batches
+    
+    def _prefetch(
+        self, 
+        indices: torch.Tensor, 
+        stream: "torch.cuda.Stream"
+    ) -> Dict[str, torch.Tensor]:
+        """Gather a batch, pin it and start an async copy on the side stream."""
+        batch = {k: v.pin_memory() for k, v in self.dataset.get_batch(indices).items()}
+        with torch.cuda.stream(stream):
+            return {k: v.to(self.device, non_blocking=True) for k, v in batch.items()}
+        
+    def __iter__(self) -> Iterator[Dict[str, torch.Tensor]]:
+        batches = self._batch_indices()
+        
+        if not self.double_buffer:
+            for indices in batches:
+                yield self.dataset.get_batch(indices)
+            return
+            
+        if not batches:
+            return
+            
+        stream = torch.cuda.Stream(device=self.device)
+        next_batch = self._prefetch(batches[0], stream)
+        
+        for i in range(len(batches)):
+            # Wait for the in-flight copy, then queue the following one
+            current_stream = torch.cuda.current_stream(self.device)
+            current_stream.wait_stream(stream)
+            batch = next_batch
+            for tensor in batch.values():
+                tensor.record_stream(current_stream)
+                
+            if i + 1 < len(batches):
+                next_batch = self._prefetch(batches[i + 1], stream)
+                
+            yield batch
+
+
+class StreamingDataset(IterableDataset):
+    """
+    Memory-efficient dataset that streams a patch from the database.
+    
+    For patches that do not fit in RAM:
+    - Keyset pagination on (game_timestamp, rowid), the order of the patch
+      index, so every page is an index seek instead of LIMIT/OFFSET walking
+      (or re-sorting) all preceding rows
+    - A background thread prefetches and decodes the next pages
+    - A shuffle buffer randomizes sample order within a sliding window
+    - Rows are sharded across DataLoader workers (num_workers > 0), each
+      worker opening its own SQLite connection
+    - Optional deterministic train/val/test split by rowid bucket
+    """
+    
+    SPLITS = ("train", "val", "test")
+    
+    def __init__(
+        self,
+        version: str,
+        queue_id: int = 420,
+        batch_size: int = 1000,
+        shuffle_buffer: int = 10000,
+        prefetch_pages: int = 2,
+        split: Optional[str] = None,
+        seed: int = 42,
+        include_items: bool = False
+    ):
+        """
+        Args:
+            version: Patch version to filter (e.g., "14.24")
+            queue_id: Queue type (420=Ranked Solo, 440=Ranked Flex)
+            batch_size: Rows fetched per keyset page
+            shuffle_buffer: Samples held for shuffling (0 disables shuffling)
+            prefetch_pages: Decoded pages the prefetch thread may queue ahead
+            split: "train", "val", "test" or None for the whole patch
+            seed: Base seed for the shuffle buffer
+            include_items: Whether to include item data in samples
+        """
+        if split is not None and split not in self.SPLITS:
+            raise ValueError(f"split must be one of {self.SPLITS}, got {split!r}")
+            
+        # Only the settings are kept: a MatchDatabase holds locks and
+        # connections, which cannot be pickled into spawned DataLoader
+        # workers. Each process opens its own on first use.
+        self._db: Optional[MatchDatabase] = get_database()
+        self._db_config = self._db.config
+        self.version = version
+        self.queue_id = queue_id
         self.batch_size = batch_size
+        self.shuffle_buffer = shuffle_buffer
+        self.prefetch_pages = prefetch_pages
+        self.split = split
+        self.seed = seed
+        self.include_items = include_items
+        self._epoch = 0
         
-        # Get total count
-        self.total = self.db.get_match_count(version, queue_id)
+        # Fixed here so spawned workers use the parent's ratios
+        self._bounds = self._split_bounds()
         
-        # Cache for current batch
-        self._cache: List[Dict] = []
-        self._cache_start: int = -1
+        # Rows this split serves, not the whole patch
+        self.total = self._count()
         
     def __len__(self) -> int:
         return self.total
     
-    def _load_batch(self, start_idx: int) -> None:
-        """Load a batch of matches into cache."""
+    def __getstate__(self) -> Dict:
+        state = self.__dict__.copy()
+        state["_db"] = None
+        return state
+    
+    @property
+    def db(self) -> MatchDatabase:
+        if self._db is None:
+            self._db = MatchDatabase(self._db_config)
+        return self._db
+    
+    def _split_bounds(self) -> Optional[Tuple[int, int]]:
+        """Percent-bucket range [lo, hi) of rowid % 100 served by this split."""
+        if self.split is None:
+            return None
+            
+        train = int(config.model.train_ratio * 100)
+        val = int(config.model.val_ratio * 100)
+        return {
+            "train": (0, train),
+            "val": (train, train + val),
+            "test": (train + val, 100),
+        }[self.split]
+    
+    def _split_filter(self) -> Tuple[str, List]:
+        """SQL condition (and its parameters) restricting rows to this split."""
+        bounds = self._bounds
+        if not bounds:
+            return "", []
+        return " AND (rowid % 100) >= ? AND (rowid % 100) < ?", list(bounds)
+    
+    def _count(self) -> int:
+        """Number of matches in this split (rowid is in the patch index)."""
+        condition, params = self._split_filter()
         with self.db.get_connection() as conn:
-            rows = conn.execute("""
-                SELECT blue_team_champions, red_team_champions, blue_team_win
-                FROM matches 
-                WHERE game_version LIKE ? AND queue_id = ?
-                ORDER BY match_id
-                LIMIT ? OFFSET ?
-            """, (f"{self.version}%", self.queue_id, self.batch_size, start_idx)).fetchall()
-            
-        self._cache = []
-        for row in rows:
-            self._cache.append({
-                'blue_team': torch.tensor(json.loads(row[0]), dtype=torch.long),
-                'red_team': torch.tensor(json.loads(row[1]), dtype=torch.long),
-                'label': torch.tensor([row[2]], dtype=torch.float)
-            })
-        self._cache_start = start_idx
+            row = conn.execute(
+                f"SELECT COUNT(*) FROM {self.db.matches_table(conn, self.version)} "
+                f"WHERE patch = ? AND queue_id = ?{condition}",
+                [get_major_minor(self.version), self.queue_id, *params]
+            ).fetchone()
+        return row[0]
+    
+    def _page_query(self, table: str, worker_id: int, num_workers: int) -> Tuple[str, List]:
+        """
+        Keyset page query over (game_timestamp, rowid), the order
+        idx_matches_patch already stores, so every page is an index seek
+        with no sort. Returns (sql, parameters after the key).
+        """
+        columns = "rowid, game_timestamp, blue_team_champions, red_team_champions, blue_team_win"
+        if self.include_items:
+            columns += ", blue_team_items, red_team_items"
+        query = f"""
+            SELECT {columns}
+            FROM {table} 
+            WHERE patch = ? AND queue_id = ? AND (game_timestamp, rowid) > (?, ?)
+        """
+        extra: List = []
         
-    def __getitem__(self, idx: int) -> Dict[str, torch.Tensor]:
-        # Check if idx is in cache
-        if self._cache_start < 0 or idx < self._cache_start or idx >= self._cache_start + len(self._cache):
-            batch_start = (idx // self.batch_size) * self.batch_size
-            self._load_batch(batch_start)
+        if num_workers > 1:
+            query += " AND (rowid % ?) = ?"
+            extra += [num_workers, worker_id]
             
-        cache_idx = idx - self._cache_start
-        if cache_idx < len(self._cache):
-            return self._cache[cache_idx]
-        return self._get_dummy_sample()
+        condition, params = self._split_filter()
+        query += condition
+        extra += params
+        
+        query += " ORDER BY game_timestamp, rowid LIMIT ?"
+        return query, extra + [self.batch_size]
     
-    def _get_dummy_sample(self) -> Dict[str, torch.Tensor]:
-        return {
-            'blue_team': torch.zeros(5, dtype=torch.long),
-            'red_team': torch.zeros(5, dtype=torch.long),
-            'label': torch.tensor([0.5], dtype=torch.float)
-        }
+    def _iter_pages(self, worker_id: int, num_workers: int) -> Iterator[List[Tuple]]:
+        """Walk the patch in index order, one keyset page at a time."""
+        # Fresh connection: this runs in the prefetch thread, possibly inside a
+        # forked DataLoader worker, so the thread-local one must not be reused
+        conn = self.db._create_connection()
+        try:
+            query, extra = self._page_query(
+                self.db.matches_table(conn, self.version), worker_id, num_workers
+            )
+            last_ts, last_rowid = -1, 0
+            while True:
+                rows = conn.execute(
+                    query, [get_major_minor(self.version), self.queue_id, last_ts, last_rowid, *extra]
+                ).fetchall()
+                if not rows:
+                    break
+                last_rowid, last_ts = rows[-1][0], rows[-1][1]
+                yield rows
+        finally:
+            conn.close()
+            
+    def _decode_page(self, rows: List[Tuple]) -> List[Dict[str, torch.Tensor]]:
+        """Decode one page into per-sample tensors."""
+        columns = list(zip(*rows))[2:]  # Skip the (rowid, game_timestamp) key
+        blue, red, wins = columns[:3]
+        blue_team = torch.from_numpy(unpack_champions_column(list(blue)).astype(np.int64))
+        red_team = torch.from_numpy(unpack_champions_column(list(red)).astype(np.int64))
+        labels = torch.tensor(wins, dtype=torch.float).unsqueeze(-1)
+        
+        samples = [
+            {'blue_team': blue_team[i], 'red_team': red_team[i], 'label': labels[i]}
+            for i in range(len(rows))
+        ]
+        
+        if self.include_items:
+            blue_items = torch.from_numpy(unpack_items_column(list(columns[3])).astype(np.int64))
+            red_items = torch.from_numpy(unpack_items_column(list(columns[4])).astype(np.int64))
+            for i, sample in enumerate(samples):
+                sample['blue_items'] = blue_items[i]
+                sample['red_items'] = red_items[i]
+                
+        return samples
+    
+    def _prefetch(self, worker_id: int, num_workers: int) -> Iterator[List[Dict[str, torch.Tensor]]]:
+        """Load and decode pages on a background thread, bounded by a queue."""
+        pages: "queue.Queue" = queue.Queue(maxsize=max(1, self.prefetch_pages))
+        stop = threading.Event()
+        done = object()
+        
+        def producer() -> None:
+            try:
+                for rows in self._iter_pages(worker_id, num_workers):
+                    if stop.is_set():
+                        return
+                    pages.put(self._decode_page(rows))
+                pages.put(done)
+            except Exception as e:
+                pages.put(e)
+                
+        thread = threading.Thread(target=producer, name="streaming-prefetch", daemon=True)
+        thread.start()
+        
+        try:
+            while True:
+                item = pages.get()
+                if item is done:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # Unblock the producer if the consumer stopped early
+            stop.set()
+            while thread.is_alive():
+                try:
+                    pages.get_nowait()
+                except queue.Empty:
+                    thread.join(timeout=0.1)
+                    
+    def __iter__(self) -> Iterator[Dict[str, torch.Tensor]]:
+        worker_info = get_worker_info()
+        if worker_info is None:
+            worker_id, num_workers = 0, 1
+            seed = self.seed + self._epoch
+            self._epoch += 1
+        else:
+            # DataLoader draws a fresh base seed per epoch for each worker
+            worker_id, num_workers = worker_info.id, worker_info.num_workers
+            seed = worker_info.seed
+            
+        rng = random.Random(seed)
+        buffer: List[Dict[str, torch.Tensor]] = []
+        
+        for page in self._prefetch(worker_id, num_workers):
+            if self.shuffle_buffer <= 0:
+                yield from page
+                continue
+                
+            for sample in page:
+                if len(buffer) < self.shuffle_buffer:
+                    buffer.append(sample)
+                    continue
+                    
+                # Emit a random buffered sample and keep the new one
+                idx = rng.randrange(len(buffer))
+                yield buffer[idx]
+                buffer[idx] = sample
+                
+        rng.shuffle(buffer)
+        yield from buffer
+    
+    def get_class_weights(self) -> torch.Tensor:
+        """
+        Calculate class weights for imbalanced data (over this split only).
+        Returns tensor for BCEWithLogitsLoss pos_weight.
+        """
+        condition, params = self._split_filter()
+        with self.db.get_connection() as conn:
+            result = conn.execute(f"""
+                SELECT 
+                    SUM(CASE WHEN blue_team_win = 1 THEN 1 ELSE 0 END) as blue_wins,
+                    SUM(CASE WHEN blue_team_win = 0 THEN 1 ELSE 0 END) as red_wins
+                FROM {self.db.matches_table(conn, self.version)} 
+                WHERE patch = ? AND queue_id = ?{condition}
+            """, [get_major_minor(self.version), self.queue_id, *params]).fetchone()
+            
+        blue_wins = result[0] or 1
+        red_wins = result[1] or 1
+        
+        # pos_weight = negative_samples / positive_samples
+        return torch.tensor([red_wins / blue_wins])
 
 
 class Trainer:
@@ -309,9 +824,12 @@ class Trainer:
         self.scaler: Optional[GradScaler] = None
         
         # Data loaders
-        self.train_loader: Optional[DataLoader] = None
-        self.val_loader: Optional[DataLoader] = None
-        self.test_loader: Optional[DataLoader] = None
+        self.train_loader: Optional[Union[DataLoader, TensorBatchLoader]] = None
+        self.val_loader: Optional[Union[DataLoader, TensorBatchLoader]] = None
+        self.test_loader: Optional[Union[DataLoader, TensorBatchLoader]] = None
+        
+        # Throughput of the most recent train_epoch()/validate() call
+        self.last_samples_per_sec: float = 0.0
         
         # Metrics
         self.metrics = TrainingMetrics()
@@ -326,13 +844,18 @@ class Trainer:
         version: str,
         queue_id: int = 420,
         include_items: bool = False,
-        max_samples: Optional[int] = None
+        max_samples: Optional[int] = None,
+        use_snapshot: bool = True
     ) -> None:
         """
         Setup data loaders with train/val/test split.
+        
+        With use_snapshot the patch is loaded once into tensors
+        (PatchTensorDataset) instead of queried row by row.
         """
         # Create full dataset
-        full_dataset = CurrentPatchDataset(
+        dataset_class = PatchTensorDataset if use_snapshot else CurrentPatchDataset
+        full_dataset = dataset_class(
             version=version,
             queue_id=queue_id,
             include_items=include_items,
@@ -344,14 +867,104 @@ class Trainer:
         val_size = int(total * self.config.val_ratio)
         test_size = total - train_size - val_size
         
-        # Split
+        if isinstance(full_dataset, PatchTensorDataset):
+            self._setup_tensor_loaders(full_dataset, [train_size, val_size, test_size])
+        else:
+            self._setup_dataloaders(full_dataset, [train_size, val_size, test_size])
+        
+        # Get class weights for imbalanced data
+        class_weights = full_dataset.get_class_weights().to(self.device)
+        
+        # Setup criterion with class weights
+        self.criterion = nn.BCEWithLogitsLoss(pos_weight=class_weights)
+        
+        logger.info(f"Data split: Train={train_size}, Val={val_size}, Test={test_size}")
+        
+    def setup_streaming_data(
+        self,
+        version: str,
+        queue_id: int = 420,
+        include_items: bool = False
+    ) -> None:
+        """
+        Setup streaming loaders for patches that do not fit in RAM.
+        
+        Splits are assigned by rowid bucket and rows are sharded across
+        config.streaming_workers DataLoader workers.
+        """
+        datasets = {
+            split: StreamingDataset(
+                version=version, queue_id=queue_id, split=split, include_items=include_items
+            )
+            for split in StreamingDataset.SPLITS
+        }
+        workers = self.config.streaming_workers
+        
+        def make_loader(dataset: StreamingDataset, drop_last: bool = False) -> DataLoader:
+            return DataLoader(
+                dataset,
+                batch_size=self.config.batch_size,
+                num_workers=workers,
+                pin_memory=self.device.type == 'cuda',
+                drop_last=drop_last
+            )
+            
+        self.train_loader = make_loader(datasets["train"], drop_last=True)
+        self.val_loader = make_loader(datasets["val"])
+        self.test_loader = make_loader(datasets["test"])
+        
+        # Get class weights for imbalanced data
+        class_weights = datasets["train"].get_class_weights().to(self.device)
+        self.criterion = nn.BCEWithLogitsLoss(pos_weight=class_weights)
+        
+        logger.info(
+            f"Streaming data: Train={datasets['train'].total}, Val={datasets['val'].total}, "
+            f"Test={datasets['test'].total}, {workers} workers"
+        )
+        
+    def _setup_tensor_loaders(
+        self, 
+        dataset: PatchTensorDataset, 
+        sizes: List[int]
+    ) -> None:
+        """Split a preloaded dataset by index and serve it in whole batches."""
+        # Same permutation random_split would draw with this seed
+        perm = torch.randperm(len(dataset), generator=torch.Generator().manual_seed(42))
+        train_idx, val_idx, test_idx = perm.split(sizes)
+        pin_memory = self.device.type == 'cuda'
+        
+        self.train_loader = TensorBatchLoader(
+            dataset, train_idx,
+            batch_size=self.config.batch_size,
+            shuffle=True,
+            drop_last=True,
+            device=self.device,
+            pin_memory=pin_memory,
+            seed=42
+        )
+        
+        self.val_loader = TensorBatchLoader(
+            dataset, val_idx,
+            batch_size=self.config.batch_size,
+            device=self.device,
+            pin_memory=pin_memory
+        )
+        
+        self.test_loader = TensorBatchLoader(
+            dataset, test_idx,
+            batch_size=self.config.batch_size,
+            device=self.device,
+            pin_memory=pin_memory
+        )
+        
+    def _setup_dataloaders(self, dataset: Dataset, sizes: List[int]) -> None:
+        """Split a per-row dataset and wrap it in standard DataLoaders."""
         train_dataset, val_dataset, test_dataset = random_split(
-            full_dataset,
-            [train_size, val_size, test_size],
+            dataset,
+            sizes,
             generator=torch.Generator().manual_seed(42)
         )
         
-        # Create loaders
         self.train_loader = DataLoader(
             train_dataset,
             batch_size=self.config.batch_size,
@@ -377,14 +990,6 @@ class Trainer:
             pin_memory=self.device.type == 'cuda'
         )
         
-        # Get class weights for imbalanced data
-        class_weights = full_dataset.get_class_weights().to(self.device)
-        
-        # Setup criterion with class weights
-        self.criterion = nn.BCEWithLogitsLoss(pos_weight=class_weights)
-        
-        logger.info(f"Data split: Train={train_size}, Val={val_size}, Test={test_size}")
-        
     def setup_training(self, use_amp: bool = True) -> None:
         """Setup optimizer, scheduler, and other training components."""
         
@@ -426,6 +1031,7 @@ class Trainer:
         total_loss = 0.0
         correct = 0
         total = 0
+        start_time = time.perf_counter()
         
         for batch in self.train_loader:
             blue = batch['blue_team'].to(self.device)
@@ -463,10 +1069,16 @@ class Trainer:
         avg_loss = total_loss / total
         accuracy = correct / total
         
+        elapsed = time.perf_counter() - start_time
+        self.last_samples_per_sec = total / elapsed if elapsed > 0 else 0.0
+        
         return avg_loss, accuracy
     
     @torch.no_grad()
-    def validate(self, loader: Optional[DataLoader] = None) -> Tuple[float, float]:
+    def validate(
+        self, 
+        loader: Optional[Union[DataLoader, TensorBatchLoader]] = None
+    ) -> Tuple[float, float]:
         """
         Validate on validation set.
         
@@ -478,6 +1090,7 @@ class Trainer:
         total_loss = 0.0
         correct = 0
         total = 0
+        start_time = time.perf_counter()
         
         for batch in loader:
             blue = batch['blue_team'].to(self.device)
@@ -497,6 +1110,9 @@ class Trainer:
         avg_loss = total_loss / total if total > 0 else 0
         accuracy = correct / total if total > 0 else 0
         
+        elapsed = time.perf_counter() - start_time
+        self.last_samples_per_sec = total / elapsed if elapsed > 0 else 0.0
+        
         return avg_loss, accuracy
     
     def train(
@@ -524,6 +1140,7 @@ class Trainer:
             
             # Train
             train_loss, train_acc = self.train_epoch()
+            train_throughput = self.last_samples_per_sec
             
             # Validate
             val_loss, val_acc = self.validate()
@@ -542,7 +1159,8 @@ class Trainer:
                 train_acc=train_acc,
                 val_acc=val_acc,
                 lr=current_lr,
-                epoch_time=epoch_time
+                epoch_time=epoch_time,
+                samples_per_sec=train_throughput
             )
             
             # Log progress
@@ -550,7 +1168,8 @@ class Trainer:
                 f"Epoch {epoch}/{epochs} | "
                 f"Train Loss: {train_loss:.4f} | Val Loss: {val_loss:.4f} | "
                 f"Train Acc: {train_acc:.4f} | Val Acc: {val_acc:.4f} | "
-                f"LR: {current_lr:.2e} | Time: {epoch_time:.1f}s"
+                f"LR: {current_lr:.2e} | Time: {epoch_time:.1f}s | "
+                f"{train_throughput:,.0f} samples/s"
             )
             
             # Save best model
@@ -585,7 +1204,9 @@ def train_model(
     batch_size: int = 256,
     learning_rate: float = 1e-3,
     use_items: bool = False,
-    max_samples: Optional[int] = None
+    max_samples: Optional[int] = None,
+    use_snapshot: bool = True,
+    streaming: bool = False
 ) -> Tuple[nn.Module, TrainingMetrics]:
     """
     Convenience function to train a model.
@@ -598,6 +1219,8 @@ def train_model(
         learning_rate: Initial learning rate
         use_items: Include item data in model
         max_samples: Limit dataset size (for testing)
+        use_snapshot: Load the patch into cached tensors instead of per-row queries
+        streaming: Stream the patch from SQLite (for patches larger than RAM)
         
     Returns:
         (trained_model, training_metrics)
@@ -621,12 +1244,16 @@ def train_model(
     trainer = Trainer(model)
     
     # Setup data and training
-    trainer.setup_data(
-        version=version,
-        queue_id=queue_id,
-        include_items=use_items,
-        max_samples=max_samples
-    )
+    if streaming:
+        trainer.setup_streaming_data(version=version, queue_id=queue_id, include_items=use_items)
+    else:
+        trainer.setup_data(
+            version=version,
+            queue_id=queue_id,
+            include_items=use_items,
+            max_samples=max_samples,
+            use_snapshot=use_snapshot
+        )
     trainer.setup_training()
     
     # Train
@@ -649,6 +1276,7 @@ if __name__ == "__main__":
     parser.add_argument("--batch-size", type=int, default=256, help="Batch size")
     parser.add_argument("--lr", type=float, default=1e-3, help="Learning rate")
     parser.add_argument("--max-samples", type=int, default=None, help="Max samples")
+    parser.add_argument("--no-snapshot", action="store_true", help="Query rows per sample instead of a tensor snapshot")
     
     args = parser.parse_args()
     
@@ -657,7 +1285,8 @@ if __name__ == "__main__":
         epochs=args.epochs,
         batch_size=args.batch_size,
         learning_rate=args.lr,
-        max_samples=args.max_samples
+        max_samples=args.max_samples,
+        use_snapshot=not args.no_snapshot
     )
     
     print(f"\nTraining complete!")